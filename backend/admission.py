@@ -0,0 +1,180 @@
+"""Per-client and per-endpoint rate limits, applied before a request is routed.
+
+Each client (by address) gets a token bucket, and endpoints that fan out to
+many upstream calls or worker processes get one bucket shared by every
+client. A request that finds its bucket empty is answered 429 with a
+Retry-After header right away, without reaching the app.
+
+Work limits cap expensive work that only some requests start, such as
+cache misses that need a worker process. The app checks them with
+``admit`` right before starting that work, so requests served from the
+cache never wait behind them; an exhausted limit raises RateLimited.
+"""
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from env import env_bool, env_float, env_int
+from metrics import registry
+
+RATE_LIMIT_ENABLED = env_bool("RATE_LIMIT_ENABLED", True)
+# Sustained requests per second per client, and how many may arrive at once
+CLIENT_RATE = env_float("RATE_LIMIT_CLIENT_RATE", 20.0)
+CLIENT_BURST = env_int("RATE_LIMIT_CLIENT_BURST", 60)
+# Buckets of clients not seen for a while are dropped beyond this many
+MAX_CLIENTS = env_int("RATE_LIMIT_MAX_CLIENTS", 10000)
+# Behind a reverse proxy every request comes from the proxy; trust its header instead
+TRUST_FORWARDED = env_bool("RATE_LIMIT_TRUST_FORWARDED", False)
+# Proxies in front of the app that each append to X-Forwarded-For; the client
+# is the entry that many hops from the right, anything left of it is spoofable
+TRUSTED_HOPS = env_int("RATE_LIMIT_TRUSTED_HOPS", 1)
+
+REJECTED = registry.counter(
+    "f1_requests_rate_limited_total", "Requests answered 429 by the rate limiter", ("limit",)
+)
+REJECTED_BY = {limit: REJECTED.labels(limit) for limit in ("client", "endpoint", "work")}
+
+RATE_LIMITED_BODY = b'{"detail":"Too many requests"}'
+
+
+class RateLimited(Exception):
+    """A work limit is exhausted; retry after ``retry_after`` seconds"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Rate limit for {name} exceeded")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """``burst`` tokens, refilled at ``rate`` per second; a request takes one"""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: int, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+
+    def take(self, now: float) -> float:
+        """Take a token: 0.0 if one was available, else seconds until there is one"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Token buckets per client and per endpoint.
+
+    ``endpoint_limits`` maps path prefixes to (rate, burst), each bucket
+    shared by every client. ``work_limits`` maps names passed to ``admit``
+    to (rate, burst) the same way. Paths in ``exempt`` are never limited.
+    """
+
+    def __init__(self, client_rate: float = CLIENT_RATE, client_burst: int = CLIENT_BURST,
+                 endpoint_limits: Optional[Dict[str, Tuple[float, int]]] = None,
+                 work_limits: Optional[Dict[str, Tuple[float, int]]] = None, exempt: Tuple[str, ...] = (),
+                 max_clients: int = MAX_CLIENTS, trust_forwarded: bool = TRUST_FORWARDED,
+                 trusted_hops: int = TRUSTED_HOPS,
+                 enabled: bool = RATE_LIMIT_ENABLED):
+        self.client_rate = client_rate
+        self.client_burst = client_burst
+        self.max_clients = max_clients
+        self.trust_forwarded = trust_forwarded
+        self.trusted_hops = max(1, trusted_hops)
+        self.enabled = enabled
+        self.exempt = exempt
+        self._clients: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        now = time.monotonic()
+        self._endpoints = [
+            (prefix, TokenBucket(rate, burst, now)) for prefix, (rate, burst) in (endpoint_limits or {}).items()
+        ]
+        self._work = {name: TokenBucket(rate, burst, now) for name, (rate, burst) in (work_limits or {}).items()}
+        self.limited = {"client": 0, "endpoint": 0, "work": 0}
+
+    def client_id(self, scope) -> str:
+        if self.trust_forwarded:
+            # Proxies append, so only the rightmost entries are trustworthy;
+            # repeated headers are read as one list
+            hops = [
+                hop.strip()
+                for name, value in scope["headers"] if name == b"x-forwarded-for"
+                for hop in value.decode("latin-1").split(",")
+            ]
+            hops = [hop for hop in hops if hop]
+            if hops:
+                return hops[-min(self.trusted_hops, len(hops))]
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def _client_bucket(self, client: str, now: float) -> TokenBucket:
+        bucket = self._clients.get(client)
+        if bucket is None:
+            bucket = self._clients[client] = TokenBucket(self.client_rate, self.client_burst, now)
+            if len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+        else:
+            self._clients.move_to_end(client)
+        return bucket
+
+    def check(self, scope) -> Optional[float]:
+        """None if the request may proceed, else seconds the client should wait"""
+        if not self.enabled or scope["path"] in self.exempt:
+            return None
+        now = time.monotonic()
+        wait = self._client_bucket(self.client_id(scope), now).take(now)
+        limit = "client"
+        if not wait:
+            path = scope["path"]
+            for prefix, bucket in self._endpoints:
+                if path.startswith(prefix):
+                    wait = bucket.take(now)
+                    limit = "endpoint"
+                    break
+        if not wait:
+            return None
+        self.limited[limit] += 1
+        REJECTED_BY[limit].inc()
+        return wait
+
+    def admit(self, name: str) -> None:
+        """Take a token for the named work, raising RateLimited if there is none"""
+        bucket = self._work.get(name)
+        if not self.enabled or bucket is None:
+            return
+        wait = bucket.take(time.monotonic())
+        if wait:
+            self.limited["work"] += 1
+            REJECTED_BY["work"].inc()
+            raise RateLimited(name, wait)
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, "clients": len(self._clients), "limited": dict(self.limited)}
+
+
+class RateLimitMiddleware:
+    """ASGI middleware answering 429 when the limiter turns a request away"""
+
+    def __init__(self, app, limiter: RateLimiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        wait = self.limiter.check(scope) if scope["type"] == "http" else None
+        if wait is None:
+            await self.app(scope, receive, send)
+            return
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(RATE_LIMITED_BODY)).encode()),
+                (b"retry-after", str(math.ceil(wait)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": RATE_LIMITED_BODY})
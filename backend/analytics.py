@@ -0,0 +1,131 @@
+"""FastF1 session analytics, run in worker processes.
+
+Everything here executes inside a ProcessPoolExecutor worker, so functions
+take and return plain picklable values. pandas and FastF1 are imported on
+first use only, which keeps importing this module from the app cheap.
+"""
+from typing import Any, Dict, List, Optional
+
+from fastf1_source import get_fastf1
+
+# DRS channel values meaning the flap is open
+DRS_OPEN = (10, 12, 14)
+
+
+def _seconds(value) -> Optional[float]:
+    """Timedelta to seconds, None for NaT/NaN"""
+    if value is None or value != value:
+        return None
+    return value.total_seconds()
+
+
+def _number(value) -> Optional[float]:
+    return None if value is None or value != value else float(value)
+
+
+def analyze_session(year: int, round_number: int, session_name: str) -> Dict[str, Any]:
+    """Load one session and compute every analysis of it in a single pass"""
+    fastf1 = get_fastf1()
+    session = fastf1.get_session(year, round_number, session_name)
+    session.load(laps=True, telemetry=True, weather=False, messages=False)
+    return {
+        "year": year,
+        "round": round_number,
+        "event": str(session.event['EventName']),
+        "session": session.name,
+        "date": session.date.isoformat() if session.date is not None else None,
+        "telemetry": telemetry_summary(session),
+        "stints": stint_analysis(session.laps),
+        "lap_times": lap_time_distributions(session.laps),
+    }
+
+
+def telemetry_summary(session) -> List[Dict[str, Any]]:
+    """Whole-session car data of each driver, fastest lap first"""
+    summaries = []
+    for driver_number in session.drivers:
+        laps = session.laps.pick_drivers(driver_number)
+        if laps.empty:
+            continue
+        car = session.car_data.get(driver_number)
+        fastest = laps.pick_fastest()
+        summary = {
+            "driver_number": int(driver_number),
+            "driver": str(laps['Driver'].iloc[0]),
+            "team": str(laps['Team'].iloc[0]),
+            "laps": int(len(laps)),
+            "fastest_lap": _seconds(fastest['LapTime']) if fastest is not None else None,
+            "top_speed_trap": _number(laps['SpeedST'].max()),
+        }
+        if car is not None and not car.empty:
+            summary.update({
+                "top_speed": _number(car['Speed'].max()),
+                "mean_speed": _number(car['Speed'].mean()),
+                "full_throttle_pct": _number((car['Throttle'] >= 99).mean() * 100),
+                "braking_pct": _number(car['Brake'].astype(bool).mean() * 100),
+                "drs_open_pct": _number(car['DRS'].isin(DRS_OPEN).mean() * 100),
+                "max_rpm": _number(car['RPM'].max()),
+                "gear_changes": int((car['nGear'].diff().fillna(0) != 0).sum()),
+            })
+        summaries.append(summary)
+    summaries.sort(key=lambda s: (s["fastest_lap"] is None, s["fastest_lap"] or 0))
+    return summaries
+
+
+def stint_analysis(laps) -> List[Dict[str, Any]]:
+    """One entry per driver stint: compound, laps covered, pace and tyre degradation.
+
+    Degradation is the slope of lap time over tyre age, fitted on accurate
+    laps without pit in/out laps, in seconds per lap.
+    """
+    import numpy as np
+
+    laps = laps[laps['Stint'].notna()]
+    clean = laps.pick_wo_box().pick_accurate()
+    stints = []
+    for (driver, stint), group in laps.groupby(['Driver', 'Stint'], sort=True):
+        clean_group = clean[(clean['Driver'] == driver) & (clean['Stint'] == stint)]
+        times = clean_group['LapTime'].dt.total_seconds().to_numpy()
+        ages = clean_group['TyreLife'].to_numpy(dtype=float)
+        valid = ~(np.isnan(times) | np.isnan(ages))
+        degradation = None
+        if valid.sum() >= 3 and np.ptp(ages[valid]) > 0:
+            degradation = float(np.polyfit(ages[valid], times[valid], 1)[0])
+        stints.append({
+            "driver": str(driver),
+            "stint": int(stint),
+            "compound": str(group['Compound'].iloc[0]),
+            "first_lap": int(group['LapNumber'].min()),
+            "last_lap": int(group['LapNumber'].max()),
+            "laps": int(len(group)),
+            "tyre_life_start": _number(group['TyreLife'].min()),
+            "mean_lap_time": float(times[valid].mean()) if valid.any() else None,
+            "degradation_per_lap": degradation,
+        })
+    return stints
+
+
+def lap_time_distributions(laps) -> List[Dict[str, Any]]:
+    """Lap-time spread of each driver over representative laps, median first"""
+    import numpy as np
+
+    quick = laps.pick_quicklaps().pick_wo_box()
+    distributions = []
+    for driver, group in quick.groupby('Driver'):
+        times = group['LapTime'].dt.total_seconds().dropna().to_numpy()
+        if len(times) == 0:
+            continue
+        p25, median, p75 = np.percentile(times, [25, 50, 75])
+        distributions.append({
+            "driver": str(driver),
+            "laps": int(len(times)),
+            "min": float(times.min()),
+            "p25": float(p25),
+            "median": float(median),
+            "p75": float(p75),
+            "max": float(times.max()),
+            "mean": float(times.mean()),
+            "std": float(times.std()),
+        })
+    distributions.sort(key=lambda d: d["median"])
+    return distributions
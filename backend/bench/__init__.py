@@ -0,0 +1,8 @@
+import os
+
+# Benchmarks measure upstream traffic, so keep main off the on-disk session
+# store unless a benchmark points SESSION_STORE_DIR somewhere on purpose
+os.environ.setdefault("SESSION_STORE_DIR", "")
+
+# Benchmarks drive the app from one address far above any per-client limit
+os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
@@ -0,0 +1,142 @@
+"""Admission control under a burst of cache misses against an upstream that slows down when overloaded.
+
+Part one fires cold keys, keys whose cache entries expired long ago and
+fresh keys at once through a ResponseCache, with and without the global
+UpstreamGate. The stub upstream answers in ``--latency`` seconds up to
+``--capacity`` concurrent requests and proportionally slower beyond that,
+so without the gate every request is slowed and many run into the client
+timeout. Part two sends a flood from one client and a trickle from another
+through the rate limiter in front of the app. Run from the backend directory:
+
+    python -m bench.bench_admission --cold 300 --expired 100 --capacity 16
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+import httpx
+
+import main
+from admission import RateLimiter, RateLimitMiddleware
+from bench.stub_upstream import StubUpstream
+from cache import ResponseCache
+from upstream import UpstreamClient, UpstreamGate
+
+
+class OverloadedUpstream:
+    """Answers in ``latency`` seconds, stretched by how far in-flight requests exceed ``capacity``"""
+
+    def __init__(self, latency: float, capacity: int):
+        self.latency = latency
+        self.capacity = capacity
+        self.in_flight = 0
+        self.peak = 0
+
+    async def __call__(self, path):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency * max(1.0, self.in_flight / self.capacity))
+        finally:
+            self.in_flight -= 1
+        return {"path": path}
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[int(q * (len(values) - 1))] if values else 0.0
+
+
+async def burst(gate, args):
+    upstream = OverloadedUpstream(args.latency, args.capacity)
+    stub = await StubUpstream(handler=upstream).start()
+    client = UpstreamClient("stub", stub.base_url, gate=gate, timeout=args.timeout,
+                            max_connections=1000, max_keepalive_connections=1000, max_concurrency=1000)
+    cache = ResponseCache(stale_seconds=0)
+    for i in range(args.expired):
+        cache.set(f"expired/{i}", {"stale": True}, 100, ttl=60, age=3600)
+    for i in range(args.fresh):
+        cache.set(f"fresh/{i}", {"fresh": True}, 100, ttl=60)
+
+    async def load(key):
+        response = await client.get(f"/{key}")
+        return (response.json(), len(response.content)) if response.status_code == 200 else None
+
+    async def lookup(key):
+        start = time.perf_counter()
+        try:
+            value = await cache.get_or_fetch(key, lambda: load(key), 60)
+        except Exception:
+            value = None
+        return key.partition("/")[0], time.perf_counter() - start, value
+
+    keys = ([f"cold/{i}" for i in range(args.cold)] + [f"expired/{i}" for i in range(args.expired)]
+            + [f"fresh/{i}" for i in range(args.fresh)])
+    try:
+        results = await asyncio.gather(*(lookup(key) for key in keys))
+    finally:
+        await client.close()
+        await stub.stop()
+
+    by_kind = {}
+    for kind, elapsed, value in results:
+        latencies, answered, stale = by_kind.setdefault(kind, ([], [0], [0]))
+        latencies.append(elapsed)
+        if value is not None:
+            answered[0] += 1
+            stale[0] += bool(value.get("stale"))
+    return upstream.peak, cache.stats()["stale_if_error"], by_kind
+
+
+async def rate_limited(args):
+    limiter = RateLimiter(client_rate=args.client_rate, client_burst=args.client_burst, enabled=True)
+    app = RateLimitMiddleware(main.app, limiter)
+    statuses = {"flood": {}, "trickle": {}}
+
+    async def send(name, client, count, interval):
+        for _ in range(count):
+            response = await client.get("/")
+            statuses[name][response.status_code] = statuses[name].get(response.status_code, 0) + 1
+            await asyncio.sleep(interval)
+
+    flood = httpx.AsyncClient(transport=httpx.ASGITransport(app=app, client=("10.0.0.1", 1000)), base_url="http://bench")
+    trickle = httpx.AsyncClient(transport=httpx.ASGITransport(app=app, client=("10.0.0.2", 1000)), base_url="http://bench")
+    async with flood, trickle:
+        start = time.perf_counter()
+        await asyncio.gather(
+            send("flood", flood, args.flood, 0.0),
+            send("trickle", trickle, 20, 0.05),
+        )
+    return time.perf_counter() - start, statuses, limiter.stats()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cold", type=int, default=300, help="keys never cached")
+    parser.add_argument("--expired", type=int, default=100, help="keys cached long past their TTL")
+    parser.add_argument("--fresh", type=int, default=100, help="keys cached and fresh")
+    parser.add_argument("--latency", type=float, default=0.1, help="upstream latency within capacity")
+    parser.add_argument("--capacity", type=int, default=16, help="concurrent requests the upstream handles at full speed")
+    parser.add_argument("--timeout", type=float, default=2.0, help="upstream client timeout")
+    parser.add_argument("--gate", type=int, default=16, help="gate concurrency")
+    parser.add_argument("--max-waiting", type=int, default=64)
+    parser.add_argument("--queue-timeout", type=float, default=0.5)
+    parser.add_argument("--flood", type=int, default=2000, help="requests of the flooding client")
+    parser.add_argument("--client-rate", type=float, default=20)
+    parser.add_argument("--client-burst", type=int, default=60)
+    args = parser.parse_args()
+    logging.getLogger("cache").setLevel(logging.CRITICAL)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    for label, gate in (("no gate", None), ("gate", UpstreamGate(args.gate, args.max_waiting, args.queue_timeout))):
+        peak, stale_if_error, by_kind = asyncio.run(burst(gate, args))
+        shed = f" shed={gate.shed}" if gate is not None else ""
+        print(f"{label:<8} upstream peak in flight={peak:<4} stale served on failure={stale_if_error}{shed}")
+        for kind, (latencies, answered, stale) in by_kind.items():
+            print(f"  {kind:<8} answered={answered[0]:>4}/{len(latencies):<4} (stale {stale[0]:>3})  "
+                  f"p50={percentile(latencies, 0.5) * 1000:7.1f}ms  p99={percentile(latencies, 0.99) * 1000:7.1f}ms")
+
+    elapsed, statuses, stats = asyncio.run(rate_limited(args))
+    print(f"rate limit {args.client_rate:g}/s burst {args.client_burst} over {elapsed:.2f}s: "
+          f"flood {statuses['flood']}  trickle {statuses['trickle']}  limited {stats['limited']}")
@@ -0,0 +1,70 @@
+"""Measure restart-to-first-byte of /dashboard with an empty vs a populated session store.
+
+Each start runs in its own subprocess against a stub upstream with per-request
+latency. The first start fills a temporary store; the second one reads the
+completed season back from it. Run from the backend directory:
+
+    python -m bench.bench_cold_start --races 24 --latency 0.05
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+
+async def child(base_url, spawned_at):
+    import httpx
+    import main
+    from upstream import UpstreamClient
+
+    main.f1api_dev_client = UpstreamClient("f1api.dev", base_url)
+    main.openf1_client = UpstreamClient("OpenF1", f"{base_url}/v1")
+    imported_at = time.time()
+    async with main.app.router.lifespan_context(main.app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://bench") as client:
+            response = await client.get("/dashboard")
+    print(json.dumps({
+        "status": response.status_code,
+        "import_seconds": imported_at - spawned_at,
+        "first_byte_seconds": time.time() - spawned_at,
+    }))
+
+
+async def parent(races, latency):
+    from bench.stub_upstream import StubUpstream, synthetic_season
+
+    stub = await StubUpstream(handler=synthetic_season(datetime.now().year, races=races), latency=latency).start()
+    store_dir = tempfile.mkdtemp(prefix="f1-store-")
+    env = dict(os.environ, SESSION_STORE_DIR=store_dir, PREFETCH_ENABLED="0")
+    try:
+        for label in ("empty store", "populated store"):
+            stub.reset()
+            proc = await asyncio.create_subprocess_exec(
+                sys.executable, "-m", "bench.bench_cold_start", "--child", stub.base_url, str(time.time()),
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env,
+            )
+            out, _ = await proc.communicate()
+            result = json.loads(out.decode().strip().splitlines()[-1])
+            print(f"{label:<16} status={result['status']} upstream_calls={stub.requests:<4} "
+                  f"import={result['import_seconds']:.2f}s first_byte={result['first_byte_seconds']:.2f}s")
+    finally:
+        shutil.rmtree(store_dir, ignore_errors=True)
+        await stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--child", nargs=2, metavar=("BASE_URL", "SPAWNED_AT"))
+    parser.add_argument("--races", type=int, default=24)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per upstream request")
+    args = parser.parse_args()
+    if args.child:
+        asyncio.run(child(args.child[0], float(args.child[1])))
+    else:
+        asyncio.run(parent(args.races, args.latency))
@@ -0,0 +1,73 @@
+"""/dashboard latency when one upstream path is slow: waiting for every section vs per-section deadlines.
+
+Serves the synthetic season from a stub where lap downloads take
+``--slow`` seconds, and expires the response cache before each round so
+every request has to go upstream again. The "gather" run registers a copy
+of the old handler that waits for all sections; the "deadline" run is the
+current /dashboard, which answers within DASHBOARD_DEADLINE and reports
+which sections were stale or pending. Run from the backend directory:
+
+    python -m bench.bench_dashboard_deadlines --rounds 5 --slow 4
+"""
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime
+
+import httpx
+
+import main
+from bench.stub_upstream import StubUpstream, synthetic_season
+from upstream import UpstreamClient
+
+
+@main.app.get("/dashboard-gather")
+async def dashboard_gather():
+    (top_drivers, top_teams), next_race, fastest_lap = await asyncio.gather(
+        main.fetch_standings(), main.fetch_next_race(), main.fetch_fastest_lap()
+    )
+    return {"top_drivers": top_drivers, "top_teams": top_teams, "next_race": next_race, "fastest_lap": fastest_lap}
+
+
+async def run(path, rounds, slow):
+    season = synthetic_season(datetime.now().year)
+    stub = await StubUpstream(handler=season, latency=lambda p: slow if "/laps" in p else 0.01).start()
+    main.f1api_dev_client = UpstreamClient("f1api.dev", stub.base_url)
+    main.openf1_client = UpstreamClient("OpenF1", f"{stub.base_url}/v1", timeout=slow * 2)
+    main.response_cache.clear()
+    main.lap_trackers.clear()
+    timings = []
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://bench",
+                                     timeout=slow * 4) as client:
+            for _ in range(rounds):
+                main.response_cache.clear()
+                start = time.perf_counter()
+                response = await client.get(path)
+                elapsed = time.perf_counter() - start
+                sections = response.json().get("sections", {})
+                statuses = {name: meta["status"] for name, meta in sections.items() if name != "top_teams"}
+                timings.append(elapsed)
+                print(f"  {path:<18} {elapsed * 1000:7.0f}ms  status={response.status_code}  {statuses or ''}")
+                # Leave time for an overrun fetch to land before the next round
+                await asyncio.sleep(slow)
+    finally:
+        await main.f1api_dev_client.close()
+        await main.openf1_client.close()
+        await stub.stop()
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--slow", type=float, default=4.0, help="seconds per lap download")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("main").setLevel(logging.WARNING)
+
+    print(f"DASHBOARD_DEADLINE={main.DASHBOARD_DEADLINE}s, lap downloads take {args.slow}s")
+    for path in ("/dashboard-gather", "/dashboard"):
+        timings = asyncio.run(run(path, args.rounds, args.slow))
+        print(f"{path:<18} max={max(timings) * 1000:.0f}ms")
@@ -0,0 +1,91 @@
+"""Requests/sec on /dashboard with default model serialization vs precomputed bytes.
+
+Drives the ASGI app in-process with a minimal request loop against a warmed
+synthetic-season stub, so only the app's own handling is measured (an HTTP
+client would dominate the numbers). The
+"model" run registers a copy of the old handler that returns DashboardData
+and lets FastAPI validate and encode it. Run from the backend directory:
+
+    python -m bench.bench_dashboard_rps --requests 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+import httpx
+
+import main
+from bench.stub_upstream import StubUpstream, synthetic_season
+from upstream import UpstreamClient
+
+
+@main.app.get("/dashboard-model", response_model=main.DashboardData)
+async def dashboard_model():
+    parts = await asyncio.gather(*(section.resolve() for section in main.dashboard_sections))
+    return main.DashboardData(**main.build_dashboard(parts))
+
+
+async def asgi_get(path, headers=None):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "server": ("bench", 80), "client": ("127.0.0.1", 1),
+        "headers": [(b"host", b"bench")] + [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+    }
+    status = {}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status["code"] = message["status"]
+
+    await main.app(scope, receive, send)
+    return status["code"]
+
+
+async def load(path, total, concurrency, headers=None):
+    semaphore = asyncio.Semaphore(concurrency)
+    statuses = {}
+
+    async def one():
+        async with semaphore:
+            code = await asgi_get(path, headers)
+            statuses[code] = statuses.get(code, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return total / (time.perf_counter() - start), statuses
+
+
+async def run(total, concurrency):
+    stub = await StubUpstream(handler=synthetic_season(datetime.now().year)).start()
+    main.f1api_dev_client = UpstreamClient("f1api.dev", stub.base_url)
+    main.openf1_client = UpstreamClient("OpenF1", f"{stub.base_url}/v1")
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://bench") as client:
+            etag = (await client.get("/dashboard")).headers["etag"]
+        runs = [
+            ("model", "/dashboard-model", None),
+            ("precomputed", "/dashboard", None),
+            ("304", "/dashboard", {"If-None-Match": etag}),
+        ]
+        for label, path, headers in runs:
+            rps, statuses = await load(path, total, concurrency, headers)
+            print(f"{label:<12} {rps:8.0f} req/s  statuses={statuses}")
+        print(f"bodies encoded={main.precomputed_responses.renders} reused={main.precomputed_responses.reuses}")
+    finally:
+        await main.f1api_dev_client.close()
+        await main.openf1_client.close()
+        await stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    main.logger.setLevel("WARNING")
+    asyncio.run(run(args.requests, args.concurrency))
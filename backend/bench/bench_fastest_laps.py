@@ -0,0 +1,63 @@
+"""Latency of /fastest-laps: batched sector lookup vs one upstream call per driver.
+
+The baseline replays what the old loop did: after downloading the session's
+laps, fetch each top-10 lap's sectors with its own sequential request. Run
+from the backend directory:
+
+    python -m bench.bench_fastest_laps --latency 0.05
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime
+
+import main
+from bench.stub_upstream import StubUpstream, synthetic_season
+from upstream import UpstreamClient
+
+
+async def per_driver_baseline():
+    laps = await main.fetch_fastest_laps()
+    sessions = await main.fetch_from_openf1(f"sessions?session_type=Race&year={datetime.now().year}")
+    session_key = max(sessions, key=lambda s: s['date_end'])['session_key']
+    for lap in (await main.fetch_lap_index(session_key)).fastest_laps(10):
+        await main.fetch_from_openf1(
+            f"laps?session_key={session_key}&driver_number={lap.driver_number}&lap_number={lap.lap_number}"
+        )
+    return laps
+
+
+async def measure(label, stub, func, rounds):
+    timings, calls = [], []
+    for _ in range(rounds):
+        main.response_cache.clear()
+        stub.reset()
+        start = time.perf_counter()
+        await func()
+        timings.append((time.perf_counter() - start) * 1000)
+        calls.append(stub.requests)
+    print(f"{label:<12} cold p50={statistics.median(timings):.0f}ms upstream_calls={calls[0]}")
+
+
+async def run(latency, rounds):
+    stub = await StubUpstream(handler=synthetic_season(datetime.now().year), latency=latency).start()
+    main.openf1_client = UpstreamClient("OpenF1", f"{stub.base_url}/v1")
+    try:
+        await measure("per-driver", stub, per_driver_baseline, rounds)
+        await measure("batched", stub, main.fetch_fastest_laps, rounds)
+        start = time.perf_counter()
+        await main.fetch_fastest_laps()
+        print(f"{'batched':<12} warm {(time.perf_counter() - start) * 1000:.1f}ms")
+    finally:
+        await main.openf1_client.close()
+        await stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.05, help="stub latency in seconds")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    main.logger.setLevel("WARNING")
+    asyncio.run(run(args.latency, args.rounds))
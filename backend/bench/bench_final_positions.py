@@ -0,0 +1,100 @@
+"""Microbenchmark final-position extraction over a full season of position rows.
+
+Compares the row-by-row scan that calculate_standings_from_results used to run
+with the columnar path (position_columns + final_positions_from) end to end,
+then breaks the columnar time into the column load and the vectorized kernel,
+and checks both give the same standings. Starting from decoded rows, the
+load dominates; the app builds the columns while the payload streams in
+(fetch_position_columns), so only the kernel runs on top of the download.
+Run from the backend directory:
+
+    python -m bench.bench_final_positions                  # synthetic season
+    python -m bench.bench_final_positions --fixture season.json
+
+A recorded fixture is a JSON list of OpenF1 ``position?session_key=`` payloads,
+one per race.
+"""
+import argparse
+import json
+import time
+from operator import itemgetter
+
+import numpy as np
+
+import main
+from bench.stub_upstream import synthetic_season
+from drivers import MAX_DRIVER_NUMBER
+
+
+def position_columns(positions):
+    """Load decoded OpenF1 position rows into (driver_number, position, date) arrays"""
+    count = len(positions)
+    driver_numbers = np.fromiter(map(itemgetter('driver_number'), positions), dtype=np.int32, count=count)
+    places = np.fromiter((pos['position'] or 0 for pos in positions), dtype=np.int32, count=count)
+    # ISO timestamps compare correctly as bytes, like the strings they came from
+    dates = np.array(list(map(itemgetter('date'), positions)), dtype='S')
+    return driver_numbers, places, dates
+
+
+def scan_final_positions(positions):
+    final_positions = {}
+    for pos in positions:
+        driver_number = pos['driver_number']
+        if driver_number not in final_positions or pos['date'] > final_positions[driver_number]['date']:
+            final_positions[driver_number] = pos
+    return {
+        driver_number: (pos['position'], main.POINTS_SYSTEM.get(pos['position'], 0))
+        for driver_number, pos in final_positions.items()
+    }
+
+
+def standings(season, extract):
+    driver_points = np.zeros(MAX_DRIVER_NUMBER, dtype=np.int64)
+    team_points = np.zeros(0, dtype=np.int64)
+    entrants = [None] * MAX_DRIVER_NUMBER
+    for positions in season:
+        team_points = main.award_session_points(
+            extract(positions), main.DEFAULT_DRIVERS, driver_points, team_points, entrants
+        )
+    return driver_points.tolist(), team_points.tolist()
+
+
+def timed(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixture", help="recorded season fixture (JSON list of position payloads)")
+    parser.add_argument("--races", type=int, default=24)
+    parser.add_argument("--updates", type=int, default=1500, help="position updates per driver per race")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.fixture:
+        with open(args.fixture) as f:
+            season = json.load(f)
+    else:
+        handler = synthetic_season(races=args.races, updates_per_driver=args.updates)
+        season = [handler(f"/v1/position?session_key={9000 + r}") for r in range(args.races)]
+
+    rows = sum(len(positions) for positions in season)
+    scan_time, scan_result = timed(lambda: standings(season, scan_final_positions), args.repeat)
+    total_time, vector_result = timed(
+        lambda: standings(season, lambda positions: main.final_positions_from(*position_columns(positions))),
+        args.repeat
+    )
+    load_time, columns = timed(lambda: [position_columns(positions) for positions in season], args.repeat)
+    kernel_time, _ = timed(lambda: standings(columns, lambda cols: main.final_positions_from(*cols)), args.repeat)
+
+    print(f"races={len(season)} rows={rows}")
+    print(f"row scan           {scan_time * 1000:.1f}ms")
+    print(f"columnar total     {total_time * 1000:.1f}ms ({scan_time / total_time:.2f}x vs scan)")
+    print(f"  column load      {load_time * 1000:.1f}ms")
+    print(f"  kernel           {kernel_time * 1000:.1f}ms")
+    print(f"identical standings: {scan_result == vector_result}")
@@ -0,0 +1,88 @@
+"""Compare next-race tail latency during f1api.dev incidents, sequential fallback vs routing.
+
+f1api.dev and OpenF1 are separate stubs. For each scenario the response
+cache is cleared before every lookup, so each one goes upstream. "sequential"
+disables hedging, adaptive timeouts and the circuit breaker (the old
+behaviour); "routed" uses them. Run from the backend directory:
+
+    python -m bench.bench_hedging --requests 60 --timeout 2
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+import main
+import upstream
+from bench.stub_upstream import StubUpstream
+from upstream import UpstreamClient
+
+
+def calendar_handler(path):
+    start = datetime.now(timezone.utc) + timedelta(days=10)
+    if path.startswith("/v1/meetings"):
+        return [{"meeting_name": "Stub Grand Prix", "location": "Stub", "country_name": "Stubland",
+                 "date_start": start.isoformat()}]
+    return {"races": [{"race_name": "Stub Grand Prix", "location": "Stub", "country": "Stubland",
+                       "date": start.strftime("%Y-%m-%dT%H:%M:%SZ")}]}
+
+
+SCENARIOS = {
+    "healthy": lambda path: 0.02,
+    "slow tail": lambda path: 5.0 if random.random() < 0.1 else 0.02,
+    "down": lambda path: 30.0,
+}
+
+
+async def run_mode(routed, f1api_stub, openf1_stub, requests, timeout):
+    main.HEDGE_ENABLED = routed
+    upstream.ADAPTIVE_TIMEOUT_FACTOR = 3.0 if routed else float("inf")
+    main.f1api_dev_client = UpstreamClient("f1api.dev", f1api_stub.base_url, timeout=timeout)
+    main.openf1_client = UpstreamClient("OpenF1", f"{openf1_stub.base_url}/v1", timeout=timeout)
+    if not routed:
+        main.f1api_dev_client.breaker.failure_threshold = float("inf")
+    # Warm the latency window with healthy traffic, as a running server would have
+    f1api_stub.latency, scenario = (lambda path: 0.02), f1api_stub.latency
+    for _ in range(upstream.LATENCY_MIN_SAMPLES):
+        main.response_cache.clear()
+        await main._fetch_next_race()
+    f1api_stub.latency = scenario
+
+    durations = []
+    for _ in range(requests):
+        main.response_cache.clear()
+        start = time.perf_counter()
+        race = await main._fetch_next_race()
+        durations.append(time.perf_counter() - start)
+        assert race.race_name == "Stub Grand Prix", race
+    await main.f1api_dev_client.close()
+    await main.openf1_client.close()
+    durations.sort()
+    return statistics.median(durations), durations[int(0.99 * (len(durations) - 1))], durations[-1]
+
+
+async def run(requests, timeout):
+    f1api_stub = await StubUpstream(handler=calendar_handler).start()
+    openf1_stub = await StubUpstream(handler=calendar_handler, latency=0.03).start()
+    try:
+        for name, latency in SCENARIOS.items():
+            for routed in (False, True):
+                random.seed(1)
+                f1api_stub.latency = latency
+                p50, p99, worst = await run_mode(routed, f1api_stub, openf1_stub, requests, timeout)
+                mode = "routed" if routed else "sequential"
+                print(f"{name:<10} {mode:<10} p50={p50 * 1000:7.1f}ms p99={p99 * 1000:7.1f}ms "
+                      f"max={worst * 1000:7.1f}ms")
+    finally:
+        await f1api_stub.stop()
+        await openf1_stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=60)
+    parser.add_argument("--timeout", type=float, default=2.0, help="upstream timeout ceiling in seconds")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.timeout))
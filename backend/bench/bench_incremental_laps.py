@@ -0,0 +1,75 @@
+"""Compare bytes downloaded per lap refresh of a running session, full vs incremental.
+
+A stub OpenF1 serves a session that is in progress, on a clock the
+benchmark moves forward by ``--interval`` seconds of session time per
+round. Each round refreshes the session's lap index through
+fetch_lap_index (incremental) and downloads the whole laps endpoint once
+(what every refresh used to cost); the stub records each response's size,
+and the incremental index must match the full download. Run from the
+backend directory:
+
+    python -m bench.bench_incremental_laps --rounds 30 --interval 30
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+
+import numpy as np
+
+import main
+from bench.stub_upstream import StubUpstream, synthetic_live_session
+from laps import LapColumns, LapIndex
+from upstream import UpstreamClient
+
+SESSION_KEY = 9900
+
+
+async def full_index(endpoint):
+    columns = LapColumns()
+    await main.stream_from_openf1(endpoint, columns.append)
+    return LapIndex.from_columns(columns)
+
+
+def same_index(a, b):
+    return all(np.array_equal(x, y, equal_nan=True) for x, y in zip(a.arrays().values(), b.arrays().values()))
+
+
+async def run(rounds, interval, lap_seconds):
+    now = [0.0]
+    handler = synthetic_live_session(SESSION_KEY, lap_seconds=lap_seconds, clock=lambda: now[0])
+    stub = await StubUpstream(handler=handler).start()
+    main.openf1_client = UpstreamClient("OpenF1", f"{stub.base_url}/v1")
+    endpoint = f"laps?session_key={SESSION_KEY}"
+    full_sizes, delta_sizes = [], []
+    try:
+        # Join a few laps in, as a viewer arriving mid-race would
+        now[0] = lap_seconds * 5
+        for _ in range(rounds):
+            main.response_cache.clear()
+            stub.reset()
+            index = await main.fetch_lap_index(SESSION_KEY)
+            full = await full_index(endpoint)
+            assert same_index(index, full), "incremental index differs from a full download"
+            delta_sizes.append(stub.responses[0][1])
+            full_sizes.append(stub.responses[1][1])
+            now[0] += interval
+    finally:
+        await main.openf1_client.close()
+        await stub.stop()
+
+    # The first refresh has no cursor yet and downloads everything
+    print(f"rows={len(index)} refreshes={rounds}, each identical to a full download")
+    print(f"first refresh: {delta_sizes[0]} bytes")
+    print(f"full per refresh:        median={statistics.median(full_sizes[1:]):9.0f} bytes  last={full_sizes[-1]}")
+    print(f"incremental per refresh: median={statistics.median(delta_sizes[1:]):9.0f} bytes  last={delta_sizes[-1]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--interval", type=float, default=30.0, help="session seconds between refreshes")
+    parser.add_argument("--lap-seconds", type=float, default=90.0)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    asyncio.run(run(args.rounds, args.interval, args.lap_seconds))
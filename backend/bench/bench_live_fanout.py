@@ -0,0 +1,63 @@
+"""Show /live upstream load staying at one poller as the number of viewers grows.
+
+Runs the live feed against a stub session that is in progress, with N fast
+subscribers and a few that read slowly (and so get resynced with
+snapshots). Reports upstream requests, events delivered and overflows.
+Run from the backend directory:
+
+    python -m bench.bench_live_fanout --levels 10 1000 5000 --seconds 5
+"""
+import argparse
+import asyncio
+import time
+
+import main
+from bench.stub_upstream import StubUpstream, synthetic_live_session
+from live import LiveFeed
+from upstream import UpstreamClient
+
+
+async def consume(feed, received, delay):
+    async for message in feed.events():
+        if message.startswith(b"id:"):
+            received.append(len(message))
+        if delay:
+            await asyncio.sleep(delay)
+
+
+async def run(levels, seconds, poll_interval, slow):
+    stub = await StubUpstream(handler=synthetic_live_session(lap_seconds=1.0, position_interval=0.1)).start()
+    main.openf1_client = UpstreamClient("OpenF1", f"{stub.base_url}/v1")
+    try:
+        for subscribers in levels:
+            feed = LiveFeed(main.fetch_live_rows, poll_interval=poll_interval, queue_size=16)
+            stub.reset()
+            fast = [[] for _ in range(subscribers)]
+            slow_received = [[] for _ in range(slow)]
+            tasks = [asyncio.create_task(consume(feed, r, 0)) for r in fast]
+            tasks += [asyncio.create_task(consume(feed, r, 2.0)) for r in slow_received]
+            start = time.perf_counter()
+            await asyncio.sleep(seconds)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            elapsed = time.perf_counter() - start
+            await feed.stop()
+
+            events = [len(r) for r in fast]
+            print(f"subscribers={subscribers:<6} upstream_requests={stub.requests:<4} polls={feed.polls:<4} "
+                  f"events/fast_client={min(events)}-{max(events)} resyncs={feed.resyncs} "
+                  f"rest_polling_equivalent={subscribers * 2 * int(elapsed / poll_interval)} requests")
+    finally:
+        await main.openf1_client.close()
+        await stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--levels", type=int, nargs="+", default=[10, 1000, 5000])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    parser.add_argument("--slow", type=int, default=5, help="subscribers reading one event every 2s")
+    args = parser.parse_args()
+    asyncio.run(run(args.levels, args.seconds, args.poll_interval, args.slow))
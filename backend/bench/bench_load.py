@@ -0,0 +1,191 @@
+"""End-to-end load benchmark of the HTTP API against replayed upstreams, usable as a regression gate.
+
+Starts replay stubs for f1api.dev and OpenF1 (fixtures from --fixtures, or
+the synthetic season recorded on the fly), runs the app under uvicorn in a
+subprocess aimed at them through F1API_DEV_BASE_URL / OPENF1_BASE_URL, and
+drives each endpoint at a fixed concurrency. Reports requests/s, p50/p99
+latency, upstream calls (for the first, cold request and during the run)
+and the server's RSS. With --baseline, exits 1 when an endpoint regressed
+by more than --tolerance. Run from the backend directory:
+
+    python -m bench.bench_load --requests 2000 --concurrency 32 --save baseline.json
+    python -m bench.bench_load --baseline baseline.json --tolerance 0.25
+    python -m bench.bench_load --latency 0.05 --jitter 0.1 --failure-rate 0.2
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from bench.replay import ENDPOINTS, load_fixtures, record, start_replay
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_mb(pid: int) -> Optional[float]:
+    """Resident memory of a process and its children (uvicorn workers), from /proc"""
+    total = 0
+    pending = [pid]
+    try:
+        while pending:
+            current = pending.pop()
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+            with open(f"/proc/{current}/task/{current}/children") as f:
+                pending.extend(int(child) for child in f.read().split())
+    except OSError:
+        return None
+    return round(total / 1024, 1)
+
+
+async def start_server(stubs, workers: int):
+    port = free_port()
+    env = dict(
+        os.environ,
+        F1API_DEV_BASE_URL=stubs["f1api.dev"].base_url,
+        OPENF1_BASE_URL=f"{stubs['openf1'].base_url}/v1",
+        SESSION_STORE_DIR="",
+        PREFETCH_ENABLED="0",
+    )
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning", env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    async with httpx.AsyncClient() as client:
+        for _ in range(200):
+            try:
+                await client.get(f"{base_url}/cache-stats")
+                return process, base_url
+            except httpx.TransportError:
+                await asyncio.sleep(0.05)
+    process.kill()
+    raise RuntimeError("server did not start")
+
+
+def upstream_calls(stubs) -> int:
+    return sum(stub.requests for stub in stubs.values())
+
+
+async def drive(client: httpx.AsyncClient, path: str, total: int, concurrency: int):
+    latencies: List[float] = []
+    errors = 0
+    remaining = total
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return total / elapsed, latencies[len(latencies) // 2], latencies[int(0.99 * (len(latencies) - 1))], errors
+
+
+async def run(args) -> Dict[str, dict]:
+    if args.fixtures:
+        fixtures_dir = args.fixtures
+    else:
+        fixtures_dir = tempfile.mkdtemp(prefix="f1-fixtures-")
+        await record(fixtures_dir, synthetic=True)
+    stubs = await start_replay(
+        load_fixtures(fixtures_dir), latency=args.latency, jitter=args.jitter,
+        failure_rate=args.failure_rate, seed=args.seed,
+    )
+    process, base_url = await start_server(stubs, args.workers)
+    results = {}
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            for path in ENDPOINTS:
+                before = upstream_calls(stubs)
+                await client.get(path)
+                cold = upstream_calls(stubs) - before
+                before = upstream_calls(stubs)
+                rps, p50, p99, errors = await drive(client, path, args.requests, args.concurrency)
+                results[path] = {
+                    "rps": round(rps, 1),
+                    "p50_ms": round(p50 * 1000, 2),
+                    "p99_ms": round(p99 * 1000, 2),
+                    "errors": errors,
+                    "upstream_cold": cold,
+                    "upstream_load": upstream_calls(stubs) - before,
+                    "rss_mb": rss_mb(process.pid),
+                }
+    finally:
+        process.terminate()
+        await process.wait()
+        for stub in stubs.values():
+            await stub.stop()
+    return results
+
+
+def regressions(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    found = []
+    for path, base in baseline.items():
+        current = results.get(path)
+        if current is None:
+            continue
+        if current["rps"] < base["rps"] * (1 - tolerance):
+            found.append(f"{path}: {current['rps']} req/s, baseline {base['rps']}")
+        if current["p99_ms"] > base["p99_ms"] * (1 + tolerance):
+            found.append(f"{path}: p99 {current['p99_ms']}ms, baseline {base['p99_ms']}ms")
+        if current["upstream_load"] > base["upstream_load"]:
+            found.append(f"{path}: {current['upstream_load']} upstream calls under load, baseline {base['upstream_load']}")
+        if current["rss_mb"] and base.get("rss_mb") and current["rss_mb"] > base["rss_mb"] * (1 + tolerance):
+            found.append(f"{path}: RSS {current['rss_mb']}MB, baseline {base['rss_mb']}MB")
+    return found
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--fixtures", help="fixture directory from bench.replay; synthetic if omitted")
+    parser.add_argument("--latency", type=float, default=0.0, help="upstream latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random upstream latency, up to seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="share of upstream requests answered 503")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save", help="write results as JSON, e.g. as a baseline")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+    logging.getLogger("main").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    results = asyncio.run(run(args))
+    for path, r in results.items():
+        print(f"{path:<13} {r['rps']:8.1f} req/s  p50={r['p50_ms']:7.2f}ms  p99={r['p99_ms']:7.2f}ms  "
+              f"errors={r['errors']:<4} upstream cold={r['upstream_cold']:<3} load={r['upstream_load']:<4} "
+              f"rss={r['rss_mb']}MB")
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(results, json.load(f), args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}")
+        sys.exit(1 if found else 0)
@@ -0,0 +1,105 @@
+"""Next-race resolution: parsing the calendar on every call vs the bisected calendar index.
+
+Part one times resolving the next race from an already downloaded season
+calendar, with the old per-call parse and sort and with the cached index
+(time_left included in both). Part two serves an off-season calendar, where
+this season's races are all past, from a stub with per-request latency and
+times cache misses with and without a known index. Run from the backend directory:
+
+    python -m bench.bench_next_race --calls 20000 --latency 0.05
+"""
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+import main
+from bench.stub_upstream import StubUpstream, synthetic_f1api
+from race_calendar import RaceCalendar
+from upstream import UpstreamClient
+
+
+def parse_every_call(data, now):
+    """The lookup next_race_from_f1api used to run on each call"""
+    upcoming = []
+    for race in data['races']:
+        race_date = race.get('date', '')
+        if race_date:
+            if 'T' in race_date:
+                race_dt = datetime.fromisoformat(race_date.replace('Z', '+00:00'))
+            else:
+                race_dt = datetime.fromisoformat(f"{race_date}T15:00:00+00:00")
+            if race_dt > now:
+                upcoming.append((race, race_dt))
+    upcoming.sort(key=lambda x: x[1])
+    race, race_dt = upcoming[0]
+    # calculate_time_left parsed the timestamp once more
+    start = datetime.fromisoformat(race_dt.isoformat())
+    return race['race_name'], main.format_time_left(start, now)
+
+
+def indexed(data, now):
+    race = main.calendar_indexes.get("bench", data, RaceCalendar.from_f1api).next_after(now)
+    return race.name, main.format_time_left(race.start, now)
+
+
+def time_calls(func, data, now, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        result = func(data, now)
+    return (time.perf_counter() - start) / calls, result
+
+
+def off_season_calendar(path):
+    """This season's races all lie in the past; next season's in the future"""
+    now = datetime.now(timezone.utc)
+    season = path.strip("/")
+    first_day = {str(now.year): -60, str(now.year + 1): 120}.get(season)
+    if first_day is None:
+        return None
+    return {"season": int(season), "races": [
+        {"race_name": f"Grand Prix {season}-{r + 1}", "location": "Stub", "country": "Stubland",
+         "date": (now + timedelta(days=first_day + r)).strftime("%Y-%m-%dT%H:%M:%SZ")}
+        for r in range(24)
+    ]}
+
+
+async def off_season_misses(latency, lookups):
+    f1api = await StubUpstream(handler=off_season_calendar, latency=latency).start()
+    openf1 = await StubUpstream(payload=[], latency=latency).start()
+    main.f1api_dev_client = UpstreamClient("f1api.dev", f1api.base_url)
+    main.openf1_client = UpstreamClient("OpenF1", f"{openf1.base_url}/v1")
+    try:
+        timings = []
+        for _ in range(lookups):
+            main.response_cache.clear()
+            start = time.perf_counter()
+            race = await main._fetch_next_race()
+            timings.append(time.perf_counter() - start)
+        return timings, race
+    finally:
+        await main.f1api_dev_client.close()
+        await main.openf1_client.close()
+        await f1api.stop()
+        await openf1.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--latency", type=float, default=0.05, help="stub latency per upstream request")
+    parser.add_argument("--lookups", type=int, default=5)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    data = synthetic_f1api(datetime.now().year)(f"/{datetime.now().year}")
+    now = datetime.now(timezone.utc)
+    old, old_result = time_calls(parse_every_call, data, now, args.calls)
+    new, new_result = time_calls(indexed, data, now, args.calls)
+    print(f"races={len(data['races'])} parse per call={old * 1e6:.1f}us  index={new * 1e6:.2f}us "
+          f"({old / new:.0f}x)  same answer: {old_result == new_result}")
+
+    timings, race = asyncio.run(off_season_misses(args.latency, args.lookups))
+    print(f"off-season miss, no index yet: {timings[0] * 1000:.0f}ms; "
+          f"with index: {min(timings[1:]) * 1000:.0f}-{max(timings[1:]) * 1000:.0f}ms -> {race.race_name} {race.date}")
@@ -0,0 +1,130 @@
+"""Count upstream calls as cache workers are added, per shared cache backend.
+
+Each worker is its own ResponseCache, as a uvicorn worker would have, and
+reads the same keys from a stub upstream every ``--interval`` seconds for
+``--seconds``, with entries expiring every ``--ttl`` seconds. "memory" and
+"shm" workers are separate processes; "fake-redis" workers share one
+process and an in-memory stand-in for Redis (no server needed). Run from
+the backend directory:
+
+    python -m bench.bench_shared_cache --workers 1 2 4 8
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+
+import httpx
+
+from bench.stub_upstream import StubUpstream
+from cache import ResponseCache
+from shared_cache import CACHE_SHM_DIR, RedisBackend, SharedMemoryBackend
+
+KEYS = [f"drivers?session_key={9000 + i}" for i in range(20)]
+
+
+class FakeRedis:
+    """The slice of redis.asyncio.Redis that RedisBackend uses, kept in a dict"""
+
+    def __init__(self):
+        self.data = {}
+
+    def _live(self, key):
+        value, expires = self.data.get(key, (None, None))
+        if expires is not None and expires < time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    async def get(self, key):
+        return self._live(key)
+
+    async def set(self, key, value, px=None, nx=False):
+        if nx and self._live(key) is not None:
+            return None
+        self.data[key] = (value, time.monotonic() + px / 1000 if px is not None else None)
+        return True
+
+    async def delete(self, key):
+        return 1 if self.data.pop(key, None) is not None else 0
+
+    async def eval(self, script, numkeys, key, token):
+        # Only RedisBackend.RELEASE_SCRIPT is ever sent
+        if self._live(key) == token:
+            del self.data[key]
+            return 1
+        return 0
+
+    async def aclose(self):
+        pass
+
+
+async def run_worker(shared, base_url, ttl, seconds, interval):
+    cache = ResponseCache(shared=shared, stale_seconds=0)
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        async def load(key):
+            response = await client.get(f"/v1/{key}")
+            return response.json(), len(response.content)
+
+        end = time.monotonic() + seconds
+        while time.monotonic() < end:
+            await asyncio.gather(*(cache.get_or_fetch(key, lambda key=key: load(key), ttl) for key in KEYS))
+            await asyncio.sleep(interval)
+
+
+def worker_process(backend, shm_dir, base_url, ttl, seconds, interval, barrier):
+    shared = SharedMemoryBackend(shm_dir) if backend == "shm" else None
+    barrier.wait()
+    asyncio.run(run_worker(shared, base_url, ttl, seconds, interval))
+
+
+async def run_level(backend, workers, stub, ttl, seconds, interval):
+    stub.reset()
+    if backend == "fake-redis":
+        redis = FakeRedis()
+        await asyncio.gather(*(
+            run_worker(RedisBackend(client=redis), stub.base_url, ttl, seconds, interval) for _ in range(workers)
+        ))
+        return
+
+    shm_dir = tempfile.mkdtemp(prefix="f1-bench-shm-", dir=os.path.dirname(CACHE_SHM_DIR))
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(workers)
+    processes = [
+        context.Process(target=worker_process, args=(backend, shm_dir, stub.base_url, ttl, seconds, interval, barrier))
+        for _ in range(workers)
+    ]
+    try:
+        for process in processes:
+            process.start()
+        for process in processes:
+            await asyncio.to_thread(process.join)
+    finally:
+        shutil.rmtree(shm_dir, ignore_errors=True)
+
+
+async def run(backends, levels, ttl, seconds, interval):
+    stub = await StubUpstream(payload=[{"driver_number": n, "team_name": "Stub"} for n in range(20)],
+                              latency=0.02).start()
+    try:
+        for backend in backends:
+            for workers in levels:
+                await run_level(backend, workers, stub, ttl, seconds, interval)
+                print(f"backend={backend:<10} workers={workers:<3} upstream_requests={stub.requests:<5} "
+                      f"per_key={stub.requests / len(KEYS):.1f} (expiries per key: {seconds / ttl:.0f})")
+    finally:
+        await stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backends", nargs="+", default=["memory", "shm", "fake-redis"])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--ttl", type=float, default=1.0)
+    parser.add_argument("--seconds", type=float, default=4.0)
+    parser.add_argument("--interval", type=float, default=0.1, help="seconds between each worker's reads")
+    args = parser.parse_args()
+    asyncio.run(run(args.backends, args.workers, args.ttl, args.seconds, args.interval))
@@ -0,0 +1,46 @@
+"""Show upstream call count staying flat as /dashboard concurrency grows.
+
+Run from the backend directory:
+
+    python -m bench.bench_single_flight --levels 1 10 100 1000
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+import httpx
+
+import main
+from bench.stub_upstream import StubUpstream, synthetic_season
+from upstream import UpstreamClient
+
+
+async def run(levels, latency):
+    stub = await StubUpstream(handler=synthetic_season(datetime.now().year), latency=latency).start()
+    main.f1api_dev_client = UpstreamClient("f1api.dev", stub.base_url)
+    main.openf1_client = UpstreamClient("OpenF1", f"{stub.base_url}/v1")
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://bench")
+    try:
+        for concurrency in levels:
+            main.response_cache.clear()
+            main.standings_engine.reset()
+            stub.reset()
+            start = time.perf_counter()
+            await asyncio.gather(*(client.get("/dashboard") for _ in range(concurrency)))
+            elapsed = time.perf_counter() - start
+            print(f"concurrency={concurrency:<6} upstream_calls={stub.requests:<5} wall={elapsed:.2f}s")
+    finally:
+        await client.aclose()
+        await main.f1api_dev_client.close()
+        await main.openf1_client.close()
+        await stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--latency", type=float, default=0.02, help="stub latency in seconds")
+    args = parser.parse_args()
+    main.logger.setLevel("WARNING")
+    asyncio.run(run(args.levels, args.latency))
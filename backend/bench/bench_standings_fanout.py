@@ -0,0 +1,54 @@
+"""Show calculated standings wall-clock time tracking the slowest session.
+
+Each session's position download gets its own simulated latency. Run from
+the backend directory:
+
+    python -m bench.bench_standings_fanout --races 24
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime
+
+import main
+from bench.stub_upstream import StubUpstream, synthetic_season
+from upstream import UpstreamClient
+
+
+async def run(races, min_latency, max_latency, seed):
+    rng = random.Random(seed)
+    season = synthetic_season(datetime.now().year, races=races)
+    delays = {9000 + r: rng.uniform(min_latency, max_latency) for r in range(races)}
+
+    def latency(path):
+        key = main.get_query_param(path, "session_key")
+        return delays.get(int(key), 0.0) if key else 0.0
+
+    stub = await StubUpstream(handler=season, latency=latency).start()
+    main.openf1_client = UpstreamClient("OpenF1", f"{stub.base_url}/v1", max_concurrency=races)
+    try:
+        main.response_cache.clear()
+        start = time.perf_counter()
+        drivers, _ = await main.calculate_standings_from_results()
+        elapsed = time.perf_counter() - start
+        print(f"races={races} concurrency={main.STANDINGS_FETCH_CONCURRENCY}")
+        print(f"sum of session latencies  {sum(delays.values()):.2f}s")
+        print(f"slowest session latency   {max(delays.values()):.2f}s")
+        print(f"calculated standings wall {elapsed:.2f}s (leader: {drivers[0].driver_name})")
+    finally:
+        await main.openf1_client.close()
+        await stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--races", type=int, default=24)
+    parser.add_argument("--min-latency", type=float, default=0.1)
+    parser.add_argument("--max-latency", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=main.STANDINGS_FETCH_CONCURRENCY)
+    args = parser.parse_args()
+    main.STANDINGS_FETCH_CONCURRENCY = args.concurrency
+    main.logger.setLevel("WARNING")
+    asyncio.run(run(args.races, args.min_latency, args.max_latency, args.seed))
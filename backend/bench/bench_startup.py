@@ -0,0 +1,67 @@
+"""Measure how long importing the app takes, using ``python -X importtime``.
+
+Reports the cumulative import time of ``main`` (median of several fresh
+interpreters) and its slowest direct imports. With ``--max-ms`` it exits
+non-zero when the median exceeds the budget, and ``--forbid`` fails if a
+module that should load lazily (FastF1 by default) is imported at startup, so
+it can run as a regression check; bench/test_startup.py runs the latter under
+pytest. Run from the backend directory:
+
+    python -m bench.bench_startup --runs 5 --max-ms 1000
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+
+def import_times(module, cwd=None):
+    """Return {module: (self_us, cumulative_us)} for one fresh interpreter"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True, cwd=cwd,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name[1:].rstrip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="slowest direct imports to list")
+    parser.add_argument("--max-ms", type=float, help="fail if the median import time exceeds this")
+    parser.add_argument("--forbid", nargs="*", default=["fastf1", "pandas"],
+                        help="modules that must not be imported at startup")
+    args = parser.parse_args()
+
+    runs = [import_times(args.module) for _ in range(args.runs)]
+    totals = [times[args.module][1] / 1000 for times in runs]
+    median = statistics.median(totals)
+    print(f"import {args.module}: median={median:.0f}ms min={min(totals):.0f}ms max={max(totals):.0f}ms")
+
+    # Direct imports of the module are indented by one level in the tree
+    last = runs[-1]
+    direct = [(cumulative, name.strip()) for name, (_, cumulative) in last.items()
+              if name.startswith("  ") and not name.startswith("   ")]
+    for cumulative, name in sorted(direct, reverse=True)[:args.top]:
+        print(f"  {cumulative / 1000:8.1f}ms  {name}")
+
+    failed = False
+    loaded = [name for name in args.forbid if any(module.strip() == name for module in last)]
+    if loaded:
+        print(f"FAIL: imported at startup: {', '.join(loaded)}")
+        failed = True
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"FAIL: median import time {median:.0f}ms exceeds budget of {args.max_ms:.0f}ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Measure peak RSS of decoding a large laps/position payload whole vs streamed.
+
+Each mode runs in its own subprocess so ru_maxrss is not shared. Run from the
+backend directory:
+
+    python -m bench.bench_streaming_rss --laps 1000 --updates 1000
+"""
+import argparse
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import time
+
+
+def peak_rss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+async def child(mode, base_url):
+    import httpx
+    import main
+    from bench.bench_final_positions import position_columns
+    from upstream import UpstreamClient
+
+    main.openf1_client = UpstreamClient("OpenF1", f"{base_url}/v1")
+    baseline = peak_rss_kb()
+    start = time.perf_counter()
+
+    if mode == "json":
+        async with httpx.AsyncClient(timeout=60.0) as client:
+            laps = (await client.get(f"{base_url}/v1/laps?session_key=9000")).json()
+            positions = (await client.get(f"{base_url}/v1/position?session_key=9000")).json()
+        best = {}
+        for lap in laps:
+            if lap.get('lap_duration') and lap['lap_duration'] > 0:
+                dnum = lap['driver_number']
+                if dnum not in best or lap['lap_duration'] < best[dnum]['lap_duration']:
+                    best[dnum] = lap
+        final = main.final_positions_from(*position_columns(positions))
+        rows = len(laps) + len(positions)
+    else:
+        index = await main.fetch_lap_index(9000)
+        columns = await main.fetch_position_columns(9000)
+        best = index.ranking
+        final = main.final_positions_from(*columns)
+        rows = len(index) + len(columns[0])
+
+    elapsed = time.perf_counter() - start
+    await main.openf1_client.close()
+    print(json.dumps({
+        "rows": rows,
+        "drivers": len(best),
+        "finishers": len(final),
+        "peak_rss_delta_mb": (peak_rss_kb() - baseline) / 1024,
+        "seconds": elapsed,
+    }))
+
+
+async def parent(laps, updates):
+    from bench.stub_upstream import StubUpstream, synthetic_season
+
+    handler = synthetic_season(races=1, laps_per_driver=laps, updates_per_driver=updates)
+    bodies = {path: json.dumps(handler(path)).encode() for path in
+              ("/v1/laps?session_key=9000", "/v1/position?session_key=9000")}
+    stub = await StubUpstream(handler=bodies.__getitem__).start()
+    print(f"laps payload {len(bodies['/v1/laps?session_key=9000']) / 1e6:.1f}MB, "
+          f"position payload {len(bodies['/v1/position?session_key=9000']) / 1e6:.1f}MB")
+    try:
+        for mode in ("json", "stream"):
+            proc = await asyncio.create_subprocess_exec(
+                sys.executable, "-m", "bench.bench_streaming_rss", "--child", mode, stub.base_url,
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            )
+            out, _ = await proc.communicate()
+            result = json.loads(out.decode().strip().splitlines()[-1])
+            print(f"{mode:<7} rows={result['rows']} peak_rss_delta={result['peak_rss_delta_mb']:.1f}MB "
+                  f"time={result['seconds']:.2f}s")
+    finally:
+        await stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "BASE_URL"))
+    parser.add_argument("--laps", type=int, default=1000, help="laps per driver")
+    parser.add_argument("--updates", type=int, default=1000, help="position updates per driver")
+    args = parser.parse_args()
+    if args.child:
+        asyncio.run(child(*args.child))
+    else:
+        asyncio.run(parent(args.laps, args.updates))
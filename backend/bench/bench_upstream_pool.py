@@ -0,0 +1,64 @@
+"""Compare a fresh httpx client per call against the pooled UpstreamClient.
+
+Run from the backend directory:
+
+    python -m bench.bench_upstream_pool --requests 500 --concurrency 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from bench.stub_upstream import StubUpstream
+from upstream import UpstreamClient
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run(label, stub, get, total, concurrency):
+    stub.reset()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await get(f"position?session_key={i % 24}")
+            response.json()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one(i) for i in range(total)))
+    print(f"{label:<10} handshakes={stub.connections:<5} requests={stub.requests:<5} "
+          f"p50={statistics.median(latencies):.2f}ms p99={percentile(latencies, 99):.2f}ms")
+
+
+async def main(total, concurrency, latency):
+    payload = [{"driver_number": n, "position": n, "date": "2025-01-01T00:00:00"} for n in range(1, 21)]
+    stub = await StubUpstream(payload=payload, latency=latency).start()
+
+    async def per_call(path):
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            return await client.get(f"{stub.base_url}/{path}")
+
+    pooled = UpstreamClient("stub", stub.base_url, max_concurrency=concurrency)
+    await pooled.start()
+    try:
+        await run("per-call", stub, per_call, total, concurrency)
+        await run("pooled", stub, pooled.get, total, concurrency)
+    finally:
+        await pooled.close()
+        await stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.005, help="stub latency in seconds")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.latency))
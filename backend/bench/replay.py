@@ -0,0 +1,109 @@
+"""Record f1api.dev and OpenF1 responses as fixtures and replay them from local stubs.
+
+Recording calls every benchmarked endpoint and the OpenF1 fallback
+sources once, in-process, with the upstream clients pointed at stubs that
+save each response they serve: either proxies to the live APIs or the
+synthetic season (no network).
+Replaying serves exactly those bodies and answers 404 to anything else.
+Paths contain the season year, so fixtures replay fully only in the year
+they were recorded. Run from the backend directory:
+
+    python -m bench.replay --out fixtures/              # live APIs
+    python -m bench.replay --out fixtures/ --synthetic  # synthetic season
+"""
+import argparse
+import asyncio
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict
+
+import httpx
+
+import main
+from bench.stub_upstream import StubUpstream, synthetic_f1api, synthetic_season
+from upstream import UpstreamClient
+
+# Endpoints driven while recording, and by bench_load
+ENDPOINTS = ("/dashboard", "/f1-data", "/drivers", "/teams", "/next-race", "/fastest-lap")
+
+# Fixture file name -> live host; OpenF1 paths carry their /v1 prefix
+UPSTREAMS = {"f1api.dev": "https://live.f1api.dev", "openf1": "https://api.openf1.org"}
+
+
+def proxy(base_url: str) -> Callable[[str], Any]:
+    client = httpx.AsyncClient(base_url=base_url, timeout=60)
+
+    async def handler(path: str) -> Any:
+        response = await client.get(path)
+        return response.json() if response.status_code == 200 else None
+
+    return handler
+
+
+def replay_handler(fixtures: Dict[str, Any]) -> Callable[[str], Any]:
+    return fixtures.get
+
+
+def load_fixtures(directory: str) -> Dict[str, Dict[str, Any]]:
+    fixtures = {}
+    for name in UPSTREAMS:
+        with open(os.path.join(directory, f"{name}.json")) as f:
+            fixtures[name] = json.load(f)
+    return fixtures
+
+
+def save_fixtures(directory: str, fixtures: Dict[str, Dict[str, Any]]) -> None:
+    os.makedirs(directory, exist_ok=True)
+    for name, recorded in fixtures.items():
+        with open(os.path.join(directory, f"{name}.json"), "w") as f:
+            json.dump(recorded, f)
+
+
+def point_app_at(stubs: Dict[str, StubUpstream]) -> None:
+    """Swap main's upstream clients for ones aimed at the stubs"""
+    main.f1api_dev_client = UpstreamClient("f1api.dev", stubs["f1api.dev"].base_url)
+    main.openf1_client = UpstreamClient("OpenF1", f"{stubs['openf1'].base_url}/v1")
+
+
+async def record(directory: str, synthetic: bool) -> Dict[str, int]:
+    """Record fixtures into ``directory``; returns the number of paths per upstream"""
+    year = datetime.now().year
+    if synthetic:
+        handlers = {"f1api.dev": synthetic_f1api(year), "openf1": synthetic_season(year)}
+    else:
+        handlers = {name: proxy(url) for name, url in UPSTREAMS.items()}
+    stubs = {name: await StubUpstream(handler=handler, record=True).start() for name, handler in handlers.items()}
+    point_app_at(stubs)
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://record") as client:
+            for path in ENDPOINTS:
+                await client.get(path)
+        # And the fallback sources, so replays with f1api.dev failures injected find their data too
+        await main.calculate_standings_from_results()
+        await main.next_race_from_meetings(year, datetime.now(timezone.utc))
+    finally:
+        await main.f1api_dev_client.close()
+        await main.openf1_client.close()
+        for stub in stubs.values():
+            await stub.stop()
+    save_fixtures(directory, {name: stub.recorded for name, stub in stubs.items()})
+    return {name: len(stub.recorded) for name, stub in stubs.items()}
+
+
+async def start_replay(fixtures: Dict[str, Dict[str, Any]], **stub_options) -> Dict[str, StubUpstream]:
+    """One replay stub per upstream; options (latency, jitter, failure_rate, seed) go to StubUpstream"""
+    return {
+        name: await StubUpstream(handler=replay_handler(recorded), **stub_options).start()
+        for name, recorded in fixtures.items()
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--out", required=True, help="fixture directory")
+    parser.add_argument("--synthetic", action="store_true", help="record the synthetic season instead of live APIs")
+    args = parser.parse_args()
+    main.logger.setLevel("WARNING")
+    counts = asyncio.run(record(args.out, args.synthetic))
+    print(", ".join(f"{name}: {count} paths" for name, count in counts.items()))
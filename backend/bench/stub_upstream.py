@@ -0,0 +1,337 @@
+"""Minimal keep-alive HTTP/1.1 stub used by the benchmark scripts.
+
+Serves canned JSON (or pre-encoded bytes) on any path and counts accepted TCP
+connections, which is the number of handshakes a client performed against it.
+A handler may be async (e.g. a recording proxy) and returns None for a 404.
+"""
+import asyncio
+import inspect
+import json
+import random
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, List, Optional, Union
+from urllib.parse import unquote
+
+
+class StubUpstream:
+    def __init__(self, payload: Any = None, latency: Union[float, Callable[[str], float]] = 0.0,
+                 handler: Optional[Callable[[str], Any]] = None, jitter: float = 0.0,
+                 failure_rate: float = 0.0, seed: int = 0, record: bool = False):
+        self.payload = payload if payload is not None else []
+        self.latency = latency
+        self.handler = handler
+        # Extra uniform delay up to ``jitter`` seconds, and the share of
+        # requests answered 503, both drawn from a seeded generator
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        # path -> last payload served, for saving as replay fixtures
+        self.recorded: Optional[dict] = {} if record else None
+        self.failures = 0
+        self.connections = 0
+        self.requests = 0
+        self.bytes_sent = 0
+        # (path, body size) of every response, for checking what a client downloaded
+        self.responses: List[tuple] = []
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def reset(self) -> None:
+        self.connections = 0
+        self.requests = 0
+        self.bytes_sent = 0
+        self.responses = []
+        self.failures = 0
+
+    async def start(self) -> "StubUpstream":
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return self
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                path = head.split(b" ", 2)[1].decode()
+                self.requests += 1
+                delay = self.latency(path) if callable(self.latency) else self.latency
+                if self.jitter:
+                    delay += self.random.uniform(0, self.jitter)
+                if delay:
+                    await asyncio.sleep(delay)
+                if self.failure_rate and self.random.random() < self.failure_rate:
+                    self.failures += 1
+                    status, payload = b"503 Service Unavailable", {"detail": "injected failure"}
+                else:
+                    payload = self.handler(path) if self.handler else self.payload
+                    if inspect.isawaitable(payload):
+                        payload = await payload
+                    status = b"200 OK"
+                    if payload is None:
+                        status, payload = b"404 Not Found", {"detail": "Not Found"}
+                    elif self.recorded is not None:
+                        self.recorded[path] = payload
+                body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+                self.bytes_sent += len(body)
+                self.responses.append((path, len(body)))
+                writer.write(
+                    b"HTTP/1.1 " + status + b"\r\n"
+                    b"Content-Type: application/json\r\n"
+                    b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.CancelledError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+DRIVER_NUMBERS = [1, 22, 16, 44, 63, 12, 4, 81, 14, 18, 10, 43, 31, 87, 27, 5, 23, 55, 30, 6]
+
+
+def synthetic_season(year: int = 2025, races: int = 24, updates_per_driver: int = 50,
+                     laps_per_driver: int = 57) -> Callable[[str], Any]:
+    """Build a path handler serving a synthetic finished season in OpenF1 shape.
+
+    f1api.dev paths return an empty object so the OpenF1 fallbacks are used.
+    Two drivers swap seats halfway through the season.
+    """
+    sessions = [
+        {
+            "session_key": 9000 + r,
+            "meeting_key": 1200 + r,
+            "meeting_name": f"Grand Prix {r + 1}",
+            "session_type": "Race",
+            "date_start": f"{year}-03-{r % 28 + 1:02d}T13:00:00+00:00",
+            "date_end": f"{year}-03-{r % 28 + 1:02d}T15:00:00+00:00",
+        }
+        for r in range(races)
+    ]
+
+    teams = ["Red Bull Racing", "Ferrari", "Mercedes", "McLaren", "Aston Martin",
+             "Alpine", "Haas F1 Team", "Kick Sauber", "Williams", "Racing Bulls"]
+
+    def drivers(session_key):
+        seats = list(DRIVER_NUMBERS)
+        if session_key - 9000 >= races // 2:
+            # Mid-season swap between the first and last teams' second drivers
+            seats[1], seats[19] = seats[19], seats[1]
+        return [
+            {"session_key": session_key, "driver_number": number, "name_acronym": f"D{number:02d}",
+             "first_name": "Driver", "last_name": str(number), "full_name": f"Driver {number}",
+             "team_name": teams[seat // 2]}
+            for seat, number in enumerate(seats)
+        ]
+
+    def positions(session_key):
+        rows = []
+        for step in range(updates_per_driver):
+            order = DRIVER_NUMBERS[step % len(DRIVER_NUMBERS):] + DRIVER_NUMBERS[:step % len(DRIVER_NUMBERS)]
+            if step == updates_per_driver - 1:
+                shift = session_key % len(DRIVER_NUMBERS)
+                order = DRIVER_NUMBERS[shift:] + DRIVER_NUMBERS[:shift]
+            for place, number in enumerate(order, 1):
+                rows.append({
+                    "session_key": session_key,
+                    "driver_number": number,
+                    "position": place,
+                    "date": f"{year}-03-01T13:{step // 60:02d}:{step % 60:02d}.{place:03d}000+00:00",
+                })
+        return rows
+
+    def laps(session_key):
+        rows = []
+        for index, number in enumerate(DRIVER_NUMBERS):
+            for lap in range(1, laps_per_driver + 1):
+                s1 = 25.0 + (index * 7 + lap * 3 + session_key) % 50 / 100
+                s2 = 30.0 + (index * 5 + lap * 11 + session_key) % 70 / 100
+                s3 = 24.0 + (index * 3 + lap * 13 + session_key) % 90 / 100
+                rows.append({
+                    "session_key": session_key,
+                    "driver_number": number,
+                    "lap_number": lap,
+                    "date_start": f"{year}-03-01T13:{lap:02d}:{index:02d}+00:00",
+                    "duration_sector_1": round(s1, 3),
+                    "duration_sector_2": round(s2, 3),
+                    "duration_sector_3": round(s3, 3),
+                    "lap_duration": round(s1 + s2 + s3, 3) if lap > 1 else None,
+                    "meeting_key": session_key - 7800,
+                    "i1_speed": 280 + index,
+                    "i2_speed": 250 + lap % 30,
+                    "st_speed": 300 + index % 7,
+                    "is_pit_out_lap": lap == 1,
+                    "segments_sector_1": [2049, 2049, 2051, 2049, 2049, 2049, 2049],
+                    "segments_sector_2": [2049, 2049, 2049, 2049, 2049, 2049, 2049, 2049],
+                    "segments_sector_3": [2049, 2049, 2049, 2048, 2049, 2049, 2049, 2049, 2049],
+                })
+        return rows
+
+    def handler(path: str) -> Any:
+        resource, _, query = path.partition("?")
+        params = dict(part.partition("=")[::2] for part in query.split("&") if part)
+        if resource.endswith("/sessions"):
+            return sessions if params.get("year") == str(year) else []
+        if resource.endswith("/meetings"):
+            return []
+        if resource.endswith("/position"):
+            return positions(int(params["session_key"]))
+        if resource.endswith("/drivers") and "session_key" in params:
+            return drivers(int(params["session_key"]))
+        if resource.endswith("/laps"):
+            rows = laps(int(params["session_key"]))
+            for name in ("driver_number", "lap_number"):
+                if name in params:
+                    rows = [row for row in rows if row[name] == int(params[name])]
+            return rows
+        return {}
+
+    return handler
+
+
+def synthetic_f1api(year: int = 2025, races: int = 24) -> Callable[[str], Any]:
+    """Build a path handler serving f1api.dev standings and calendars.
+
+    The calendar has races on the 1st and 15th of each month, so some still
+    lie ahead for most of the year; next season's calendar is served too.
+    """
+    teams = ["Red Bull Racing", "Ferrari", "Mercedes", "McLaren", "Aston Martin",
+             "Alpine", "Williams", "RB", "Sauber", "Haas F1 Team"]
+    drivers = [
+        {"position": place, "driver_name": f"Driver {number}", "abbreviation": f"D{number:02d}",
+         "team": teams[(place - 1) // 2], "points": 400 - place * 17}
+        for place, number in enumerate(DRIVER_NUMBERS, 1)
+    ]
+    team_table = [{"position": place, "team_name": name, "points": 700 - place * 60}
+                  for place, name in enumerate(teams, 1)]
+
+    def calendar(season: int) -> dict:
+        return {"season": season, "races": [
+            {"round": r + 1, "race_name": f"Grand Prix {r + 1}", "location": f"Circuit {r + 1}",
+             "country": f"Country {r + 1}",
+             "date": f"{season}-{r // 2 + 1:02d}-{1 + (r % 2) * 14:02d}T13:00:00Z"}
+            for r in range(races)
+        ]}
+
+    def handler(path: str) -> Any:
+        parts = path.strip("/").split("/")
+        if parts[0] not in (str(year), str(year + 1)):
+            return None
+        if len(parts) == 1:
+            return calendar(int(parts[0]))
+        if parts[1:] == ["standings", "drivers"]:
+            return {"season": year, "standings": drivers}
+        if parts[1:] == ["standings", "teams"]:
+            return {"season": year, "standings": team_table}
+        return None
+
+    return handler
+
+
+_FILTER = re.compile(r"^([a-z_0-9]+)(>=|<=|>|<|=)(.*)$")
+
+
+def filter_rows(rows: List[dict], query: str) -> List[dict]:
+    """Apply OpenF1-style query filters (``date>=...``, ``lap_number=3``) to rows"""
+    for part in query.split("&"):
+        match = _FILTER.match(unquote(part))
+        if not match:
+            continue
+        name, op, raw = match.groups()
+        if name == "session_key":
+            continue
+        for row in rows[:1]:
+            value = type(row[name])(raw) if isinstance(row.get(name), (int, float)) else raw
+            break
+        else:
+            return rows
+        compare = {
+            ">=": lambda a: a >= value, "<=": lambda a: a <= value, ">": lambda a: a > value,
+            "<": lambda a: a < value, "=": lambda a: a == value,
+        }[op]
+        rows = [row for row in rows if row.get(name) is not None and compare(row[name])]
+    return rows
+
+
+def synthetic_live_session(session_key: int = 9900, lap_seconds: float = 2.0,
+                           position_interval: float = 0.5,
+                           clock: Callable[[], float] = time.time) -> Callable[[str], Any]:
+    """Build a path handler for an OpenF1 session that is running right now.
+
+    Lap rows appear when a lap starts and get their durations when it ends;
+    a pair of drivers swaps places every ``position_interval`` seconds.
+    Everything is derived from ``clock`` (the wall clock unless given), so
+    data grows between calls.
+    """
+    started = clock()
+    start_dt = datetime.now(timezone.utc)
+    session = {
+        "session_key": session_key,
+        "session_type": "Race",
+        "session_name": "Race",
+        "meeting_name": "Live Grand Prix",
+        "date_start": start_dt.isoformat(),
+        "date_end": (start_dt + timedelta(hours=2)).isoformat(),
+    }
+
+    def at(seconds: float) -> str:
+        return (start_dt + timedelta(seconds=seconds)).isoformat(timespec="microseconds")
+
+    def laps(now: float) -> List[dict]:
+        rows = []
+        for index, number in enumerate(DRIVER_NUMBERS):
+            lap_time = lap_seconds * (1 + index / 200)
+            lap = 1
+            while (lap - 1) * lap_time <= now:
+                begin = (lap - 1) * lap_time
+                done = begin + lap_time <= now
+                s = [round(lap_time / 3 * (1 + ((index + lap * k) % 7) / 100), 3) for k in (1, 2, 3)]
+                rows.append({
+                    "session_key": session_key,
+                    "driver_number": number,
+                    "lap_number": lap,
+                    "date_start": at(begin),
+                    "duration_sector_1": s[0] if done else None,
+                    "duration_sector_2": s[1] if done else None,
+                    "duration_sector_3": s[2] if done else None,
+                    "lap_duration": round(sum(s), 3) if done and lap > 1 else None,
+                    "is_pit_out_lap": lap == 1,
+                })
+                lap += 1
+        return rows
+
+    def positions(now: float) -> List[dict]:
+        rows = [{"session_key": session_key, "driver_number": number, "position": place,
+                 "date": at(0)} for place, number in enumerate(DRIVER_NUMBERS, 1)]
+        order = list(DRIVER_NUMBERS)
+        step = 1
+        while step * position_interval <= now:
+            i = step % (len(order) - 1)
+            order[i], order[i + 1] = order[i + 1], order[i]
+            for place in (i + 1, i + 2):
+                rows.append({"session_key": session_key, "driver_number": order[place - 1],
+                             "position": place, "date": at(step * position_interval)})
+            step += 1
+        return rows
+
+    def handler(path: str) -> Any:
+        resource, _, query = path.partition("?")
+        now = clock() - started
+        if resource.endswith("/sessions"):
+            return [session]
+        if resource.endswith("/position"):
+            return filter_rows(positions(now), query)
+        if resource.endswith("/laps"):
+            return filter_rows(laps(now), query)
+        return []
+
+    return handler
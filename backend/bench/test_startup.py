@@ -0,0 +1,19 @@
+"""Startup regression check: importing the app must not load FastF1 or pandas.
+
+Run from the backend directory:
+
+    python -m pytest bench/test_startup.py
+"""
+import os
+
+from bench.bench_startup import import_times
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAZY_MODULES = ("fastf1", "pandas")
+
+
+def test_main_import_defers_fastf1_and_pandas():
+    times = import_times("main", cwd=BACKEND_DIR)
+    assert "main" in times
+    loaded = [name for name in LAZY_MODULES if any(module.strip() == name for module in times)]
+    assert loaded == [], f"imported at startup: {', '.join(loaded)}"
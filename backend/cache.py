@@ -0,0 +1,318 @@
+import asyncio
+import contextvars
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from env import env_float, env_int
+from shared_cache import (
+    CACHE_LOCK_LEASE, CACHE_SHARED_FOREVER_EXPIRE, SharedBackend, decode_record, encode_record
+)
+from upstream import UpstreamUnavailable, background_priority, in_background
+
+logger = logging.getLogger(__name__)
+
+# Never expires; entries can still be evicted when the byte budget is exceeded
+FOREVER = float("inf")
+
+CACHE_MAX_BYTES = env_int("CACHE_MAX_BYTES", 256 * 1024 * 1024)
+CACHE_STALE_SECONDS = env_float("CACHE_STALE_SECONDS", 24 * 3600.0)
+# How often a worker waiting on another's refresh looks for its result
+SHARED_POLL_INTERVAL = 0.05
+# A revalidation takes a shared record written this recently by another worker
+# instead of reloading; below the hot prefetch interval so each run refreshes once
+SHARED_REVALIDATE_WINDOW = 30.0
+
+# Set while revalidating: expiring entries are reloaded even if still fresh
+_revalidate = contextvars.ContextVar("revalidate", default=False)
+
+
+@contextmanager
+def revalidating():
+    """Make cache lookups in this context reload entries that have a finite TTL.
+
+    Used by background warm-ups so data is refreshed before users see it
+    expire. Entries cached forever are left alone.
+    """
+    token = _revalidate.set(True)
+    try:
+        yield
+    finally:
+        _revalidate.reset(token)
+
+
+# A loader returns the decoded value and its size in bytes, or None on failure
+Loader = Callable[[], Awaitable[Optional[Tuple[Any, int]]]]
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one in-flight task.
+
+    The first caller starts the work; everyone arriving while it runs awaits
+    the same task. The task is shielded, so a cancelled caller does not
+    cancel the shared work for the others. Background work (low upstream
+    priority or revalidation) runs in flights of its own, so a user request
+    never joins a task that carries those context flags.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Any, asyncio.Task] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    def __contains__(self, key: Any) -> bool:
+        return any((key, revalidate, background) in self._inflight
+                   for revalidate in (False, True) for background in (False, True))
+
+    async def do(self, key: Any, func: Callable[[], Awaitable[Any]]) -> Any:
+        key = (key, _revalidate.get(), in_background())
+        task = self._inflight.get(key)
+        if task is None:
+            self.started += 1
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Any, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        # Every waiter may have been cancelled (e.g. hedged away); retrieve the
+        # exception so asyncio does not report it as never retrieved
+        if not task.cancelled():
+            task.exception()
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    size: int
+    fetched_at: float
+    ttl: float
+
+    def age(self, now: float) -> float:
+        return now - self.fetched_at
+
+    def is_fresh(self, now: float) -> bool:
+        return self.age(now) < self.ttl
+
+
+class ResponseCache:
+    """In-memory LRU cache with per-entry TTL and stale-while-revalidate.
+
+    Fresh entries are served directly. Entries past their TTL but within the
+    stale window are served immediately while a background task refreshes
+    them. Least recently used entries are evicted once the total size of the
+    cached payloads exceeds ``max_bytes``.
+
+    With a ``shared`` backend, loads first look for a record another worker
+    stored, and only the worker holding the key's lock calls the loader.
+    """
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES, stale_seconds: float = CACHE_STALE_SECONDS,
+                 shared: Optional[SharedBackend] = None, lock_lease: float = CACHE_LOCK_LEASE):
+        self.max_bytes = max_bytes
+        self.stale_seconds = stale_seconds
+        self.shared = shared
+        self.lock_lease = lock_lease
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._flight = SingleFlight()
+        self._tasks: set = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.stale_if_error = 0
+        self.evictions = 0
+        self.shared_hits = 0
+        self.shared_waits = 0
+        self.shared_errors = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        return self._entries.get(key)
+
+    def set(self, key: str, value: Any, size: int, ttl: float, age: float = 0.0) -> None:
+        """Store a value; ``age`` backdates it, e.g. for data reloaded from disk"""
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
+        self._entries[key] = CacheEntry(value, size, time.monotonic() - age, ttl)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.evictions += 1
+
+    def discard(self, key: str) -> None:
+        """Drop a key from this process only"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    async def invalidate(self, key: str) -> None:
+        """Drop a key here and from the shared backend, so the next lookup reloads it"""
+        self.discard(key)
+        if self.shared is not None:
+            try:
+                await self.shared.delete(key)
+            except Exception as e:
+                self.shared_errors += 1
+                logger.error(f"Error deleting shared cache entry {key}: {e}")
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    async def get_or_fetch(self, key: str, loader: Loader, ttl: float) -> Optional[Any]:
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            if _revalidate.get() and entry.ttl != FOREVER:
+                return await self._reload_or_stale(key, loader, ttl, entry)
+            if entry.is_fresh(now):
+                self.hits += 1
+                return entry.value
+            if entry.age(now) < entry.ttl + self.stale_seconds:
+                self.stale_hits += 1
+                self._refresh_in_background(key, loader, ttl)
+                return entry.value
+
+        self.misses += 1
+        if entry is None:
+            return await self._flight.do(key, lambda: self._load(key, loader, ttl))
+        # Too old to serve while refreshing, but better than nothing if the
+        # reload fails or is shed
+        return await self._reload_or_stale(key, loader, ttl, entry)
+
+    async def _reload_or_stale(self, key: str, loader: Loader, ttl: float, entry: CacheEntry) -> Any:
+        """Reload an entry, falling back to its current value if that fails"""
+        try:
+            value = await self._flight.do(key, lambda: self._load(key, loader, ttl))
+        except UpstreamUnavailable:
+            value = None
+        except Exception as e:
+            logger.error(f"Error reloading cache entry {key}, serving it stale: {e}")
+            value = None
+        if value is None:
+            self.stale_if_error += 1
+            return entry.value
+        return value
+
+    async def _load(self, key: str, loader: Loader, ttl: float) -> Optional[Any]:
+        if self.shared is not None:
+            return await self._load_shared(key, loader, ttl)
+        result = await loader()
+        if result is None:
+            return None
+        value, size = result
+        self.set(key, value, size, ttl)
+        return value
+
+    async def _load_shared(self, key: str, loader: Loader, ttl: float) -> Optional[Any]:
+        """Take another worker's result, or refresh the key under its shared lock"""
+        revalidate = _revalidate.get()
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.lock_lease
+        locked = waited = False
+        try:
+            while True:
+                value = await self._from_shared(key, revalidate)
+                if value is not None:
+                    return value
+                if locked:
+                    break
+                locked = await self.shared.acquire(key, token, self.lock_lease)
+                if locked:
+                    # Check once more: the previous holder may have stored it just now
+                    continue
+                if time.monotonic() >= deadline:
+                    break
+                if not waited:
+                    waited = True
+                    self.shared_waits += 1
+                await asyncio.sleep(SHARED_POLL_INTERVAL)
+        except Exception as e:
+            self.shared_errors += 1
+            logger.error(f"Error reading shared cache for {key}: {e}")
+
+        try:
+            result = await loader()
+            if result is None:
+                return None
+            value, size = result
+            self.set(key, value, size, ttl)
+            try:
+                expire = CACHE_SHARED_FOREVER_EXPIRE if ttl == FOREVER else ttl + self.stale_seconds
+                await self.shared.set(key, encode_record(value, ttl), expire)
+            except Exception as e:
+                self.shared_errors += 1
+                logger.error(f"Error writing shared cache for {key}: {e}")
+            return value
+        finally:
+            if locked:
+                try:
+                    await self.shared.release(key, token)
+                except Exception as e:
+                    logger.error(f"Error releasing shared cache lock for {key}: {e}")
+
+    async def _from_shared(self, key: str, revalidate: bool) -> Optional[Any]:
+        payload = await self.shared.get(key)
+        if payload is None:
+            return None
+        record = decode_record(payload)
+        age = max(0.0, time.time() - record.fetched_at)
+        if age >= (min(record.ttl, SHARED_REVALIDATE_WINDOW) if revalidate else record.ttl):
+            return None
+        self.shared_hits += 1
+        self.set(key, record.value, record.size, record.ttl, age=age)
+        return record.value
+
+    def _refresh_in_background(self, key: str, loader: Loader, ttl: float) -> None:
+        if key in self._flight:
+            return
+
+        async def refresh():
+            try:
+                with background_priority():
+                    await self._flight.do(key, lambda: self._load(key, loader, ttl))
+            except UpstreamUnavailable:
+                pass  # shed or circuit open; a later read tries again
+            except Exception as e:
+                logger.error(f"Error refreshing cache entry {key}: {e}")
+
+        task = asyncio.create_task(refresh())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "stale_if_error": self.stale_if_error,
+            "evictions": self.evictions,
+            "coalesced": self._flight.coalesced,
+            "shared_backend": self.shared.name if self.shared is not None else "memory",
+            "shared_hits": self.shared_hits,
+            "shared_waits": self.shared_waits,
+            "shared_errors": self.shared_errors,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,112 @@
+"""Who drove which car, per session.
+
+Built from OpenF1's ``drivers?session_key=`` rows, so seat and team changes
+during a season are attributed to the right team in each race. Records
+live in a list indexed by car number, and team names are interned as small
+integer ids that stay the same across sessions, so points can be summed in
+arrays indexed by car number and team id. The ids are per process; records
+carry the team name and re-intern it when unpickled by another worker.
+"""
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Car numbers run from 1 to 99
+MAX_DRIVER_NUMBER = 100
+
+
+class TeamIds:
+    """Team names interned as dense integer ids, shared by every registry"""
+
+    def __init__(self):
+        self.names: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def id(self, name: str) -> int:
+        team_id = self._ids.get(name)
+        if team_id is None:
+            team_id = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return team_id
+
+
+team_ids = TeamIds()
+UNKNOWN_TEAM = "Unknown"
+UNKNOWN_TEAM_ID = team_ids.id(UNKNOWN_TEAM)
+
+
+class DriverRecord:
+    __slots__ = ("number", "name", "abbr", "team", "team_id")
+
+    def __init__(self, number: int, name: str, abbr: str, team: str):
+        self.number = number
+        self.name = name
+        self.abbr = abbr
+        self.team = team
+        self.team_id = team_ids.id(team)
+
+    # Team ids are only meaningful in the process that interned them, so a
+    # record unpickled from the shared cache re-interns its team by name
+    def __getstate__(self) -> Tuple[int, str, str, str]:
+        return self.number, self.name, self.abbr, self.team
+
+    def __setstate__(self, state: Tuple[int, str, str, str]) -> None:
+        self.__init__(*state)
+
+    def __repr__(self) -> str:
+        return f"DriverRecord({self.number}, {self.name!r}, {self.abbr!r}, {self.team!r})"
+
+
+@lru_cache(maxsize=MAX_DRIVER_NUMBER)
+def unknown_driver(number: int) -> DriverRecord:
+    """Placeholder for a car number nobody is registered under, made once per number"""
+    return DriverRecord(number, f"Driver {number}", f"D{number}", UNKNOWN_TEAM)
+
+
+class DriverRegistry:
+    """Drivers of one session, looked up by car number with a list index"""
+
+    def __init__(self, entries: Iterable[Tuple[int, str, str, str]] = (),
+                 fallback: Optional["DriverRegistry"] = None):
+        # Numbers the session does not list resolve through the fallback roster
+        self._records: List[Optional[DriverRecord]] = (
+            list(fallback._records) if fallback is not None else [None] * MAX_DRIVER_NUMBER
+        )
+        self.numbers: List[int] = []
+        for entry in entries:
+            self.add(*entry)
+
+    @classmethod
+    def from_openf1(cls, rows: List[dict], fallback: Optional["DriverRegistry"] = None) -> Optional["DriverRegistry"]:
+        """Registry from OpenF1 driver rows, or None if none of them is usable"""
+        entries = []
+        for row in rows:
+            number = row.get("driver_number")
+            if not isinstance(number, int) or not 0 < number < MAX_DRIVER_NUMBER:
+                continue
+            first, last = row.get("first_name"), row.get("last_name")
+            name = f"{first} {last}" if first and last else row.get("full_name") or f"Driver {number}"
+            entries.append((number, name, row.get("name_acronym") or f"D{number}", row.get("team_name") or UNKNOWN_TEAM))
+        if not entries:
+            return None
+        return cls(entries, fallback)
+
+    def add(self, number: int, name: str, abbr: str, team: str) -> DriverRecord:
+        record = DriverRecord(number, name, abbr, team)
+        self._records[number] = record
+        self.numbers.append(number)
+        return record
+
+    def get(self, number: int) -> DriverRecord:
+        record = self._records[number] if 0 <= number < MAX_DRIVER_NUMBER else None
+        return record if record is not None else unknown_driver(number)
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    @property
+    def nbytes(self) -> int:
+        """Rough size, for the response cache budget"""
+        return 8 * MAX_DRIVER_NUMBER + 200 * len(self.numbers)
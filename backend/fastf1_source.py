@@ -0,0 +1,30 @@
+import logging
+import os
+from types import ModuleType
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# On-disk cache of FastF1 downloads; set FASTF1_CACHE_DIR='' to disable it
+FASTF1_CACHE_DIR = os.environ.get("FASTF1_CACHE_DIR", "cache")
+
+_fastf1: Optional[ModuleType] = None
+
+
+def get_fastf1() -> ModuleType:
+    """Import FastF1 and enable its cache on first use.
+
+    FastF1 pulls in pandas, requests and friends, which takes longer than
+    importing the rest of the app, so it is only loaded by the code that
+    actually needs it rather than at process start.
+    """
+    global _fastf1
+    if _fastf1 is None:
+        import fastf1
+
+        if FASTF1_CACHE_DIR:
+            os.makedirs(FASTF1_CACHE_DIR, exist_ok=True)
+            fastf1.Cache.enable_cache(FASTF1_CACHE_DIR)
+        _fastf1 = fastf1
+        logger.info(f"FastF1 loaded (cache: {FASTF1_CACHE_DIR or 'disabled'})")
+    return _fastf1
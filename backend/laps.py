@@ -0,0 +1,227 @@
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+
+class Lap(NamedTuple):
+    driver_number: int
+    lap_number: int
+    lap_duration: Optional[float]
+    sectors: List[Optional[float]]
+
+
+class LapColumns:
+    """Append-only column buffers filled while a laps payload streams in"""
+
+    def __init__(self):
+        self.driver_numbers = array('i')
+        self.lap_numbers = array('i')
+        self.durations = array('d')
+        self.sectors = (array('d'), array('d'), array('d'))
+
+    def append(self, row: dict) -> None:
+        self.driver_numbers.append(row['driver_number'])
+        self.lap_numbers.append(row.get('lap_number') or 0)
+        self.durations.append(_number(row.get('lap_duration')))
+        for i, column in enumerate(self.sectors, 1):
+            column.append(_number(row.get(f'duration_sector_{i}')))
+
+
+def _number(value) -> float:
+    # Missing and non-positive durations are stored as NaN
+    return float(value) if value and value > 0 else np.nan
+
+
+def _optional(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+# A driver whose latest lap started this many typical lap times before the
+# newest lap start has stopped (retired or parked) and no longer holds the cursor
+STALE_LAPS = 2
+
+
+def lap_cursor(latest: Iterable[dict], lap_times: Iterable[float]) -> Optional[str]:
+    """date_start of the oldest lap still in progress among each driver's latest lap.
+
+    ``lap_times`` are recent completed lap durations; their median is the
+    typical lap time. Without any, every driver's latest lap counts.
+    """
+    starts = sorted(row['date_start'] for row in latest if row.get('date_start'))
+    if not starts:
+        return None
+    lap_times = sorted(lap_times)
+    if not lap_times:
+        return starts[0]
+    try:
+        cutoff = _parse_date(starts[-1]) - timedelta(seconds=STALE_LAPS * lap_times[len(lap_times) // 2])
+        return next(start for start in starts if _parse_date(start) >= cutoff)
+    except ValueError:
+        return starts[0]
+
+
+def _parse_date(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+class LapTracker:
+    """Lap rows of a session that is still running, refreshed with only the rows that changed.
+
+    OpenF1 adds a lap row when the lap starts and fills in its durations when
+    it ends, so a refresh only needs rows starting from the oldest lap that
+    may still be in progress: each driver's latest one, skipping drivers
+    that stopped long ago (see lap_cursor).
+    """
+
+    FIELDS = ('driver_number', 'lap_number', 'date_start', 'lap_duration',
+              'duration_sector_1', 'duration_sector_2', 'duration_sector_3')
+
+    def __init__(self):
+        self._rows: Dict[tuple[int, int], dict] = {}
+        self._latest: Dict[int, dict] = {}
+        # Each driver's latest completed lap, as (lap_number, lap_duration)
+        self._last_completed: Dict[int, tuple[int, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def cursor(self) -> Optional[str]:
+        """date_start to ask for rows from, or None before the first fetch"""
+        return lap_cursor(self._latest.values(), (duration for _, duration in self._last_completed.values()))
+
+    def merge(self, rows: List[dict]) -> None:
+        for row in rows:
+            if row.get('driver_number') is None or not row.get('lap_number'):
+                continue
+            slim = {name: row.get(name) for name in self.FIELDS}
+            self._rows[(slim['driver_number'], slim['lap_number'])] = slim
+            latest = self._latest.get(slim['driver_number'])
+            if latest is None or slim['lap_number'] >= latest['lap_number']:
+                self._latest[slim['driver_number']] = slim
+            duration = slim['lap_duration']
+            if duration and duration > 0:
+                completed = self._last_completed.get(slim['driver_number'])
+                if completed is None or slim['lap_number'] >= completed[0]:
+                    self._last_completed[slim['driver_number']] = (slim['lap_number'], duration)
+
+    def index(self) -> "LapIndex":
+        columns = LapColumns()
+        for row in self._rows.values():
+            columns.append(row)
+        return LapIndex.from_columns(columns)
+
+
+class LapIndex:
+    """Immutable, array-backed lap data of one session.
+
+    Rows are sorted by driver then lap number, so each driver's laps are a
+    contiguous slice. Each driver's best lap and best sectors, and the
+    ranking, are computed once at build time; lookups afterwards are
+    dictionary or array indexing.
+    """
+
+    # Names of the arrays returned by arrays() and accepted by from_arrays()
+    ARRAYS = ('driver_numbers', 'lap_numbers', 'durations', 'sectors')
+
+    def __init__(self, driver_numbers: np.ndarray, lap_numbers: np.ndarray,
+                 durations: np.ndarray, sectors: np.ndarray):
+        # Arrays must already be sorted by driver then lap (see from_columns);
+        # they may be read-only memory maps
+        self.driver_numbers = driver_numbers
+        self.lap_numbers = lap_numbers
+        self.durations = durations
+        self.sectors = sectors
+        for values in (self.driver_numbers, self.lap_numbers, self.durations, self.sectors):
+            if values.flags.writeable:
+                values.flags.writeable = False
+        count = len(driver_numbers)
+
+        # Contiguous row range of each driver
+        starts = np.flatnonzero(np.r_[True, self.driver_numbers[1:] != self.driver_numbers[:-1]]) if count else []
+        ends = list(starts[1:]) + [count]
+        self._rows: Dict[int, slice] = {
+            int(self.driver_numbers[start]): slice(int(start), int(end)) for start, end in zip(starts, ends)
+        }
+
+        # Best valid lap and best sectors of each driver
+        self._best_row: Dict[int, int] = {}
+        self._best_sectors: Dict[int, List[Optional[float]]] = {}
+        for driver_number, rows in self._rows.items():
+            durations = self.durations[rows]
+            if not np.all(np.isnan(durations)):
+                self._best_row[driver_number] = rows.start + int(np.nanargmin(durations))
+            self._best_sectors[driver_number] = [
+                None if np.all(np.isnan(sector)) else float(np.nanmin(sector))
+                for sector in self.sectors[:, rows]
+            ]
+
+        # Drivers ordered by their best lap; ties keep driver order
+        self.ranking: List[int] = sorted(self._best_row, key=lambda d: self.durations[self._best_row[d]])
+
+    @classmethod
+    def from_columns(cls, columns: LapColumns) -> "LapIndex":
+        drivers = np.array(columns.driver_numbers, dtype=np.int32)
+        laps = np.array(columns.lap_numbers, dtype=np.int32)
+        order = np.lexsort((laps, drivers))
+        return cls(
+            drivers[order],
+            laps[order],
+            np.array(columns.durations, dtype=np.float64)[order],
+            np.stack([np.array(column, dtype=np.float64)[order] for column in columns.sectors]),
+        )
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "LapIndex":
+        return cls(arrays['driver_numbers'], arrays['lap_numbers'], arrays['durations'], arrays['sectors'])
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            'driver_numbers': self.driver_numbers,
+            'lap_numbers': self.lap_numbers,
+            'durations': self.durations,
+            'sectors': self.sectors,
+        }
+
+    def __len__(self) -> int:
+        return len(self.driver_numbers)
+
+    @property
+    def nbytes(self) -> int:
+        return self.driver_numbers.nbytes + self.lap_numbers.nbytes + self.durations.nbytes + self.sectors.nbytes
+
+    @property
+    def drivers(self) -> List[int]:
+        return list(self._rows)
+
+    def _lap_at(self, row: int) -> Lap:
+        return Lap(
+            int(self.driver_numbers[row]),
+            int(self.lap_numbers[row]),
+            _optional(self.durations[row]),
+            [_optional(value) for value in self.sectors[:, row]],
+        )
+
+    def best_lap(self, driver_number: int) -> Optional[Lap]:
+        row = self._best_row.get(driver_number)
+        return None if row is None else self._lap_at(row)
+
+    def fastest_laps(self, limit: Optional[int] = None) -> List[Lap]:
+        """Best lap of each driver, fastest first"""
+        return [self._lap_at(self._best_row[d]) for d in self.ranking[:limit]]
+
+    def driver_best_sectors(self, driver_number: int) -> List[Optional[float]]:
+        return self._best_sectors.get(driver_number, [None, None, None])
+
+    def driver_theoretical_best(self, driver_number: int) -> Optional[float]:
+        sectors = self.driver_best_sectors(driver_number)
+        if any(sector is None for sector in sectors):
+            return None
+        return sum(sectors)
+
+    def driver_laps(self, driver_number: int) -> List[Lap]:
+        rows = self._rows.get(driver_number)
+        if rows is None:
+            return []
+        return [self._lap_at(row) for row in range(rows.start, rows.stop)]
@@ -0,0 +1,286 @@
+"""Live timing fanout: one OpenF1 poller, any number of SSE subscribers.
+
+The poller asks OpenF1 only for rows newer than what it has already seen
+(``date>=`` / ``date_start>=`` cursors), folds them into a small session
+state and publishes the differences. Every event is encoded once and the
+same bytes are queued for each subscriber. A subscriber that falls behind
+has its queue replaced by a single snapshot instead of slowing down the
+poller or the other clients.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set
+from urllib.parse import quote
+
+import orjson
+
+from laps import lap_cursor
+from metrics import registry
+
+logger = logging.getLogger(__name__)
+
+LIVE_EVENTS = registry.counter("f1_live_events_total", "Live events published, by type", ("event",))
+LIVE_OVERFLOWS = registry.counter(
+    "f1_live_overflows_total", "Subscribers that fell behind and were resynced with a snapshot"
+)
+
+# Returns the decoded JSON list for an OpenF1 endpoint, or None on failure
+FetchRows = Callable[[str], Awaitable[Optional[List[dict]]]]
+
+
+def _cursor(value: str) -> str:
+    # '+' in the UTC offset would otherwise be read as a space
+    return quote(value, safe=":")
+
+
+def _slim_lap(row: dict) -> dict:
+    return {
+        "driver_number": row["driver_number"],
+        "lap_number": row.get("lap_number"),
+        "lap_duration": row.get("lap_duration"),
+        "sectors": [row.get(f"duration_sector_{i}") for i in (1, 2, 3)],
+    }
+
+
+class LiveState:
+    """What the poller knows about the current session"""
+
+    def __init__(self, session: dict):
+        self.session = session
+        self.session_key = session["session_key"]
+        self.positions: Dict[int, int] = {}
+        self.position_cursor: Optional[str] = None
+        # Most recent lap row of each driver; its duration may still be unknown
+        self.current_laps: Dict[int, dict] = {}
+        # Duration of each driver's latest completed lap
+        self.last_lap_times: Dict[int, tuple[int, float]] = {}
+        self.best_laps: Dict[int, dict] = {}
+        self.fastest: Optional[dict] = None
+
+    def lap_cursor(self) -> Optional[str]:
+        """Start of the oldest lap still in progress, so its completion is picked up"""
+        return lap_cursor(self.current_laps.values(), (duration for _, duration in self.last_lap_times.values()))
+
+    def apply_positions(self, rows: List[dict]) -> List[dict]:
+        changes: Dict[int, int] = {}
+        for row in rows:
+            driver_number, position = row.get("driver_number"), row.get("position")
+            if driver_number is None or not position:
+                continue
+            if self.positions.get(driver_number) != position:
+                self.positions[driver_number] = position
+                changes[driver_number] = position
+            date = row.get("date")
+            if date and (self.position_cursor is None or date > self.position_cursor):
+                self.position_cursor = date
+        return [{"driver_number": d, "position": p} for d, p in sorted(changes.items(), key=lambda c: c[1])]
+
+    def apply_laps(self, rows: List[dict]) -> tuple[List[dict], bool]:
+        """Fold lap rows in; returns (improved personal bests, whether the session best changed)"""
+        improved = []
+        fastest_changed = False
+        for row in rows:
+            driver_number = row.get("driver_number")
+            if driver_number is None or not row.get("lap_number"):
+                continue
+            current = self.current_laps.get(driver_number)
+            if current is None or row["lap_number"] >= current["lap_number"]:
+                self.current_laps[driver_number] = row
+            duration = row.get("lap_duration")
+            if not duration or duration <= 0:
+                continue
+            last = self.last_lap_times.get(driver_number)
+            if last is None or row["lap_number"] >= last[0]:
+                self.last_lap_times[driver_number] = (row["lap_number"], duration)
+            best = self.best_laps.get(driver_number)
+            if best is None or duration < best["lap_duration"]:
+                lap = _slim_lap(row)
+                self.best_laps[driver_number] = lap
+                improved.append(lap)
+                if self.fastest is None or duration < self.fastest["lap_duration"]:
+                    self.fastest = lap
+                    fastest_changed = True
+        return improved, fastest_changed
+
+    def snapshot(self) -> dict:
+        return {
+            "session": self.session,
+            "positions": [
+                {"driver_number": d, "position": p} for d, p in sorted(self.positions.items(), key=lambda c: c[1])
+            ],
+            "best_laps": sorted(self.best_laps.values(), key=lambda lap: lap["lap_duration"]),
+            "fastest_lap": self.fastest,
+        }
+
+
+class Subscriber:
+    __slots__ = ("queue", "overflows")
+
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.overflows = 0
+
+
+class LiveFeed:
+    """Polls OpenF1 while anyone is subscribed and fans the changes out"""
+
+    def __init__(self, fetch: FetchRows, *, poll_interval: float = 4.0, idle_interval: float = 30.0,
+                 session_refresh: float = 60.0, queue_size: int = 64, heartbeat: float = 15.0):
+        self.fetch = fetch
+        self.poll_interval = poll_interval
+        self.idle_interval = idle_interval
+        self.session_refresh = session_refresh
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        self.state: Optional[LiveState] = None
+        self.subscribers: Set[Subscriber] = set()
+        self.polls = 0
+        self.resyncs = 0
+        self._event_id = 0
+        self._session_checked = 0.0
+        self._snapshot: Optional[bytes] = None
+        self._task: Optional[asyncio.Task] = None
+
+    # Subscribers
+
+    def subscribe(self) -> Subscriber:
+        subscriber = Subscriber(self.queue_size)
+        if self.state is not None:
+            subscriber.queue.put_nowait(self.snapshot())
+        self.subscribers.add(subscriber)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self.subscribers.discard(subscriber)
+        if not self.subscribers and self._task is not None:
+            # Nobody is watching; the cursors are kept for the next subscriber
+            self._task.cancel()
+            self._task = None
+
+    async def events(self) -> AsyncIterator[bytes]:
+        """SSE byte stream of a new subscriber, with comment heartbeats to keep proxies open.
+
+        Subscribing happens on the first iteration, so a client that is gone
+        before the response starts never registers.
+        """
+        subscriber = self.subscribe()
+        try:
+            yield b"retry: 5000\n\n"
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscriber.queue.get(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+        finally:
+            self.unsubscribe(subscriber)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # Publishing
+
+    def _encode(self, event: str, data) -> bytes:
+        self._event_id += 1
+        return b"id: %d\nevent: %s\ndata: %s\n\n" % (self._event_id, event.encode(), orjson.dumps(data))
+
+    def snapshot(self) -> bytes:
+        """Encoded full state, shared by every subscriber until the state changes again"""
+        if self._snapshot is None:
+            self._snapshot = self._encode("snapshot", self.state.snapshot())
+        return self._snapshot
+
+    def publish(self, event: str, data) -> None:
+        LIVE_EVENTS.labels(event).inc()
+        self._snapshot = None
+        message = self._encode(event, data)
+        for subscriber in self.subscribers:
+            try:
+                subscriber.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Too slow to keep up with the diffs; drop them and resync
+                while not subscriber.queue.empty():
+                    subscriber.queue.get_nowait()
+                subscriber.queue.put_nowait(self.snapshot())
+                subscriber.overflows += 1
+                self.resyncs += 1
+                LIVE_OVERFLOWS.labels().inc()
+
+    # Polling
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                live = await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error polling live timing: {e}")
+                live = False
+            await asyncio.sleep(self.poll_interval if live else self.idle_interval)
+
+    async def poll(self) -> bool:
+        """One polling round; returns whether a session is in progress"""
+        self.polls += 1
+        now = time.monotonic()
+        if self.state is None or now - self._session_checked >= self.session_refresh:
+            self._session_checked = now
+            sessions = await self.fetch("sessions?session_key=latest")
+            if sessions:
+                session = sessions[-1]
+                if self.state is None or session["session_key"] != self.state.session_key:
+                    self.state = LiveState(session)
+                    self.publish("session", session)
+                else:
+                    self.state.session = session
+        state = self.state
+        if state is None:
+            return False
+
+        endpoint = f"position?session_key={state.session_key}"
+        if state.position_cursor:
+            endpoint += f"&date>={_cursor(state.position_cursor)}"
+        endpoint_laps = f"laps?session_key={state.session_key}"
+        lap_cursor = state.lap_cursor()
+        if lap_cursor:
+            endpoint_laps += f"&date_start>={_cursor(lap_cursor)}"
+        positions, laps = await asyncio.gather(self.fetch(endpoint), self.fetch(endpoint_laps))
+
+        if positions:
+            changes = state.apply_positions(positions)
+            if changes:
+                self.publish("positions", {"session_key": state.session_key, "changes": changes})
+        if laps:
+            improved, fastest_changed = state.apply_laps(laps)
+            if improved:
+                self.publish("best_laps", {"session_key": state.session_key, "laps": improved})
+            if fastest_changed:
+                self.publish("fastest_lap", {"session_key": state.session_key, "lap": state.fastest})
+        return self._in_progress(state.session)
+
+    @staticmethod
+    def _in_progress(session: dict) -> bool:
+        try:
+            start = datetime.fromisoformat(session["date_start"].replace("Z", "+00:00"))
+            end = datetime.fromisoformat(session["date_end"].replace("Z", "+00:00"))
+        except (KeyError, ValueError, AttributeError):
+            return False
+        return start <= datetime.now(timezone.utc) <= end
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self.subscribers),
+            "polls": self.polls,
+            "resyncs": self.resyncs,
+            "session_key": self.state.session_key if self.state else None,
+            "events": self._event_id,
+        }
@@ -1,23 +1,118 @@
-import fastf1
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
-import httpx
+from array import array
 from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
 import asyncio
+import hmac
 import logging
+import math
+import multiprocessing
+import os
+import time
+import uuid
+
+from urllib.parse import quote
+
+import numpy as np
+import orjson
+
+from admission import RATE_LIMITED_BODY, RateLimited, RateLimiter, RateLimitMiddleware
+from analytics import analyze_session
+from cache import ResponseCache, SingleFlight, FOREVER, revalidating
+from env import env_bool, env_float, env_int
+from drivers import MAX_DRIVER_NUMBER, DriverRecord, DriverRegistry, team_ids
+from race_calendar import CalendarIndexes, Race, RaceCalendar
+from responses import PrecomputedResponses
+from routing import SOURCE_ANSWERS, SourceRouter
+from scheduler import PrefetchScheduler
+from sections import DashboardSection
+from shared_cache import shared_backend_from_env
+from laps import Lap, LapColumns, LapIndex, LapTracker
+from live import LiveFeed
+from metrics import registry
+from store import SessionStore
+from streaming import iter_json_array
+from upstream import UpstreamClient, UpstreamGate, UpstreamUnavailable, background_priority
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Upstream base URLs; benchmarks point them at a local replay stub
+F1API_DEV_BASE_URL = os.environ.get("F1API_DEV_BASE_URL", "https://live.f1api.dev")
+OPENF1_BASE_URL = os.environ.get("OPENF1_BASE_URL", "https://api.openf1.org/v1")
+
+# Caps concurrent requests to both upstreams together; cache misses queue
+# for a slot briefly and are shed when it is saturated
+upstream_gate = UpstreamGate()
+
+# Pooled upstream clients, opened and closed with the app lifespan
+f1api_dev_client = UpstreamClient("f1api.dev", F1API_DEV_BASE_URL, gate=upstream_gate)
+openf1_client = UpstreamClient("OpenF1", OPENF1_BASE_URL, gate=upstream_gate)
+
+# Per-client request rate, plus shared limits on recomputing the whole season
+# and on analytics cache misses that need a FastF1 worker process
+rate_limiter = RateLimiter(
+    work_limits={"standings_rebuild": (1 / 60, 1), "analytics": (1.0, 5)},
+    exempt=("/metrics",),
+)
+
+# Shared response cache in front of both upstreams; with CACHE_BACKEND=shm or
+# redis, uvicorn workers share it and each key is refreshed by one worker
+response_cache = ResponseCache(shared=shared_backend_from_env())
+
+# Bearer token for admin endpoints (POST /standings/rebuild); unset disables them
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "")
+
+# Final data of completed sessions, kept on disk across restarts next to the
+# FastF1 'cache' dir; SESSION_STORE_DIR='' turns it off
+SESSION_STORE_DIR = os.environ.get("SESSION_STORE_DIR", "store")
+session_store = SessionStore(SESSION_STORE_DIR) if SESSION_STORE_DIR else None
+
+# Coalesces concurrent calls to the aggregate fetchers below
+aggregate_flight = SingleFlight()
+
+# Races f1api.dev against the fallback sources
+source_router = SourceRouter()
+
+# Serialized endpoint bodies, re-encoded only when their content changes
+precomputed_responses = PrecomputedResponses()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    seed_cache_from_store()
+    await f1api_dev_client.start()
+    await openf1_client.start()
+    if PREFETCH_ENABLED:
+        prefetch_scheduler.start()
+    try:
+        yield
+    finally:
+        await prefetch_scheduler.stop()
+        await live_feed.stop()
+        if analytics_executor is not None:
+            analytics_executor.shutdown(wait=False, cancel_futures=True)
+        await f1api_dev_client.close()
+        await openf1_client.close()
+        if response_cache.shared is not None:
+            await response_cache.shared.close()
+
 app = FastAPI(
     title="Fast F1 Data API",
     description="Get F1 standings and race info quickly using multiple free APIs",
-    version="3.0.0"
+    version="3.0.0",
+    lifespan=lifespan
 )
 
+# Added first so CORS headers are also set on 429 responses
+app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Replace with ["http://localhost:3000"] in production
@@ -26,7 +121,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-fastf1.Cache.enable_cache('cache')  # Enable cache for FastF1, change path as needed
+@app.exception_handler(UpstreamUnavailable)
+async def upstream_unavailable_handler(request: Request, exc: UpstreamUnavailable):
+    """Shed or circuit-open requests with nothing cached to fall back on"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Upstream data sources are busy, try again shortly"},
+        headers={"Retry-After": "5"},
+    )
+
+@app.exception_handler(RateLimited)
+async def rate_limited_handler(request: Request, exc: RateLimited):
+    """Work limits checked inside the app, answered like the middleware's 429s"""
+    return Response(
+        content=RATE_LIMITED_BODY,
+        status_code=429,
+        media_type="application/json",
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
 
 # Pydantic models
 class Driver(BaseModel):
@@ -57,203 +169,621 @@ class FastestLap(BaseModel):
     date: str
     sector_times: List[float]  # Added sector times for chart
 
+class LapTime(BaseModel):
+    lap_number: int
+    lap_duration: Optional[float]
+    sector_times: List[Optional[float]]
+
+class LapHistory(BaseModel):
+    driver_name: str
+    abbreviation: str
+    team: str
+    race_name: str
+    date: str
+    best_lap: Optional[str]
+    theoretical_best: Optional[str]
+    laps: List[LapTime]
+
 class F1Data(BaseModel):
     top_drivers: List[Driver]
     top_teams: List[Team]
     next_race: NextRace
 
+class SectionFreshness(BaseModel):
+    status: str                # 'fresh', 'stale' (last good value) or 'pending' (no value yet)
+    updated_at: Optional[str]  # when the served value last changed
+
 class DashboardData(BaseModel):
-    top_drivers: List[Driver]
-    top_teams: List[Team]
-    next_race: NextRace
-    fastest_lap: FastestLap
+    # Sections that are still pending are null
+    top_drivers: Optional[List[Driver]]
+    top_teams: Optional[List[Team]]
+    next_race: Optional[NextRace]
+    fastest_lap: Optional[FastestLap]
+    sections: Dict[str, SectionFreshness]
+
+# Max number of per-session position downloads in flight while calculating standings
+STANDINGS_FETCH_CONCURRENCY = 8
 
 # F1 Points System
 POINTS_SYSTEM = {
     1: 25, 2: 18, 3: 15, 4: 12, 5: 10, 6: 8, 7: 6, 8: 4, 9: 2, 10: 1
 }
 
-# Driver number to name mapping for OpenF1
-DRIVER_INFO = {
-    1:  { "name": "Max Verstappen",     "abbr": "VER", "team": "Red Bull Racing" },
-    22: { "name": "Yuki Tsunoda",       "abbr": "TSU", "team": "Red Bull Racing" },
-
-    16: { "name": "Charles Leclerc",    "abbr": "LEC", "team": "Ferrari" },
-    44: { "name": "Lewis Hamilton",     "abbr": "HAM", "team": "Ferrari" },
-
-    63: { "name": "George Russell",     "abbr": "RUS", "team": "Mercedes" },
-    12: { "name": "Kimi Antonelli",     "abbr": "ANT", "team": "Mercedes" },
-
-    4:  { "name": "Lando Norris",       "abbr": "NOR", "team": "McLaren" },
-    81: { "name": "Oscar Piastri",      "abbr": "PIA", "team": "McLaren" },
-
-    14: { "name": "Fernando Alonso",    "abbr": "ALO", "team": "Aston Martin" },
-    18: { "name": "Lance Stroll",       "abbr": "STR", "team": "Aston Martin" },
-
-    10: { "name": "Pierre Gasly",       "abbr": "GAS", "team": "Alpine" },
-    43: { "name": "Franco Colapinto",   "abbr": "COL", "team": "Alpine" },
-
-    31: { "name": "Esteban Ocon",       "abbr": "OCO", "team": "Haas" },
-    87: { "name": "Oliver Bearman",     "abbr": "BEA", "team": "Haas" },
-
-    27: { "name": "Niko Hulkenberg",    "abbr": "HUL", "team": "Kick Sauber" },
-    5:  { "name": "Gabriel Bortoleto",  "abbr": "BOR", "team": "Kick Sauber" },
-
-    23: { "name": "Alexander Albon",    "abbr": "ALB", "team": "Williams" },
-    2:  { "name": "Logan Sargeant",     "abbr": "SAR", "team": "Williams" },
-    55: { "name": "Carlos Sainz",       "abbr": "SAI", "team": "Williams" },
-
-    30: { "name": "Liam Lawson",        "abbr": "LAW", "team": "Racing Bulls" },
-    6:  { "name": "Isack Hadjar",       "abbr": "HAD", "team": "Racing Bulls" }
-}
+# Points indexed by finishing position (index 0 and anything past the last scoring place score 0)
+POINTS_BY_POSITION = np.zeros(max(POINTS_SYSTEM) + 2, dtype=np.int32)
+for _position, _points in POINTS_SYSTEM.items():
+    POINTS_BY_POSITION[_position] = _points
+
+# Roster used for car numbers a session's OpenF1 driver list lacks, or when
+# that list cannot be fetched
+DEFAULT_DRIVERS = DriverRegistry([
+    (1, "Max Verstappen", "VER", "Red Bull Racing"),
+    (22, "Yuki Tsunoda", "TSU", "Red Bull Racing"),
+
+    (16, "Charles Leclerc", "LEC", "Ferrari"),
+    (44, "Lewis Hamilton", "HAM", "Ferrari"),
+
+    (63, "George Russell", "RUS", "Mercedes"),
+    (12, "Kimi Antonelli", "ANT", "Mercedes"),
+
+    (4, "Lando Norris", "NOR", "McLaren"),
+    (81, "Oscar Piastri", "PIA", "McLaren"),
+
+    (14, "Fernando Alonso", "ALO", "Aston Martin"),
+    (18, "Lance Stroll", "STR", "Aston Martin"),
+
+    (10, "Pierre Gasly", "GAS", "Alpine"),
+    (43, "Franco Colapinto", "COL", "Alpine"),
+
+    (31, "Esteban Ocon", "OCO", "Haas"),
+    (87, "Oliver Bearman", "BEA", "Haas"),
+
+    (27, "Niko Hulkenberg", "HUL", "Kick Sauber"),
+    (5, "Gabriel Bortoleto", "BOR", "Kick Sauber"),
+
+    (23, "Alexander Albon", "ALB", "Williams"),
+    (2, "Logan Sargeant", "SAR", "Williams"),
+    (55, "Carlos Sainz", "SAI", "Williams"),
+
+    (30, "Liam Lawson", "LAW", "Racing Bulls"),
+    (6, "Isack Hadjar", "HAD", "Racing Bulls"),
+])
+
+def format_time_left(start: datetime, now: Optional[datetime] = None) -> str:
+    """Countdown from now to a race start"""
+    time_left = start - (now or datetime.now(timezone.utc))
+
+    if time_left.total_seconds() < 0:
+        return "Race completed"
+
+    days = time_left.days
+    hours, remainder = divmod(time_left.seconds, 3600)
+    minutes, _ = divmod(remainder, 60)
+
+    if days > 0:
+        return f"{days} days, {hours} hours"
+    elif hours > 0:
+        return f"{hours} hours, {minutes} minutes"
+    else:
+        return f"{minutes} minutes"
+
+# Cache lifetimes per endpoint class, in seconds
+CALENDAR_TTL = 6 * 3600        # sessions, meetings, season calendars
+STANDINGS_TTL = 30 * 60        # f1api.dev standings only move after a race
+LIVE_SESSION_TTL = 30          # laps/position of a session that may still change
+DEFAULT_TTL = 60
+SESSION_SETTLE_SECONDS = 3600  # grace period before a finished session is treated as final
+
+# Hedging: the fallback source starts once the primary runs past its p95 latency
+HEDGE_ENABLED = env_bool("HEDGE_ENABLED", True)
+HEDGE_DEFAULT_DELAY = 1.0      # until enough latencies have been observed
+
+# Session keys of finished sessions, learned from 'sessions' payloads
+completed_sessions: set = set()
+
+def get_query_param(endpoint: str, name: str) -> Optional[str]:
+    """Return a query parameter from an endpoint path like 'laps?session_key=1'"""
+    _, _, query = endpoint.partition('?')
+    for part in query.split('&'):
+        key, _, value = part.partition('=')
+        if key == name:
+            return value
+    return None
 
-def calculate_time_left(race_datetime: str) -> str:
-    """Calculate time left until race"""
+def f1api_dev_ttl(endpoint: str) -> float:
+    if '/standings/' in endpoint:
+        return STANDINGS_TTL
+    return CALENDAR_TTL
+
+def openf1_ttl(endpoint: str) -> float:
+    resource = endpoint.partition('?')[0]
+    if resource in ('sessions', 'meetings'):
+        return CALENDAR_TTL
+    if resource in ('laps', 'position', 'drivers'):
+        session_key = get_query_param(endpoint, 'session_key')
+        if session_key is not None and session_key in completed_sessions:
+            return FOREVER
+        return LIVE_SESSION_TTL
+    return DEFAULT_TTL
+
+def hedge_delay(client: UpstreamClient) -> Optional[float]:
+    """Seconds to give a primary source before also asking the fallback, or None to wait it out"""
+    if not HEDGE_ENABLED:
+        return None
+    p95 = client.latency.percentile(0.95)
+    return p95 if p95 is not None else HEDGE_DEFAULT_DELAY
+
+def session_is_completed(session: Dict[Any, Any], now: Optional[datetime] = None) -> bool:
+    """Whether a session ended long enough ago for its data to be final"""
+    date_end = session.get('date_end')
+    if not date_end or 'session_key' not in session:
+        return False
     try:
-        # Handle multiple datetime formats
-        if 'T' in race_datetime:
-            if race_datetime.endswith('Z'):
-                race_dt = datetime.fromisoformat(race_datetime.replace('Z', '+00:00'))
-            else:
-                race_dt = datetime.fromisoformat(race_datetime)
-        else:
-            race_dt = datetime.fromisoformat(f"{race_datetime}T00:00:00+00:00")
-        
-        if race_dt.tzinfo is None:
-            race_dt = race_dt.replace(tzinfo=timezone.utc)
-        
-        now = datetime.now(timezone.utc)
-        time_left = race_dt - now
-        
-        if time_left.total_seconds() < 0:
-            return "Race completed"
-        
-        days = time_left.days
-        hours, remainder = divmod(time_left.seconds, 3600)
-        minutes, _ = divmod(remainder, 60)
-        
-        if days > 0:
-            return f"{days} days, {hours} hours"
-        elif hours > 0:
-            return f"{hours} hours, {minutes} minutes"
-        else:
-            return f"{minutes} minutes"
+        end_dt = datetime.fromisoformat(date_end.replace('Z', '+00:00'))
+    except ValueError:
+        return False
+    now = now or datetime.now(timezone.utc)
+    return (now - end_dt).total_seconds() > SESSION_SETTLE_SECONDS
+
+def record_completed_sessions(sessions: List[Dict[Any, Any]]) -> None:
+    """Remember which sessions have finished so their data can be cached permanently"""
+    now = datetime.now(timezone.utc)
+    for session in sessions:
+        if session_is_completed(session, now):
+            completed_sessions.add(str(session['session_key']))
+
+def seed_cache_from_store() -> None:
+    """Load stored calendar payloads into the response cache at startup.
+
+    Entries keep the age of their file, so anything older than its TTL is
+    served stale and refreshed in the background instead of blocking.
+    """
+    if session_store is None:
+        return
+    # Sessions first: they decide which driver lists are final
+    entries = sorted(session_store.iter_json(), key=lambda entry: not entry[0].startswith('sessions'))
+    for endpoint, data, size, age in entries:
+        response_cache.set(f"openf1:{endpoint}", data, size, openf1_ttl(endpoint), age=age)
+        if endpoint.startswith('sessions'):
+            record_completed_sessions(data)
+
+async def persist(func, *args) -> None:
+    """Write to the session store off the event loop; a failure only costs the next cold start"""
+    try:
+        await asyncio.to_thread(func, *args)
     except Exception as e:
-        logger.error(f"Error calculating time left: {e}")
-        return "Unknown"
+        logger.error(f"Error writing to session store: {e}")
+
+async def load_json(client: UpstreamClient, endpoint: str):
+    """Fetch an endpoint and return (decoded JSON, payload size) or None"""
+    response = await client.get(endpoint)
+    if response.status_code == 200:
+        return response.json(), len(response.content)
+    return None
 
 async def fetch_from_f1api_dev(endpoint: str) -> Optional[Dict[Any, Any]]:
     """Fetch data from f1api.dev"""
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(f"https://live.f1api.dev/{endpoint}")
-            if response.status_code == 200:
-                return response.json()
+        return await response_cache.get_or_fetch(
+            f"f1api.dev:{endpoint}",
+            lambda: load_json(f1api_dev_client, endpoint),
+            f1api_dev_ttl(endpoint)
+        )
+    except UpstreamUnavailable:
+        pass  # circuit open; the caller moves on to its fallback right away
     except Exception as e:
         logger.error(f"Error fetching from f1api.dev: {e}")
     return None
 
+def is_stored_endpoint(endpoint: str) -> bool:
+    """Calendars, and driver lists of completed sessions, are kept in the session store"""
+    resource = endpoint.partition('?')[0]
+    if resource == 'drivers':
+        return get_query_param(endpoint, 'session_key') in completed_sessions
+    return resource in ('sessions', 'meetings')
+
 async def fetch_from_openf1(endpoint: str) -> Optional[List[Dict[Any, Any]]]:
     """Fetch data from OpenF1 API"""
+    async def loader():
+        result = await load_json(openf1_client, endpoint)
+        if result is not None and session_store and is_stored_endpoint(endpoint):
+            await persist(session_store.save_json, endpoint, result[0])
+        return result
+
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(f"https://api.openf1.org/v1/{endpoint}")
-            if response.status_code == 200:
-                return response.json()
+        data = await response_cache.get_or_fetch(
+            f"openf1:{endpoint}",
+            loader,
+            openf1_ttl(endpoint)
+        )
+        # On every answer, including ones another worker loaded into the
+        # shared cache: TTLs and lap loading depend on completed sessions
+        if data and endpoint.startswith('sessions'):
+            record_completed_sessions(data)
+        return data
+    except UpstreamUnavailable:
+        pass
     except Exception as e:
         logger.error(f"Error fetching from OpenF1: {e}")
     return None
 
-async def calculate_standings_from_results() -> tuple[List[Driver], List[Team]]:
-    """Calculate championship standings from race results using OpenF1"""
+async def stream_from_openf1(endpoint: str, on_row) -> Optional[int]:
+    """Stream a JSON array from OpenF1 into on_row, returning bytes read or None"""
+    async with openf1_client.stream(endpoint) as response:
+        if response.status_code != 200:
+            return None
+        async for row in iter_json_array(response.aiter_bytes()):
+            on_row(row)
+        return response.num_bytes_downloaded
+
+# Column names of stored position data, in the order of fetch_position_columns
+POSITION_ARRAYS = ('driver_numbers', 'places', 'dates')
+
+async def fetch_position_columns(session_key) -> Optional[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Fetch a session's position stream as (driver_number, position, date) arrays"""
+    endpoint = f"position?session_key={session_key}"
+
+    async def loader():
+        completed = session_store is not None and str(session_key) in completed_sessions
+        if completed:
+            stored = await asyncio.to_thread(session_store.load_arrays, 'position', session_key, POSITION_ARRAYS)
+            if stored is not None:
+                columns = tuple(stored[name] for name in POSITION_ARRAYS)
+                return columns, sum(column.nbytes for column in columns)
+
+        driver_numbers = array('i')
+        places = array('i')
+        dates = []
+
+        def on_row(row):
+            driver_numbers.append(row['driver_number'])
+            places.append(row['position'] or 0)
+            dates.append(row['date'])
+
+        if await stream_from_openf1(endpoint, on_row) is None:
+            return None
+        columns = (
+            np.array(driver_numbers, dtype=np.int32),
+            np.array(places, dtype=np.int32),
+            np.array(dates, dtype='S')
+        )
+        if completed and len(driver_numbers):
+            await persist(session_store.save_arrays, 'position', session_key, dict(zip(POSITION_ARRAYS, columns)))
+        return columns, sum(column.nbytes for column in columns)
+
     try:
+        return await response_cache.get_or_fetch(f"openf1-columns:{endpoint}", loader, openf1_ttl(endpoint))
+    except Exception as e:
+        logger.error(f"Error streaming positions from OpenF1: {e}")
+    return None
+
+# Laps of sessions still running; refreshes only download rows that changed
+lap_trackers: Dict[str, LapTracker] = {}
+# Sessions are only running one at a time, this just bounds sessions never seen completing
+LAP_TRACKERS_MAX = 8
+
+async def fetch_lap_index(session_key) -> Optional[LapIndex]:
+    """Fetch a session's laps as an immutable LapIndex, built once while streaming"""
+    endpoint = f"laps?session_key={session_key}"
+
+    async def load_incrementally():
+        tracker = lap_trackers.get(str(session_key))
+        if tracker is None:
+            if len(lap_trackers) >= LAP_TRACKERS_MAX:
+                lap_trackers.pop(next(iter(lap_trackers)))
+            tracker = lap_trackers[str(session_key)] = LapTracker()
+        since = tracker.cursor()
+        delta = endpoint if since is None else f"{endpoint}&date_start>={quote(since, safe=':')}"
+        rows = []
+        if await stream_from_openf1(delta, rows.append) is None:
+            return None
+        # Merged only once the whole delta arrived, so a broken stream never moves the cursor
+        tracker.merge(rows)
+        index = tracker.index()
+        return index, index.nbytes
+
+    async def loader():
+        if str(session_key) not in completed_sessions:
+            return await load_incrementally()
+        lap_trackers.pop(str(session_key), None)
+
+        completed = session_store is not None
+        if completed:
+            stored = await asyncio.to_thread(session_store.load_arrays, 'laps', session_key, LapIndex.ARRAYS)
+            if stored is not None:
+                index = LapIndex.from_arrays(stored)
+                return index, index.nbytes
+
+        columns = LapColumns()
+        if await stream_from_openf1(endpoint, columns.append) is None:
+            return None
+        index = LapIndex.from_columns(columns)
+        if completed and len(index):
+            await persist(session_store.save_arrays, 'laps', session_key, index.arrays())
+        return index, index.nbytes
+
+    try:
+        return await response_cache.get_or_fetch(f"openf1-laps:{endpoint}", loader, openf1_ttl(endpoint))
+    except Exception as e:
+        logger.error(f"Error streaming laps from OpenF1: {e}")
+    return None
+
+async def fetch_driver_registry(session_key) -> DriverRegistry:
+    """Drivers and teams of a session, built once from OpenF1; the default roster if unavailable"""
+    endpoint = f"drivers?session_key={session_key}"
+
+    async def loader():
+        rows = await fetch_from_openf1(endpoint)
+        registry = DriverRegistry.from_openf1(rows, fallback=DEFAULT_DRIVERS) if isinstance(rows, list) else None
+        return (registry, registry.nbytes) if registry is not None else None
+
+    try:
+        registry = await response_cache.get_or_fetch(f"driver-registry:{endpoint}", loader, openf1_ttl(endpoint))
+    except Exception as e:
+        logger.error(f"Error building driver registry: {e}")
+        registry = None
+    return registry or DEFAULT_DRIVERS
+
+def final_positions_from(driver_numbers: np.ndarray, places: np.ndarray, dates: np.ndarray) -> Dict[int, tuple[int, int]]:
+    """Get final (position, points) per driver from the last position update of each driver"""
+    count = len(driver_numbers)
+    if count == 0:
+        return {}
+    
+    # Sort by driver then date; among equal dates the earliest row sorts last,
+    # matching a scan that only replaces on a strictly later date
+    order = np.lexsort((-np.arange(count), dates, driver_numbers))
+    sorted_drivers = driver_numbers[order]
+    last = np.ones(count, dtype=bool)
+    last[:-1] = sorted_drivers[1:] != sorted_drivers[:-1]
+    final_rows = order[last]
+    
+    final_drivers = driver_numbers[final_rows]
+    final_places = places[final_rows]
+    scoring = (final_places > 0) & (final_places < len(POINTS_BY_POSITION))
+    final_points = np.where(scoring, POINTS_BY_POSITION[np.where(scoring, final_places, 0)], 0)
+    
+    return {
+        driver_number: (place, points)
+        for driver_number, place, points in zip(final_drivers.tolist(), final_places.tolist(), final_points.tolist())
+    }
+
+def award_session_points(final_positions: Dict[int, tuple[int, int]], drivers: DriverRegistry,
+                         driver_points: np.ndarray, team_points: np.ndarray,
+                         entrants: List[Optional[DriverRecord]],
+                         session_start: str = '', entrant_starts: Optional[List[str]] = None) -> np.ndarray:
+    """Add the points of one race to totals indexed by car number and team id.
+
+    ``entrants`` keeps each driver's record from their latest race, so tables
+    show their latest team. Races may be added in any order when
+    ``entrant_starts`` holds the date_start each record came from; without
+    it, every race replaces the records. Returns ``team_points``, grown if
+    new teams appeared.
+    """
+    if len(team_points) < len(team_ids):
+        team_points = np.concatenate([team_points, np.zeros(len(team_ids) - len(team_points), team_points.dtype)])
+    for driver_number, (position, points) in final_positions.items():
+        if not 0 < driver_number < MAX_DRIVER_NUMBER:
+            continue
+        driver = drivers.get(driver_number)
+        driver_points[driver_number] += points
+        team_points[driver.team_id] += points
+        if entrant_starts is None:
+            entrants[driver_number] = driver
+        elif session_start >= entrant_starts[driver_number]:
+            entrants[driver_number] = driver
+            entrant_starts[driver_number] = session_start
+    return team_points
+
+class StandingsEngine:
+    """Championship totals that are updated one completed race at a time.
+
+    Remembers which session keys have already been folded in, so an update
+    only downloads races that finished since the previous one. ``rebuild``
+    drops everything and replays the season, for upstream corrections. With
+    a shared cache backend, a rebuild also bumps a generation marker there,
+    and every other worker's engine starts over on its next update.
+    """
+
+    def __init__(self):
+        self.year: Optional[int] = None
+        self.processed_sessions: set = set()
+        self.driver_points = np.zeros(MAX_DRIVER_NUMBER, dtype=np.int64)
+        self.team_points = np.zeros(len(team_ids), dtype=np.int64)
+        self.entrants: List[Optional[DriverRecord]] = [None] * MAX_DRIVER_NUMBER
+        # date_start of the race each entrant record comes from
+        self.entrant_starts: List[str] = [''] * MAX_DRIVER_NUMBER
+        self.teams_entered: set = set()
+        self._standings: Optional[tuple[List[Driver], List[Team]]] = None
+        # Last rebuild marker seen in the shared cache backend
+        self.generation: Optional[bytes] = None
+        self._lock = asyncio.Lock()
+
+    def reset(self, year: Optional[int] = None) -> None:
+        self.year = year
+        self.processed_sessions = set()
+        self.driver_points = np.zeros(MAX_DRIVER_NUMBER, dtype=np.int64)
+        self.team_points = np.zeros(len(team_ids), dtype=np.int64)
+        self.entrants = [None] * MAX_DRIVER_NUMBER
+        self.entrant_starts = [''] * MAX_DRIVER_NUMBER
+        self.teams_entered = set()
+        self._standings = None
+
+    async def update(self) -> int:
+        """Fold in newly completed races, returning how many were added"""
+        async with self._lock:
+            await self._follow_rebuilds()
+            return await self._update()
+
+    async def rebuild(self) -> int:
+        """Discard the totals and cached race data, then replay the season"""
+        async with self._lock:
+            for session_key in self.processed_sessions:
+                await response_cache.invalidate(f"openf1-columns:position?session_key={session_key}")
+            await self._drop_stored_positions()
+            self.reset()
+            if response_cache.shared is not None:
+                generation = uuid.uuid4().hex.encode()
+                try:
+                    await response_cache.shared.set(STANDINGS_GENERATION_KEY, generation, None)
+                    self.generation = generation
+                except Exception as e:
+                    logger.error(f"Error publishing standings rebuild: {e}")
+            return await self._update()
+
+    async def _follow_rebuilds(self) -> None:
+        """Start over if another worker rebuilt the standings since the last update"""
+        if response_cache.shared is None:
+            return
+        try:
+            generation = await response_cache.shared.get(STANDINGS_GENERATION_KEY)
+        except Exception as e:
+            logger.error(f"Error reading standings rebuild marker: {e}")
+            return
+        if generation == self.generation:
+            return
+        for session_key in self.processed_sessions:
+            response_cache.discard(f"openf1-columns:position?session_key={session_key}")
+        await self._drop_stored_positions()
+        self.reset()
+        self.generation = generation
+
+    async def _drop_stored_positions(self) -> None:
+        if session_store:
+            for session_key in self.processed_sessions:
+                await asyncio.to_thread(session_store.delete_arrays, 'position', session_key)
+
+    async def _update(self) -> int:
         current_year = datetime.now().year
-        
+        year = current_year
+
         # Get all race sessions from current year
         sessions = await fetch_from_openf1(f"sessions?session_type=Race&year={current_year}")
-        
+
         if not sessions:
             logger.warning("No race sessions found, using previous year")
-            sessions = await fetch_from_openf1(f"sessions?session_type=Race&year={current_year-1}")
-        
+            year = current_year - 1
+            sessions = await fetch_from_openf1(f"sessions?session_type=Race&year={year}")
+
         if not sessions:
-            return await get_fallback_standings()
-        
-        # Calculate points for each driver and team
-        driver_points = {}
-        team_points = {}
-        
-        for session in sessions:
-            session_key = session['session_key']
-            
-            # Get race results (positions) for this session
-            positions = await fetch_from_openf1(f"position?session_key={session_key}")
-            
-            if not positions:
-                continue
-            
-            # Get final positions (last position update for each driver)
-            final_positions = {}
-            for pos in positions:
-                driver_number = pos['driver_number']
-                if driver_number not in final_positions or pos['date'] > final_positions[driver_number]['date']:
-                    final_positions[driver_number] = pos
-            
-            # Award points based on final positions
-            for driver_number, pos_data in final_positions.items():
-                position = pos_data['position']
-                driver_info = DRIVER_INFO.get(driver_number, {
-                    "name": f"Driver {driver_number}",
-                    "abbr": f"D{driver_number}",
-                    "team": "Unknown"
-                })
-                
-                points = POINTS_SYSTEM.get(position, 0)
-                
-                # Add to driver points
-                driver_key = (driver_number, driver_info['name'])
-                if driver_key not in driver_points:
-                    driver_points[driver_key] = {
-                        'points': 0,
-                        'info': driver_info
-                    }
-                driver_points[driver_key]['points'] += points
-                
-                # Add to team points
-                team_name = driver_info['team']
-                if team_name not in team_points:
-                    team_points[team_name] = 0
-                team_points[team_name] += points
-        
-        # Sort and create driver standings
-        sorted_drivers = sorted(driver_points.items(), key=lambda x: x[1]['points'], reverse=True)
-        top_drivers = []
-        
-        for i, ((driver_number, driver_name), data) in enumerate(sorted_drivers[:10]):
-            top_drivers.append(Driver(
+            return 0
+
+        if year != self.year:
+            self.reset(year)
+
+        now = datetime.now(timezone.utc)
+        session_starts = {session.get('session_key'): session.get('date_start') or '' for session in sessions}
+        pending = [
+            session['session_key'] for session in sessions
+            if session_is_completed(session, now) and session['session_key'] not in self.processed_sessions
+        ]
+        if not pending:
+            return 0
+
+        semaphore = asyncio.Semaphore(STANDINGS_FETCH_CONCURRENCY)
+
+        async def fetch_positions(session_key):
+            async with semaphore:
+                columns, drivers = await asyncio.gather(
+                    fetch_position_columns(session_key), fetch_driver_registry(session_key)
+                )
+                return session_key, columns, drivers
+
+        # Fetch race results (positions) for every new session concurrently and
+        # fold each one into the totals as soon as it arrives
+        tasks = [asyncio.ensure_future(fetch_positions(session_key)) for session_key in pending]
+        added = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    session_key, columns, drivers = await next_done
+                except Exception as e:
+                    logger.error(f"Error fetching positions: {e}")
+                    continue
+
+                # Failed or not yet published; retried on the next update
+                if columns is None or len(columns[0]) == 0:
+                    continue
+
+                final_positions = final_positions_from(*columns)
+                # Races arrive in download order; the latest race decides each driver's team
+                self.team_points = award_session_points(
+                    final_positions, drivers, self.driver_points, self.team_points, self.entrants,
+                    session_starts[session_key], self.entrant_starts
+                )
+                self.teams_entered.update(drivers.get(number).team_id for number in final_positions)
+                self.processed_sessions.add(session_key)
+                self._standings = None
+                added += 1
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if added < len(pending):
+            logger.warning(f"Standings updated without {len(pending) - added} of {len(pending)} new sessions")
+        return added
+
+    def standings(self) -> tuple[List[Driver], List[Team]]:
+        # Reuse the tables until another race is folded in
+        if self._standings is None:
+            self._standings = self._build_standings()
+        return self._standings
+
+    def _build_standings(self) -> tuple[List[Driver], List[Team]]:
+        driver_points = self.driver_points
+        entrants = [driver for driver in self.entrants if driver is not None]
+        entrants.sort(key=lambda driver: (-driver_points[driver.number], driver.name))
+        top_drivers = [
+            Driver(
                 position=i + 1,
-                driver_name=data['info']['name'],
-                abbreviation=data['info']['abbr'],
-                team=data['info']['team'],
-                points=float(data['points'])
-            ))
-        
-        # Sort and create team standings
-        sorted_teams = sorted(team_points.items(), key=lambda x: x[1], reverse=True)
-        top_teams = []
+                driver_name=driver.name,
+                abbreviation=driver.abbr,
+                team=driver.team,
+                points=float(driver_points[driver.number])
+            )
+            for i, driver in enumerate(entrants[:10])
+        ]
+
+        team_points = self.team_points
+        teams = sorted(self.teams_entered, key=lambda team_id: (-team_points[team_id], team_ids.names[team_id]))
+        top_teams = [
+            Team(position=i + 1, team_name=team_ids.names[team_id], points=float(team_points[team_id]))
+            for i, team_id in enumerate(teams[:10])
+        ]
+
+        return top_drivers, top_teams
+
+# Shared cache key bumped by every rebuild
+STANDINGS_GENERATION_KEY = "standings-generation"
+
+standings_engine = StandingsEngine()
+
+async def calculate_standings_from_results() -> tuple[List[Driver], List[Team]]:
+    """Standings from race results, or the hardcoded tables if there are none"""
+    standings = await race_result_standings()
+    if standings is None:
+        SOURCE_ANSWERS.labels("calculated_standings", "hardcoded").inc()
+        return await get_fallback_standings()
+    return standings
+
+async def race_result_standings() -> Optional[tuple[List[Driver], List[Team]]]:
+    """Calculate championship standings, sharing one computation between concurrent callers"""
+    return await aggregate_flight.do("calculated_standings", _race_result_standings)
+
+async def _race_result_standings() -> Optional[tuple[List[Driver], List[Team]]]:
+    """Calculate championship standings from race results using OpenF1, or None without any"""
+    try:
+        await standings_engine.update()
         
-        for i, (team_name, points) in enumerate(sorted_teams[:10]):
-            top_teams.append(Team(
-                position=i + 1,
-                team_name=team_name,
-                points=float(points)
-            ))
+        if not standings_engine.processed_sessions:
+            return None
         
-        return top_drivers, top_teams
+        SOURCE_ANSWERS.labels("calculated_standings", "race_results").inc()
+        return standings_engine.standings()
         
     except Exception as e:
         logger.error(f"Error calculating standings: {e}")
-        return await get_fallback_standings()
+        return None
 
 async def get_fallback_standings() -> tuple[List[Driver], List[Team]]:
     """Fallback standings when calculations fail"""
@@ -271,12 +801,8 @@ async def get_fallback_standings() -> tuple[List[Driver], List[Team]]:
     
     return drivers, teams
 
-async def fetch_driver_standings():
-    """Fetch driver standings from multiple sources"""
-    # Try f1api.dev first
-    current_year = datetime.now().year
-    data = await fetch_from_f1api_dev(f"{current_year}/standings/drivers")
-    
+def parse_f1api_driver_standings(data: Optional[Dict[Any, Any]]) -> Optional[List[Driver]]:
+    """Build driver standings from an f1api.dev payload, or None if unusable"""
     if data and 'standings' in data:
         try:
             standings = data['standings']
@@ -294,18 +820,10 @@ async def fetch_driver_standings():
             return top_drivers
         except Exception as e:
             logger.error(f"Error processing f1api.dev data: {e}")
-    
-    # Fallback to calculated standings
-    logger.info("Using calculated standings from race results")
-    drivers, _ = await calculate_standings_from_results()
-    return drivers
+    return None
 
-async def fetch_constructor_standings():
-    """Fetch constructor standings from multiple sources"""
-    # Try f1api.dev first
-    current_year = datetime.now().year
-    data = await fetch_from_f1api_dev(f"{current_year}/standings/teams")
-    
+def parse_f1api_team_standings(data: Optional[Dict[Any, Any]]) -> Optional[List[Team]]:
+    """Build constructor standings from an f1api.dev payload, or None if unusable"""
     if data and 'standings' in data:
         try:
             standings = data['standings']
@@ -321,109 +839,155 @@ async def fetch_constructor_standings():
             return top_teams
         except Exception as e:
             logger.error(f"Error processing f1api.dev teams data: {e}")
-    
-    # Fallback to calculated standings
-    logger.info("Using calculated team standings from race results")
-    _, teams = await calculate_standings_from_results()
-    return teams
+    return None
 
-async def fetch_next_race():
-    """Fetch next race information - FIXED VERSION"""
+async def fetch_standings() -> tuple[List[Driver], List[Team]]:
+    """Fetch driver and constructor standings together, shared between concurrent callers"""
+    return await aggregate_flight.do("standings", _fetch_standings)
+
+async def standings_from_f1api() -> Optional[tuple[Optional[List[Driver]], Optional[List[Team]]]]:
+    """Driver and team tables from f1api.dev, or None if it has neither"""
     current_year = datetime.now().year
-    now = datetime.now(timezone.utc)
-    
-    # Try f1api.dev first
-    data = await fetch_from_f1api_dev(f"{current_year}")
+    drivers_data, teams_data = await asyncio.gather(
+        fetch_from_f1api_dev(f"{current_year}/standings/drivers"),
+        fetch_from_f1api_dev(f"{current_year}/standings/teams")
+    )
+    top_drivers = parse_f1api_driver_standings(drivers_data)
+    top_teams = parse_f1api_team_standings(teams_data)
+    if top_drivers is None and top_teams is None:
+        return None
+    return top_drivers, top_teams
+
+async def _fetch_standings() -> tuple[List[Driver], List[Team]]:
+    """Fetch driver and constructor standings from multiple sources"""
+    # f1api.dev first; calculated standings if it fails or is slower than usual.
+    # The hedge only counts when there are race results, so placeholder
+    # tables never beat a slow but healthy f1api.dev
+    standings = await source_router.first_good(
+        "standings",
+        standings_from_f1api,
+        race_result_standings,
+        hedge_delay(f1api_dev_client),
+        names=("f1api.dev", "calculated")
+    )
+    if standings is None:
+        # Both sources were tried; calculating again would only retry the
+        # same failed downloads
+        SOURCE_ANSWERS.labels("calculated_standings", "hardcoded").inc()
+        return await get_fallback_standings()
+    top_drivers, top_teams = standings
     
-    if data and 'races' in data:
-        try:
-            races = data['races']
-            
-            # Find the next upcoming race
-            upcoming_races = []
-            for race in races:
-                race_date = race.get('date', '')
-                if race_date:
-                    try:
-                        # Handle different date formats
-                        if 'T' in race_date:
-                            race_dt = datetime.fromisoformat(race_date.replace('Z', '+00:00'))
-                        else:
-                            race_dt = datetime.fromisoformat(f"{race_date}T15:00:00+00:00")  # Default race time
-                        
-                        if race_dt > now:
-                            upcoming_races.append((race, race_dt))
-                    except Exception as e:
-                        logger.error(f"Error parsing race date {race_date}: {e}")
-                        continue
-            
-            if upcoming_races:
-                # Sort by date and get the next race
-                upcoming_races.sort(key=lambda x: x[1])
-                next_race, race_dt = upcoming_races[0]
-                
-                return NextRace(
-                    race_name=next_race.get('race_name', next_race.get('name', 'Unknown')),
-                    location=next_race.get('location', next_race.get('circuit', 'Unknown')),
-                    country=next_race.get('country', 'Unknown'),
-                    date=race_dt.strftime('%Y-%m-%d %H:%M UTC'),
-                    time_left=calculate_time_left(race_dt.isoformat())
-                )
-        except Exception as e:
-            logger.error(f"Error processing race data: {e}")
+    if top_drivers is None or top_teams is None:
+        # f1api.dev had only one of the tables; one calculated pass yields
+        # both, hardcoded if there are no results
+        logger.info("Using calculated standings from race results")
+        calculated_drivers, calculated_teams = await calculate_standings_from_results()
+        if top_drivers is None:
+            top_drivers = calculated_drivers
+        if top_teams is None:
+            top_teams = calculated_teams
     
-    # Fallback to OpenF1 meetings
+    return top_drivers, top_teams
+
+async def fetch_driver_standings():
+    """Fetch driver standings from multiple sources"""
+    drivers, _ = await fetch_standings()
+    return drivers
+
+async def fetch_constructor_standings():
+    """Fetch constructor standings from multiple sources"""
+    _, teams = await fetch_standings()
+    return teams
+
+async def fetch_next_race():
+    """Fetch next race information, sharing one lookup between concurrent callers"""
+    return await aggregate_flight.do("next_race", _fetch_next_race)
+
+# Parsed season calendars, rebuilt only when a refresh changes their payload
+calendar_indexes = CalendarIndexes()
+
+def next_race_response(race: Race, now: datetime) -> NextRace:
+    return NextRace(
+        race_name=race.name,
+        location=race.location,
+        country=race.country,
+        date=race.date,
+        time_left=format_time_left(race.start, now)
+    )
+
+async def f1api_calendar(year: int) -> Optional[RaceCalendar]:
+    """Indexed f1api.dev calendar of a season, or None if unavailable"""
+    data = await fetch_from_f1api_dev(f"{year}")
+    if not data or 'races' not in data:
+        return None
+    return calendar_indexes.get(f"f1api.dev:{year}", data, RaceCalendar.from_f1api)
+
+async def next_race_from_f1api(current_year: int, now: datetime) -> Optional[NextRace]:
+    """Next race from the f1api.dev season calendar"""
+    calendar = await f1api_calendar(current_year)
+    race = calendar.next_after(now) if calendar else None
+    return next_race_response(race, now) if race else None
+
+async def next_race_from_meetings(current_year: int, now: datetime) -> Optional[NextRace]:
+    """Next race from the OpenF1 meetings of the season"""
     try:
         meetings = await fetch_from_openf1(f"meetings?year={current_year}")
-        
         if meetings:
-            upcoming_meetings = []
-            for meeting in meetings:
-                meeting_date = meeting.get('date_start', '')
-                if meeting_date:
-                    try:
-                        meeting_dt = datetime.fromisoformat(meeting_date.replace('Z', '+00:00'))
-                        if meeting_dt > now:
-                            upcoming_meetings.append((meeting, meeting_dt))
-                    except Exception as e:
-                        logger.error(f"Error parsing meeting date {meeting_date}: {e}")
-                        continue
-            
-            if upcoming_meetings:
-                # Sort by date and get the next meeting
-                upcoming_meetings.sort(key=lambda x: x[1])
-                next_meeting, meeting_dt = upcoming_meetings[0]
-                
-                return NextRace(
-                    race_name=next_meeting.get('meeting_name', 'Unknown'),
-                    location=next_meeting.get('location', 'Unknown'),
-                    country=next_meeting.get('country_name', 'Unknown'),
-                    date=meeting_dt.strftime('%Y-%m-%d %H:%M UTC'),
-                    time_left=calculate_time_left(meeting_dt.isoformat())
-                )
+            calendar = calendar_indexes.get(f"openf1:meetings:{current_year}", meetings, RaceCalendar.from_meetings)
+            race = calendar.next_after(now)
+            if race:
+                return next_race_response(race, now)
     except Exception as e:
         logger.error(f"Error fetching meetings: {e}")
-    
-    # Final fallback with next year's first race
+    return None
+
+async def next_race_from_next_season(current_year: int, now: datetime) -> Optional[NextRace]:
+    """First race of next year's f1api.dev calendar"""
     try:
-        next_year = current_year + 1
-        next_year_data = await fetch_from_f1api_dev(f"{next_year}")
-        
-        if next_year_data and 'races' in next_year_data:
-            first_race = next_year_data['races'][0]
-            race_date = first_race.get('date', f"{next_year}-03-01T15:00:00Z")
-            
-            return NextRace(
-                race_name=first_race.get('race_name', f"{next_year} Season Opener"),
-                location=first_race.get('location', 'TBD'),
-                country=first_race.get('country', 'TBD'),
-                date=race_date.replace('T', ' ').replace('Z', ' UTC'),
-                time_left=calculate_time_left(race_date)
-            )
+        calendar = await f1api_calendar(current_year + 1)
+        race = calendar.first() if calendar else None
+        if race:
+            return next_race_response(race, now)
     except Exception as e:
         logger.error(f"Error fetching next year races: {e}")
-    
+    return None
+
+def season_finished(year: int, now: datetime) -> bool:
+    """Whether the last indexed calendar of the season has no race left; no fetching"""
+    calendar = calendar_indexes.last(f"f1api.dev:{year}") or calendar_indexes.last(f"openf1:meetings:{year}")
+    return calendar is not None and calendar.finished(now)
+
+async def _fetch_next_race():
+    """Next race from this season's calendars, else the first race of the next season"""
+    current_year = datetime.now().year
+    now = datetime.now(timezone.utc)
+
+    # Past the season's last race next season's calendar is needed anyway, so
+    # it is looked up alongside this season's sources instead of after them
+    next_season = None
+    if season_finished(current_year, now):
+        next_season = asyncio.ensure_future(next_race_from_next_season(current_year, now))
+    try:
+        # f1api.dev first; OpenF1 meetings if it fails or is slower than usual
+        next_race = await source_router.first_good(
+            "next_race",
+            lambda: next_race_from_f1api(current_year, now),
+            lambda: next_race_from_meetings(current_year, now),
+            hedge_delay(f1api_dev_client),
+            names=("f1api.dev", "openf1")
+        )
+        if next_race is None:
+            next_race = await (next_season or next_race_from_next_season(current_year, now))
+            if next_race is not None:
+                SOURCE_ANSWERS.labels("next_race", "next_season").inc()
+    finally:
+        if next_season is not None:
+            next_season.cancel()
+    if next_race is not None:
+        return next_race
+
     # Absolute fallback
+    SOURCE_ANSWERS.labels("next_race", "placeholder").inc()
     return NextRace(
         race_name="Season Break",
         location="Checking for upcoming races...",
@@ -432,149 +996,127 @@ async def fetch_next_race():
         time_left="Season break"
     )
 
-async def fetch_fastest_lap():
-    """Fetch fastest lap with sector times from the most recent completed race"""
-    try:
-        current_year = datetime.now().year
+def format_lap_time(duration: float) -> str:
+    """Format a lap duration in seconds as m:ss.sss"""
+    minutes = int(duration // 60)
+    seconds = duration % 60
+    return f"{minutes}:{seconds:06.3f}"
 
-        # Get race sessions for the current year
-        sessions = await fetch_from_openf1(f"sessions?session_type=Race&year={current_year}")
-        if not sessions:
-            # Fallback to previous year if no races found
-            sessions = await fetch_from_openf1(f"sessions?session_type=Race&year={current_year - 1}")
-        if not sessions:
-            return get_fallback_fastest_lap()
+async def get_latest_race_session() -> Optional[Dict[Any, Any]]:
+    """Get the most recent race session that has already ended"""
+    current_year = datetime.now().year
 
-        # Filter sessions that have already ended
-        now = datetime.now(timezone.utc)
-        past_races = [
-            s for s in sessions
-            if 'date_end' in s and datetime.fromisoformat(s['date_end'].replace('Z', '+00:00')) < now
-        ]
+    # Get race sessions for the current year
+    sessions = await fetch_from_openf1(f"sessions?session_type=Race&year={current_year}")
+    if not sessions:
+        # Fallback to previous year if no races found
+        sessions = await fetch_from_openf1(f"sessions?session_type=Race&year={current_year - 1}")
+    if not sessions:
+        return None
 
-        if not past_races:
-            return get_fallback_fastest_lap()
+    # Filter sessions that have already ended
+    now = datetime.now(timezone.utc)
+    past_races = [
+        s for s in sessions
+        if 'date_end' in s and datetime.fromisoformat(s['date_end'].replace('Z', '+00:00')) < now
+    ]
+    if not past_races:
+        return None
 
-        # Get the most recent completed race
-        latest_session = max(past_races, key=lambda s: s['date_end'])
-        session_key = latest_session['session_key']
+    return max(past_races, key=lambda s: s['date_end'])
 
-        # Fetch laps only for that session
-        laps = await fetch_from_openf1(f"laps?session_key={session_key}")
-        if not laps:
-            return get_fallback_fastest_lap()
+def build_fastest_lap(lap: Lap, session: Dict[Any, Any], drivers: DriverRegistry) -> FastestLap:
+    driver = drivers.get(lap.driver_number)
+    sector_times = lap.sectors if all(sector is not None for sector in lap.sectors) else []
+
+    return FastestLap(
+        driver_name=driver.name,
+        abbreviation=driver.abbr,
+        team=driver.team,
+        lap_time=format_lap_time(lap.lap_duration),
+        race_name=session.get('meeting_name', 'Unknown'),
+        date=session.get('date_start', '')[:10],
+        sector_times=sector_times
+    )
 
-        # Filter laps with valid lap_duration
-        valid_laps = [lap for lap in laps if lap.get('lap_duration') and lap['lap_duration'] > 0]
-        if not valid_laps:
+async def fetch_fastest_lap():
+    """Fetch fastest lap, sharing one lookup between concurrent callers"""
+    return await aggregate_flight.do("fastest_lap", _fetch_fastest_lap)
+
+async def _fetch_fastest_lap():
+    """Fetch fastest lap with sector times from the most recent completed race"""
+    try:
+        latest_session = await get_latest_race_session()
+        if not latest_session:
             return get_fallback_fastest_lap()
 
-        # Get the fastest lap
-        fastest_lap = min(valid_laps, key=lambda x: x['lap_duration'])
-        driver_number = fastest_lap['driver_number']
-
-        driver_info = DRIVER_INFO.get(driver_number, {
-            "name": f"Driver {driver_number}",
-            "abbr": f"D{driver_number}",
-            "team": "Unknown"
-        })
-
-        # Format lap time
-        duration = fastest_lap['lap_duration']
-        minutes = int(duration // 60)
-        seconds = duration % 60
-        lap_time = f"{minutes}:{seconds:06.3f}"
-
-        # Try to get sector times for this specific lap
-        sector_times = await get_sector_times(session_key, driver_number, fastest_lap.get('lap_number', 1))
-
-        return FastestLap(
-            driver_name=driver_info["name"],
-            abbreviation=driver_info["abbr"],
-            team=driver_info["team"],
-            lap_time=lap_time,
-            race_name=latest_session.get('meeting_name', 'Unknown'),
-            date=latest_session.get('date_start', '')[:10],
-            sector_times=sector_times
+        # Laps of that session, indexed once and shared with the other lap endpoints
+        index, drivers = await asyncio.gather(
+            fetch_lap_index(latest_session['session_key']), fetch_driver_registry(latest_session['session_key'])
         )
+        if not index or not index.ranking:
+            return get_fallback_fastest_lap()
+
+        return build_fastest_lap(index.fastest_laps(1)[0], latest_session, drivers)
 
     except Exception as e:
         logger.error(f"Error fetching latest fastest lap: {e}")
         return get_fallback_fastest_lap()
 
 async def fetch_fastest_laps():
+    """Fetch the top 10 fastest laps, sharing one lookup between concurrent callers"""
+    return await aggregate_flight.do("fastest_laps", _fetch_fastest_laps)
+
+async def _fetch_fastest_laps():
     """Fetch fastest lap for top 10 different drivers from the most recent completed race"""
     try:
-        current_year = datetime.now().year
-
-        # Get sessions
-        sessions = await fetch_from_openf1(f"sessions?session_type=Race&year={current_year}")
-        if not sessions:
-            sessions = await fetch_from_openf1(f"sessions?session_type=Race&year={current_year - 1}")
-        if not sessions:
+        latest_session = await get_latest_race_session()
+        if not latest_session:
             return [get_fallback_fastest_lap()]
 
-        now = datetime.now(timezone.utc)
-        past_races = [
-            s for s in sessions
-            if 'date_end' in s and datetime.fromisoformat(s['date_end'].replace('Z', '+00:00')) < now
-        ]
-        if not past_races:
-            return [get_fallback_fastest_lap()]
-
-        latest_session = max(past_races, key=lambda s: s['date_end'])
-        session_key = latest_session['session_key']
-
-        # Fetch all laps
-        laps = await fetch_from_openf1(f"laps?session_key={session_key}")
-        if not laps:
+        index, drivers = await asyncio.gather(
+            fetch_lap_index(latest_session['session_key']), fetch_driver_registry(latest_session['session_key'])
+        )
+        if not index or not index.ranking:
             return [get_fallback_fastest_lap()]
 
-        # Group laps by driver and get their best lap
-        driver_best_laps = {}
-        for lap in laps:
-            if lap.get('lap_duration') and lap['lap_duration'] > 0:
-                dnum = lap['driver_number']
-                if dnum not in driver_best_laps or lap['lap_duration'] < driver_best_laps[dnum]['lap_duration']:
-                    driver_best_laps[dnum] = lap
-
-        # Get fastest lap of each driver, sort, then take top 10
-        top_laps = sorted(driver_best_laps.values(), key=lambda x: x['lap_duration'])[:10]
-
-        results = []
-        for lap in top_laps:
-            driver_number = lap['driver_number']
-            lap_number = lap.get('lap_number', 1)
-
-            driver_info = DRIVER_INFO.get(driver_number, {
-                "name": f"Driver {driver_number}",
-                "abbr": f"D{driver_number}",
-                "team": "Unknown"
-            })
-
-            duration = lap['lap_duration']
-            minutes = int(duration // 60)
-            seconds = duration % 60
-            lap_time = f"{minutes}:{seconds:06.3f}"
-
-            sector_times = await get_sector_times(session_key, driver_number, lap_number)
-
-            results.append(FastestLap(
-                driver_name=driver_info["name"],
-                abbreviation=driver_info["abbr"],
-                team=driver_info["team"],
-                lap_time=lap_time,
-                race_name=latest_session.get('meeting_name', 'Unknown'),
-                date=latest_session.get('date_start', '')[:10],
-                sector_times=sector_times
-            ))
-
-        return results
+        # Best lap of each driver, already ranked in the index, with its sector times
+        return [build_fastest_lap(lap, latest_session, drivers) for lap in index.fastest_laps(10)]
 
     except Exception as e:
         logger.error(f"Error fetching top 10 fastest laps: {e}")
         return [get_fallback_fastest_lap()]
 
+async def fetch_lap_history(driver_number: int) -> Optional[LapHistory]:
+    """Lap-by-lap times of one driver in the most recent completed race"""
+    latest_session = await get_latest_race_session()
+    if not latest_session:
+        return None
+
+    index, drivers = await asyncio.gather(
+        fetch_lap_index(latest_session['session_key']), fetch_driver_registry(latest_session['session_key'])
+    )
+    if not index or driver_number not in index.drivers:
+        return None
+
+    driver = drivers.get(driver_number)
+    best_lap = index.best_lap(driver_number)
+    theoretical_best = index.driver_theoretical_best(driver_number)
+
+    return LapHistory(
+        driver_name=driver.name,
+        abbreviation=driver.abbr,
+        team=driver.team,
+        race_name=latest_session.get('meeting_name', 'Unknown'),
+        date=latest_session.get('date_start', '')[:10],
+        best_lap=format_lap_time(best_lap.lap_duration) if best_lap else None,
+        theoretical_best=format_lap_time(theoretical_best) if theoretical_best else None,
+        laps=[
+            LapTime(lap_number=lap.lap_number, lap_duration=lap.lap_duration, sector_times=lap.sectors)
+            for lap in index.driver_laps(driver_number)
+        ]
+    )
+
 def get_fallback_fastest_lap():
     """Fallback fastest lap data with sector times"""
     return FastestLap(
@@ -587,53 +1129,258 @@ def get_fallback_fastest_lap():
         sector_times=[25.5, 35.2, 19.854]  # Realistic sector breakdown
     )
 
-@app.get("/dashboard", response_model=DashboardData)
-async def get_dashboard_data():
-    """Get all dashboard data including fastest lap"""
-    try:
-        # Fetch all data concurrently for maximum speed
-        drivers_task = fetch_driver_standings()
-        teams_task = fetch_constructor_standings()
-        race_task = fetch_next_race()
-        fastest_lap_task = fetch_fastest_lap()
-        
-        top_drivers, top_teams, next_race, fastest_lap = await asyncio.gather(
-            drivers_task, teams_task, race_task, fastest_lap_task
+# FastF1 analytics: loading a session and crunching it in pandas holds the GIL
+# for seconds, so it runs in worker processes started on first use
+ANALYTICS_WORKERS = env_int("ANALYTICS_WORKERS", 2)
+ANALYTICS_TTL = 6 * 3600  # sessions of the current season; past seasons are kept forever
+
+analytics_executor: Optional[ProcessPoolExecutor] = None
+
+def get_analytics_executor() -> ProcessPoolExecutor:
+    global analytics_executor
+    if analytics_executor is None:
+        analytics_executor = ProcessPoolExecutor(
+            max_workers=ANALYTICS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
         )
-        
-        return DashboardData(
-            top_drivers=top_drivers,
-            top_teams=top_teams,
-            next_race=next_race,
-            fastest_lap=fastest_lap
+    return analytics_executor
+
+async def fetch_session_analytics(year: int, round_number: int, session_name: str) -> Dict[str, Any]:
+    """Telemetry, stint and lap-time analyses of one session, computed in a worker.
+
+    All analyses of a session come from one load, cached under
+    (year, round, session), and concurrent requests for the same session
+    share that load instead of starting one per worker.
+    """
+    session_name = session_name.upper()
+
+    async def loader():
+        global analytics_executor
+        # Only sessions that are not cached count against the worker limit
+        rate_limiter.admit("analytics")
+        loop = asyncio.get_running_loop()
+        executor = get_analytics_executor()
+        try:
+            result = await loop.run_in_executor(executor, analyze_session, year, round_number, session_name)
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory); start a fresh pool next time,
+            # unless a concurrent request has already replaced it
+            if analytics_executor is executor:
+                analytics_executor = None
+            raise
+        return result, len(orjson.dumps(result))
+
+    ttl = FOREVER if year < datetime.now().year else ANALYTICS_TTL
+    return await response_cache.get_or_fetch(f"analytics:{year}:{round_number}:{session_name}", loader, ttl)
+
+# Background prefetch: tight loop around race sessions, backing off in between
+PREFETCH_ENABLED = env_bool("PREFETCH_ENABLED", True)
+PREFETCH_HOT_INTERVAL = 60            # seconds between runs during a race window
+PREFETCH_IDLE_INTERVAL = 6 * 3600     # longest sleep between race weekends
+PREFETCH_WINDOW_BEFORE = 3600         # race window opens this long before the start
+PREFETCH_WINDOW_AFTER = 3 * 3600      # and stays open this long after the end
+
+async def warm_caches():
+    """Refresh standings, next race and fastest lap ahead of user requests"""
+    # Low priority: when the upstream gate is full, user requests go first
+    with revalidating(), background_priority():
+        results = await asyncio.gather(
+            fetch_standings(),
+            fetch_next_race(),
+            fetch_fastest_lap(),
+            return_exceptions=True
         )
-        
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error(f"Error warming caches: {result}")
+
+async def prefetch_delay() -> float:
+    """Seconds until the next prefetch, based on the race calendar"""
+    now = datetime.now(timezone.utc)
+    sessions = await fetch_from_openf1(f"sessions?session_type=Race&year={now.year}")
+    if not sessions:
+        return PREFETCH_HOT_INTERVAL * 10
+    
+    delay = PREFETCH_IDLE_INTERVAL
+    for session in sessions:
+        try:
+            start_dt = datetime.fromisoformat(session['date_start'].replace('Z', '+00:00'))
+            end_dt = datetime.fromisoformat(session['date_end'].replace('Z', '+00:00'))
+        except (KeyError, ValueError, AttributeError):
+            continue
+        window_start = (start_dt - now).total_seconds() - PREFETCH_WINDOW_BEFORE
+        window_end = (end_dt - now).total_seconds() + PREFETCH_WINDOW_AFTER
+        if window_start <= 0 <= window_end:
+            return PREFETCH_HOT_INTERVAL
+        if window_start > 0:
+            delay = min(delay, window_start)
+    return max(delay, PREFETCH_HOT_INTERVAL)
+
+prefetch_scheduler = PrefetchScheduler(warm_caches, prefetch_delay)
+
+# Live timing: one poller asks OpenF1 for new rows only, however many viewers
+LIVE_POLL_INTERVAL = 4         # seconds between polls while a session runs
+LIVE_IDLE_INTERVAL = 30        # between polls when no session is running
+LIVE_QUEUE_SIZE = 64           # events buffered per subscriber before it is resynced
+
+async def fetch_live_rows(endpoint: str) -> Optional[List[Dict[Any, Any]]]:
+    """Uncached OpenF1 fetch for the live poller, whose cursors make every URL new"""
+    try:
+        result = await load_json(openf1_client, endpoint)
+    except UpstreamUnavailable:
+        return None
     except Exception as e:
-        logger.error(f"Error processing dashboard data: {e}")
-        raise HTTPException(status_code=500, detail=f"Error processing dashboard data: {str(e)}")
+        logger.error(f"Error fetching live data from OpenF1: {e}")
+        return None
+    return result[0] if result else None
+
+live_feed = LiveFeed(
+    fetch_live_rows,
+    poll_interval=LIVE_POLL_INTERVAL,
+    idle_interval=LIVE_IDLE_INTERVAL,
+    queue_size=LIVE_QUEUE_SIZE
+)
+
+# Time spent in each part of /dashboard; series are created once here
+DASHBOARD_STAGE_DURATION = registry.histogram(
+    "f1_dashboard_stage_duration_seconds", "Duration of each /dashboard stage", ("stage",)
+)
+DASHBOARD_STAGES = {
+    stage: DASHBOARD_STAGE_DURATION.labels(stage)
+    for stage in ("standings", "next_race", "fastest_lap", "render", "total")
+}
+
+async def timed(stage: str, awaitable):
+    """Await and record the duration under a /dashboard stage"""
+    start = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        DASHBOARD_STAGES[stage].observe(time.perf_counter() - start)
+
+def collect_runtime_metrics():
+    """Cache, coalescing and upstream health values read at scrape time"""
+    stats = response_cache.stats()
+    yield "f1_cache_lookups_total", "counter", "Response cache lookups by result", [
+        ({"result": "hit"}, stats["hits"]),
+        ({"result": "stale_hit"}, stats["stale_hits"]),
+        ({"result": "miss"}, stats["misses"]),
+    ]
+    yield "f1_cache_stale_if_error_total", "counter", "Expired entries served because their reload failed or was shed", [
+        ({}, stats["stale_if_error"]),
+    ]
+    yield "f1_cache_hit_ratio", "gauge", "Share of lookups served from the cache, stale included", [
+        ({}, stats["hit_ratio"]),
+    ]
+    yield "f1_cache_bytes", "gauge", "Estimated size of cached payloads", [({}, stats["bytes"])]
+    yield "f1_cache_entries", "gauge", "Cached entries", [({}, stats["entries"])]
+    yield "f1_cache_evictions_total", "counter", "Entries evicted to stay within the byte budget", [
+        ({}, stats["evictions"]),
+    ]
+    yield "f1_cache_shared_lookups_total", "counter", "Loads answered by another worker, by outcome", [
+        ({"result": "hit"}, stats["shared_hits"]),
+        ({"result": "waited"}, stats["shared_waits"]),
+        ({"result": "error"}, stats["shared_errors"]),
+    ]
+    yield "f1_coalesced_requests_total", "counter", "Callers that joined an in-flight load", [
+        ({"layer": "cache"}, stats["coalesced"]),
+        ({"layer": "aggregate"}, aggregate_flight.coalesced),
+    ]
+    clients = (f1api_dev_client, openf1_client)
+    yield "f1_upstream_circuit_open", "gauge", "1 while an upstream's circuit breaker rejects requests", [
+        ({"host": client.name}, 1 if client.breaker.state == "open" else 0) for client in clients
+    ]
+    yield "f1_live_subscribers", "gauge", "Connected /live subscribers", [
+        ({}, len(live_feed.subscribers)),
+    ]
+    gate = upstream_gate.stats()
+    yield "f1_upstream_gate_requests", "gauge", "Upstream requests holding or waiting for a gate slot", [
+        ({"state": "in_flight"}, gate["in_flight"]),
+        ({"state": "waiting"}, gate["waiting"]),
+    ]
+    yield "f1_upstream_gate_shed_total", "counter", "Upstream requests shed by the gate", [({}, gate["shed"])]
+    yield "f1_upstream_timeout_seconds", "gauge", "Current adaptive timeout per upstream", [
+        ({"host": client.name}, client.adaptive_timeout()) for client in clients
+    ]
+
+registry.register_collector(collect_runtime_metrics)
+
+# Budget of each /dashboard section, in seconds; a section that overruns is
+# served from its last good value while its fetch finishes in the background
+DASHBOARD_DEADLINE = env_float("DASHBOARD_DEADLINE", 1.5)
+
+dashboard_sections = (
+    DashboardSection("standings", lambda: timed("standings", fetch_standings()), DASHBOARD_DEADLINE),
+    DashboardSection("next_race", lambda: timed("next_race", fetch_next_race()), DASHBOARD_DEADLINE),
+    DashboardSection("fastest_lap", lambda: timed("fastest_lap", fetch_fastest_lap()), DASHBOARD_DEADLINE),
+)
+
+def section_freshness(status: str, updated_at: Optional[str]) -> Dict[str, Any]:
+    return {"status": status, "updated_at": updated_at}
+
+def build_dashboard(parts) -> Dict[str, Any]:
+    """Dashboard body from the (value, status, updated_at) of each section"""
+    (standings, *standings_meta), (next_race, *race_meta), (fastest_lap, *lap_meta) = parts
+    top_drivers, top_teams = standings if standings is not None else (None, None)
+    standings_freshness = section_freshness(*standings_meta)
+    return {
+        "top_drivers": top_drivers,
+        "top_teams": top_teams,
+        "next_race": next_race,
+        "fastest_lap": fastest_lap,
+        "sections": {
+            "top_drivers": standings_freshness,
+            "top_teams": standings_freshness,
+            "next_race": section_freshness(*race_meta),
+            "fastest_lap": section_freshness(*lap_meta),
+        },
+    }
+
+@app.get("/dashboard", response_model=DashboardData)
+async def get_dashboard_data(request: Request):
+    """Get all dashboard data including fastest lap, each section within its deadline"""
+    start = time.perf_counter()
+    parts = await asyncio.gather(*(section.resolve() for section in dashboard_sections))
+
+    render_start = time.perf_counter()
+    response = precomputed_responses.respond(request, "dashboard", tuple(parts), build_dashboard)
+    DASHBOARD_STAGES["render"].observe(time.perf_counter() - render_start)
+    DASHBOARD_STAGES["total"].observe(time.perf_counter() - start)
+    return response
 
 @app.get("/fastest-lap", response_model=FastestLap)
-async def get_fastest_lap():
+async def get_fastest_lap(request: Request):
     """Get fastest lap from the most recent race"""
-    return await fetch_fastest_lap()
+    return precomputed_responses.respond(request, "fastest_lap", await fetch_fastest_lap())
+
+@app.get("/fastest-laps", response_model=List[FastestLap])
+async def get_fastest_laps(request: Request):
+    """Get the best lap of the top 10 drivers from the most recent race"""
+    return precomputed_responses.respond(request, "fastest_laps", await fetch_fastest_laps())
+
+@app.get("/lap-history/{driver_number}", response_model=LapHistory)
+async def get_lap_history(driver_number: int, request: Request):
+    """Get lap-by-lap times of one driver in the most recent race"""
+    history = await fetch_lap_history(driver_number)
+    if history is None:
+        raise HTTPException(status_code=404, detail=f"No laps found for driver {driver_number}")
+    return precomputed_responses.respond(request, f"lap_history:{driver_number}", history)
 
 @app.get("/f1-data", response_model=F1Data)
-async def get_f1_data():
+async def get_f1_data(request: Request):
     """Get top 3 drivers, top 3 teams, and next race information"""
     try:
         # Fetch all data concurrently for speed
-        drivers_task = fetch_driver_standings()
-        teams_task = fetch_constructor_standings()
+        standings_task = fetch_standings()
         race_task = fetch_next_race()
         
-        top_drivers, top_teams, next_race = await asyncio.gather(
-            drivers_task, teams_task, race_task
+        (top_drivers, top_teams), next_race = await asyncio.gather(
+            standings_task, race_task
         )
         
-        return F1Data(
-            top_drivers=top_drivers,
-            top_teams=top_teams,
-            next_race=next_race
+        return precomputed_responses.respond(
+            request, "f1_data", (top_drivers, top_teams, next_race),
+            lambda parts: dict(zip(("top_drivers", "top_teams", "next_race"), parts))
         )
         
     except Exception as e:
@@ -641,19 +1388,97 @@ async def get_f1_data():
         raise HTTPException(status_code=500, detail=f"Error processing F1 data: {str(e)}")
 
 @app.get("/drivers", response_model=List[Driver])
-async def get_top_drivers():
+async def get_top_drivers(request: Request):
     """Get only the top 3 drivers"""
-    return await fetch_driver_standings()
+    return precomputed_responses.respond(request, "drivers", await fetch_driver_standings())
 
 @app.get("/teams", response_model=List[Team])
-async def get_top_teams():
+async def get_top_teams(request: Request):
     """Get only the top 3 teams"""
-    return await fetch_constructor_standings()
+    return precomputed_responses.respond(request, "teams", await fetch_constructor_standings())
 
 @app.get("/next-race", response_model=NextRace)
-async def get_next_race():
+async def get_next_race(request: Request):
     """Get only the next race information"""
-    return await fetch_next_race()
+    return precomputed_responses.respond(request, "next_race", await fetch_next_race())
+
+async def session_analytics_response(request: Request, year: int, round_number: int, session: str, part: str):
+    try:
+        analytics = await fetch_session_analytics(year, round_number, session)
+    except RateLimited:
+        raise
+    except ValueError as e:
+        # FastF1 rejects unknown rounds and session names with ValueError
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error computing analytics for {year}/{round_number}/{session}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    def build(analytics):
+        body = {key: analytics[key] for key in ("year", "round", "event", "session", "date")}
+        body[part] = analytics[part]
+        return body
+
+    return precomputed_responses.respond(
+        request, f"analytics:{year}:{round_number}:{session.upper()}:{part}", analytics, build
+    )
+
+@app.get("/analytics/{year}/{round_number}/{session}/telemetry")
+async def get_session_telemetry(year: int, round_number: int, session: str, request: Request):
+    """Whole-session car data summary of each driver (speed, throttle, braking, DRS)"""
+    return await session_analytics_response(request, year, round_number, session, "telemetry")
+
+@app.get("/analytics/{year}/{round_number}/{session}/stints")
+async def get_session_stints(year: int, round_number: int, session: str, request: Request):
+    """Stints of each driver with compound, pace and tyre degradation"""
+    return await session_analytics_response(request, year, round_number, session, "stints")
+
+@app.get("/analytics/{year}/{round_number}/{session}/lap-times")
+async def get_session_lap_times(year: int, round_number: int, session: str, request: Request):
+    """Lap-time distribution of each driver over representative laps"""
+    return await session_analytics_response(request, year, round_number, session, "lap_times")
+
+@app.get("/live")
+async def get_live():
+    """Server-Sent Events: position changes, personal bests and fastest lap of the current session"""
+    return StreamingResponse(
+        live_feed.events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def require_admin(request: Request) -> None:
+    """Reject requests without the admin bearer token"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    expected = f"Bearer {ADMIN_TOKEN}".encode()
+    if not hmac.compare_digest(request.headers.get("authorization", "").encode(), expected):
+        raise HTTPException(status_code=401, detail="Invalid admin token", headers={"WWW-Authenticate": "Bearer"})
+
+@app.post("/standings/rebuild")
+async def rebuild_standings(request: Request):
+    """Recalculate standings from scratch, e.g. after results were corrected (admin only)"""
+    require_admin(request)
+    # Checked after authentication, so other clients cannot use up the limit
+    rate_limiter.admit("standings_rebuild")
+    sessions = await standings_engine.rebuild()
+    return {"year": standings_engine.year, "sessions": sessions}
+
+@app.get("/cache-stats")
+async def get_cache_stats():
+    """Get response cache, source routing, upstream health and admission counters"""
+    stats = response_cache.stats()
+    stats["aggregate_coalesced"] = aggregate_flight.coalesced
+    stats["sources"] = source_router.stats()
+    stats["upstreams"] = {client.name: client.stats() for client in (f1api_dev_client, openf1_client)}
+    stats["upstream_gate"] = upstream_gate.stats()
+    stats["rate_limit"] = rate_limiter.stats()
+    return stats
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus text exposition of latency, cache, routing and payload metrics"""
+    return Response(content=registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 @app.get("/")
 async def root():
@@ -674,12 +1499,21 @@ async def root():
             "calculation": "Championship points calculated from race results when APIs unavailable"
         },
         "endpoints": {
-            "/dashboard": "Get all dashboard data (drivers, teams, next race, fastest lap)",
+            "/dashboard": "Get all dashboard data (drivers, teams, next race, fastest lap) with per-section freshness",
             "/f1-data": "Get basic F1 data (drivers, teams, next race)",
             "/drivers": "Get top 3 drivers",
             "/teams": "Get top 3 teams", 
             "/next-race": "Get next race information",
-            "/fastest-lap": "Get fastest lap from most recent race with sector times"
+            "/fastest-lap": "Get fastest lap from most recent race with sector times",
+            "/fastest-laps": "Get the best lap of the top 10 drivers from the most recent race",
+            "/lap-history/{driver_number}": "Get lap-by-lap times of one driver in the most recent race",
+            "/analytics/{year}/{round}/{session}/telemetry": "Get FastF1 car data summaries of a session",
+            "/analytics/{year}/{round}/{session}/stints": "Get FastF1 stint and tyre analysis of a session",
+            "/analytics/{year}/{round}/{session}/lap-times": "Get FastF1 lap-time distributions of a session",
+            "/live": "Stream live position changes and best laps of the current session (Server-Sent Events)",
+            "/standings/rebuild": "Recalculate standings from race results from scratch (POST, admin token)",
+            "/cache-stats": "Get response cache, source routing, upstream health and admission counters",
+            "/metrics": "Get Prometheus metrics"
         }
     }
 
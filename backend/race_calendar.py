@@ -0,0 +1,121 @@
+"""Season calendars indexed by race start, for finding the next race by bisection.
+
+A calendar is parsed once per payload: every start becomes a UTC datetime
+in a sorted list, so the next race is a ``bisect`` away and the countdown
+is computed from the stored datetime rather than by parsing it again.
+"""
+import logging
+from bisect import bisect_right
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# f1api.dev lists some races by date only
+DEFAULT_RACE_TIME = "15:00:00+00:00"
+
+
+class Race(NamedTuple):
+    name: str
+    location: str
+    country: str
+    start: datetime
+    # '%Y-%m-%d %H:%M UTC', formatted once
+    date: str
+
+
+def parse_start(value: str) -> datetime:
+    """UTC datetime of an ISO date or timestamp; dates get the default race time"""
+    if 'T' not in value:
+        value = f"{value}T{DEFAULT_RACE_TIME}"
+    start = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    return start.astimezone(timezone.utc)
+
+
+class RaceCalendar:
+    """Races of a season sorted by start time"""
+
+    __slots__ = ("races", "starts")
+
+    def __init__(self, races: List[Race]):
+        self.races = sorted(races, key=lambda race: race.start)
+        # POSIX timestamps, bisected instead of comparing datetimes
+        self.starts = [race.start.timestamp() for race in self.races]
+
+    def __len__(self) -> int:
+        return len(self.races)
+
+    @classmethod
+    def from_entries(cls, entries: List[dict], date_field: str, fields: Callable[[dict], Tuple[str, str, str]]) -> "RaceCalendar":
+        races = []
+        for entry in entries:
+            value = entry.get(date_field)
+            if not value:
+                continue
+            try:
+                start = parse_start(value)
+            except (ValueError, TypeError) as e:
+                logger.error(f"Error parsing race date {value}: {e}")
+                continue
+            races.append(Race(*fields(entry), start, start.strftime('%Y-%m-%d %H:%M UTC')))
+        return cls(races)
+
+    @classmethod
+    def from_f1api(cls, data: Dict[str, Any]) -> "RaceCalendar":
+        return cls.from_entries(data.get('races') or [], 'date', lambda race: (
+            race.get('race_name', race.get('name', 'Unknown')),
+            race.get('location', race.get('circuit', 'Unknown')),
+            race.get('country', 'Unknown'),
+        ))
+
+    @classmethod
+    def from_meetings(cls, meetings: List[dict]) -> "RaceCalendar":
+        return cls.from_entries(meetings, 'date_start', lambda meeting: (
+            meeting.get('meeting_name', 'Unknown'),
+            meeting.get('location', 'Unknown'),
+            meeting.get('country_name', 'Unknown'),
+        ))
+
+    def next_after(self, now: datetime) -> Optional[Race]:
+        """First race starting strictly after ``now``"""
+        i = bisect_right(self.starts, now.timestamp())
+        return self.races[i] if i < len(self.races) else None
+
+    def first(self) -> Optional[Race]:
+        return self.races[0] if self.races else None
+
+    def finished(self, now: datetime) -> bool:
+        """Whether every race has started; an empty calendar is not finished"""
+        return bool(self.starts) and self.starts[-1] <= now.timestamp()
+
+
+class CalendarIndexes:
+    """A RaceCalendar per calendar payload, rebuilt only when the payload changes.
+
+    Cached payloads are the same object until they are refreshed, and a
+    refresh that returns an equal calendar keeps the existing index.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Any, RaceCalendar]] = {}
+        self.builds = 0
+
+    def get(self, name: str, payload: Any, build: Callable[[Any], RaceCalendar]) -> RaceCalendar:
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] is payload:
+            return entry[1]
+        if entry is not None and entry[0] == payload:
+            # Same calendar, refreshed; compare by identity from now on
+            self._entries[name] = (payload, entry[1])
+            return entry[1]
+        calendar = build(payload)
+        self._entries[name] = (payload, calendar)
+        self.builds += 1
+        return calendar
+
+    def last(self, name: str) -> Optional[RaceCalendar]:
+        """Most recently built index under ``name``, without fetching anything"""
+        entry = self._entries.get(name)
+        return entry[1] if entry is not None else None
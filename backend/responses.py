@@ -0,0 +1,60 @@
+import hashlib
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import orjson
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+
+def to_jsonable(value: Any) -> Any:
+    """Turn models (and lists/tuples/dicts of them) into plain data for orjson"""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item) for item in value]
+    if isinstance(value, dict):
+        return {key: to_jsonable(item) for key, item in value.items()}
+    return value
+
+
+class PrecomputedResponses:
+    """Serialized JSON bodies and ETags, rebuilt only when the content changes.
+
+    ``render`` compares the new value with the one last rendered under the
+    same name. Comparing models field by field is much cheaper than encoding
+    them, so unchanged aggregates are served from the stored bytes.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Any, bytes, str]] = {}
+        self.renders = 0
+        self.reuses = 0
+
+    def render(self, name: str, value: Any, build: Optional[Callable[[Any], Any]] = None) -> Tuple[bytes, str]:
+        entry = self._entries.get(name)
+        if entry is not None and (entry[0] is value or entry[0] == value):
+            self.reuses += 1
+            return entry[1], entry[2]
+
+        body = orjson.dumps(to_jsonable(build(value) if build else value))
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        self._entries[name] = (value, body, etag)
+        self.renders += 1
+        return body, etag
+
+    def respond(self, request: Request, name: str, value: Any,
+                build: Optional[Callable[[Any], Any]] = None) -> Response:
+        body, etag = self.render(name, value, build)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag == etag or tag.removeprefix("W/") == etag for tag in candidates)
@@ -0,0 +1,88 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+from metrics import registry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# A source returns its answer, or None when it has nothing usable
+Source = Callable[[], Awaitable[Optional[T]]]
+
+SOURCE_ANSWERS = registry.counter(
+    "f1_source_answers_total", "Answers served per route by the source that produced them", ("route", "source")
+)
+SOURCE_HEDGES = registry.counter(
+    "f1_source_hedges_total", "Fallback sources started because the primary was slow", ("route",)
+)
+
+
+class SourceRouter:
+    """Race a primary data source against a fallback, returning the first good answer.
+
+    The fallback starts as soon as the primary fails or returns None, or,
+    when a hedge delay is given, once the primary has been running longer
+    than that delay (typically its p95 latency). Whichever source answers
+    first wins and the other call is cancelled.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.hedged = 0
+        self.fallbacks = 0
+        self.fallback_wins = 0
+
+    async def first_good(self, route: str, primary: Source, fallback: Source,
+                         hedge_delay: Optional[float] = None,
+                         names: Tuple[str, str] = ("primary", "fallback")) -> Optional[T]:
+        """``route`` and ``names`` label the f1_source_* metrics"""
+        self.calls += 1
+        tasks: List[asyncio.Future] = [asyncio.ensure_future(primary())]
+        try:
+            await asyncio.wait(tasks, timeout=hedge_delay)
+            if tasks[0].done():
+                result = self._result(tasks[0])
+                if result is not None:
+                    SOURCE_ANSWERS.labels(route, names[0]).inc()
+                    return result
+                self.fallbacks += 1
+            else:
+                self.hedged += 1
+                SOURCE_HEDGES.labels(route).inc()
+
+            tasks.append(asyncio.ensure_future(fallback()))
+            pending = {task for task in tasks if not task.done()}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Prefer the primary when both finished at the same time
+                for i, task in enumerate(tasks):
+                    if task in done:
+                        result = self._result(task)
+                        if result is not None:
+                            self.fallback_wins += i
+                            SOURCE_ANSWERS.labels(route, names[i]).inc()
+                            return result
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    def _result(task: asyncio.Future) -> Optional[T]:
+        if task.cancelled():
+            return None
+        error = task.exception()
+        if error is not None:
+            logger.error(f"Error from data source: {error}")
+            return None
+        return task.result()
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "fallbacks": self.fallbacks,
+            "fallback_wins": self.fallback_wins,
+        }
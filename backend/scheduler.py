@@ -0,0 +1,59 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PrefetchScheduler:
+    """Runs a warm-up job in the background, sleeping a job-chosen delay between runs.
+
+    ``warm`` refreshes whatever should be ready before users ask for it and
+    ``next_delay`` decides how long to wait until the next run, so the
+    schedule can tighten around live sessions and back off in between.
+    """
+
+    def __init__(
+        self,
+        warm: Callable[[], Awaitable[None]],
+        next_delay: Callable[[], Awaitable[float]],
+        error_delay: float = 60.0,
+    ):
+        self.warm = warm
+        self.next_delay = next_delay
+        self.error_delay = error_delay
+        self.runs = 0
+        self.last_delay: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.warm()
+                self.runs += 1
+                delay = await self.next_delay()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in prefetch run: {e}")
+                delay = self.error_delay
+            self.last_delay = delay
+            await asyncio.sleep(delay)
@@ -0,0 +1,73 @@
+"""Response sections fetched within a deadline, falling back to their last good value.
+
+A section that misses its deadline is not cancelled: its fetch keeps
+running, later requests join it instead of starting another, and its
+result becomes the last good value once it arrives. Until then the section
+is served stale, or as pending if it never had a value.
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+from metrics import registry
+
+logger = logging.getLogger(__name__)
+
+FRESH = "fresh"        # fetched within the deadline for this request
+STALE = "stale"        # last good value; the fetch overran or failed
+PENDING = "pending"    # no value yet
+
+SECTION_RESULTS = registry.counter(
+    "f1_response_sections_total", "Response sections served, by freshness", ("section", "status")
+)
+
+
+class DashboardSection:
+    """One section of a composite response with its own deadline and last good value"""
+
+    def __init__(self, name: str, fetch: Callable[[], Awaitable[Any]], deadline: float):
+        self.name = name
+        self.fetch = fetch
+        self.deadline = deadline
+        self.value: Any = None
+        # When the last good value changed, as an ISO timestamp; an unchanged
+        # refresh keeps it, so identical responses stay identical
+        self.updated_at: Optional[str] = None
+        self._task: Optional[asyncio.Future] = None
+        self._counters = {status: SECTION_RESULTS.labels(name, status) for status in (FRESH, STALE, PENDING)}
+
+    async def resolve(self) -> Tuple[Any, str, Optional[str]]:
+        """(value, status, updated_at), waiting at most the deadline for a fetch"""
+        task = self._task
+        if task is None:
+            task = self._task = asyncio.ensure_future(self.fetch())
+        done, _ = await asyncio.wait((task,), timeout=self.deadline)
+        if done:
+            self._finished(task)
+        else:
+            # Record the result for later requests once the overrun fetch ends
+            task.add_done_callback(self._finished)
+        if done and not task.cancelled() and task.exception() is None and task.result() is not None:
+            status = FRESH
+        else:
+            status = STALE if self.value is not None else PENDING
+        self._counters[status].inc()
+        return self.value if status != PENDING else None, status, self.updated_at
+
+    def _finished(self, task: asyncio.Future) -> None:
+        if self._task is not task:
+            return  # already recorded by another request
+        self._task = None
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            logger.error(f"Error fetching {self.name}: {error}")
+            return
+        value = task.result()
+        if value is None:
+            return
+        if self.value is None or not (value is self.value or value == self.value):
+            self.updated_at = datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+        self.value = value
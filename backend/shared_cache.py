@@ -0,0 +1,273 @@
+"""Cache layers shared between worker processes.
+
+ResponseCache keeps its in-process LRU in front of one of these backends.
+Values are pickled together with the wall-clock time they were fetched and
+their TTL, so every worker agrees on freshness, and a lease lock per key
+lets one worker refresh it while the others wait for the result instead of
+calling upstream themselves.
+
+CACHE_BACKEND picks the layer: 'memory' (none, the default), 'shm' for
+files on a tmpfs shared by the workers of one host, or 'redis' for several
+hosts (needs the optional ``redis`` package).
+
+Records are unpickled as they are read, so whoever can write to the shm
+directory or the Redis instance can run code in every worker: keep the
+directory private to the service user (it is created with mode 0700) and
+Redis on a trusted network with authentication.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import pickle
+import struct
+import tempfile
+import time
+from typing import Any, Dict, NamedTuple, Optional
+
+from env import env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "memory")
+CACHE_SHM_DIR = os.environ.get(
+    "CACHE_SHM_DIR", os.path.join("/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), "f1-cache")
+)
+CACHE_REDIS_URL = os.environ.get("CACHE_REDIS_URL", "redis://localhost:6379/0")
+# Longest a worker may hold a key's refresh lock before others take over
+CACHE_LOCK_LEASE = env_float("CACHE_LOCK_LEASE", 30.0)
+# Shared records of data cached forever (finished sessions, past seasons)
+# still expire after this long, so old seasons do not pile up in the backend
+CACHE_SHARED_FOREVER_EXPIRE = env_float("CACHE_SHARED_FOREVER_EXPIRE", 7 * 24 * 3600.0)
+# Total size of the shm records; the sweep removes the oldest beyond it
+CACHE_SHM_MAX_BYTES = env_int("CACHE_SHM_MAX_BYTES", 512 * 1024 * 1024)
+
+# fetched_at (wall clock), ttl
+_HEADER = struct.Struct("<dd")
+
+
+class SharedRecord(NamedTuple):
+    value: Any
+    fetched_at: float
+    ttl: float
+    size: int
+
+
+def encode_record(value: Any, ttl: float, fetched_at: Optional[float] = None) -> bytes:
+    fetched_at = time.time() if fetched_at is None else fetched_at
+    return _HEADER.pack(fetched_at, ttl) + pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def decode_record(payload: bytes) -> SharedRecord:
+    fetched_at, ttl = _HEADER.unpack_from(payload)
+    return SharedRecord(pickle.loads(payload[_HEADER.size:]), fetched_at, ttl, len(payload))
+
+
+class SharedBackend:
+    """Byte store plus per-key locks; any method may raise when the backend is down"""
+
+    name = "shared"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, key: str, payload: bytes, expire: Optional[float]) -> None:
+        """Store ``payload``; ``expire`` is in seconds, None keeps it until overwritten"""
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        """Remove the key's record, if any"""
+        raise NotImplementedError
+
+    async def acquire(self, key: str, token: str, lease: float) -> bool:
+        """Take the key's lock for ``lease`` seconds unless someone else holds it"""
+        raise NotImplementedError
+
+    async def release(self, key: str, token: str) -> None:
+        """Drop the key's lock if ``token`` still holds it"""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class SharedMemoryBackend(SharedBackend):
+    """One file per key under a tmpfs directory, shared by the workers of one host.
+
+    Records are written to a temporary file and renamed into place, so
+    readers never see a partial write. Every ``SWEEP_EVERY`` writes,
+    expired records are removed, then the least recently written ones until
+    the rest fit in ``max_bytes``. Locks are files created with
+    O_EXCL holding the owner's token and lease deadline; an expired lock is
+    broken by the next worker that wants it.
+    """
+
+    name = "shm"
+    # Expired records are swept every this many writes
+    SWEEP_EVERY = 256
+    _EXPIRES = struct.Struct("<d")
+
+    def __init__(self, root: str = CACHE_SHM_DIR, max_bytes: int = CACHE_SHM_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        # Private to the service user; see the module docstring
+        os.makedirs(root, mode=0o700, exist_ok=True)
+        self._writes = 0
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.root, hashlib.sha1(key.encode()).hexdigest() + suffix)
+
+    def _read(self, key: str) -> Optional[bytes]:
+        path = self._path(key, ".rec")
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        (expires,) = self._EXPIRES.unpack_from(data)
+        if expires < time.time():
+            return None
+        return data[self._EXPIRES.size:]
+
+    def _write(self, key: str, payload: bytes, expire: Optional[float]) -> None:
+        expires = time.time() + expire if expire is not None else float("inf")
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self._EXPIRES.pack(expires))
+                f.write(payload)
+            os.replace(tmp, self._path(key, ".rec"))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self._writes += 1
+        if self._writes % self.SWEEP_EVERY == 0:
+            self._sweep()
+
+    def _sweep(self) -> None:
+        now = time.time()
+        # (written at, size, path) of the records that are kept
+        kept = []
+        for entry in os.scandir(self.root):
+            if not entry.name.endswith(".rec"):
+                continue
+            try:
+                with open(entry.path, "rb") as f:
+                    (expires,) = self._EXPIRES.unpack(f.read(self._EXPIRES.size))
+                if expires < now:
+                    os.unlink(entry.path)
+                else:
+                    stat = entry.stat()
+                    kept.append((stat.st_mtime, stat.st_size, entry.path))
+            except (OSError, struct.error):
+                continue
+        total = sum(size for _, size, _ in kept)
+        for _, size, path in sorted(kept):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, payload: bytes, expire: Optional[float]) -> None:
+        await asyncio.to_thread(self._write, key, payload, expire)
+
+    def _delete(self, key: str) -> None:
+        try:
+            os.unlink(self._path(key, ".rec"))
+        except FileNotFoundError:
+            pass
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete, key)
+
+    async def acquire(self, key: str, token: str, lease: float) -> bool:
+        path = self._path(key, ".lock")
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if not self._break_expired(path):
+                    return False
+                continue
+            with os.fdopen(fd, "w") as f:
+                f.write(f"{token} {time.time() + lease}")
+            return True
+        return False
+
+    @staticmethod
+    def _break_expired(path: str) -> bool:
+        try:
+            with open(path) as f:
+                _, deadline = f.read().split()
+            if float(deadline) >= time.time():
+                return False
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        except ValueError:
+            # Owner is still writing its token
+            return False
+        return True
+
+    async def release(self, key: str, token: str) -> None:
+        path = self._path(key, ".lock")
+        try:
+            with open(path) as f:
+                owner = f.read().split()[0]
+            if owner == token:
+                os.unlink(path)
+        except (FileNotFoundError, IndexError):
+            pass
+
+
+class RedisBackend(SharedBackend):
+    """Records and locks in Redis, for workers on several hosts"""
+
+    name = "redis"
+    # Delete the lock only if it still holds our token
+    RELEASE_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+    def __init__(self, url: str = CACHE_REDIS_URL, client: Any = None, prefix: str = "f1:"):
+        if client is None:
+            # Optional dependency, only needed for this backend
+            import redis.asyncio as redis
+            client = redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, payload: bytes, expire: Optional[float]) -> None:
+        px = int(expire * 1000) if expire is not None else None
+        await self.client.set(self.prefix + key, payload, px=px)
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(self.prefix + key)
+
+    async def acquire(self, key: str, token: str, lease: float) -> bool:
+        return bool(await self.client.set(f"{self.prefix}lock:{key}", token, nx=True, px=int(lease * 1000)))
+
+    async def release(self, key: str, token: str) -> None:
+        await self.client.eval(self.RELEASE_SCRIPT, 1, f"{self.prefix}lock:{key}", token)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+BACKENDS: Dict[str, type] = {"shm": SharedMemoryBackend, "redis": RedisBackend}
+
+
+def shared_backend_from_env() -> Optional[SharedBackend]:
+    """The backend named by CACHE_BACKEND, or None for a per-process cache"""
+    if CACHE_BACKEND in ("", "memory"):
+        return None
+    if CACHE_BACKEND not in BACKENDS:
+        raise ValueError(f"Unknown CACHE_BACKEND {CACHE_BACKEND!r}, expected memory, shm or redis")
+    return BACKENDS[CACHE_BACKEND]()
@@ -0,0 +1,85 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import quote, unquote
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStore:
+    """On-disk store for upstream data that no longer changes.
+
+    Calendar payloads (``sessions``, ``meetings``) are kept as JSON files.
+    Lap and position data of completed sessions are kept as one ``.npy``
+    file per column and read back as read-only memory maps, so a restart
+    serves historical races without touching the network or copying the
+    arrays into the heap.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(os.path.join(root, "json"), exist_ok=True)
+
+    def _json_path(self, endpoint: str) -> str:
+        return os.path.join(self.root, "json", quote(endpoint, safe="") + ".json")
+
+    def _array_dir(self, kind: str, session_key) -> str:
+        return os.path.join(self.root, kind, str(session_key))
+
+    def save_json(self, endpoint: str, data: Any) -> None:
+        path = self._json_path(endpoint)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def iter_json(self) -> Iterator[Tuple[str, Any, int, float]]:
+        """Yield (endpoint, data, size in bytes, age in seconds) of every stored payload"""
+        directory = os.path.join(self.root, "json")
+        now = time.time()
+        for name in os.listdir(directory):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+                stat = os.stat(path)
+            except (OSError, ValueError) as e:
+                logger.error(f"Error reading stored payload {name}: {e}")
+                continue
+            yield unquote(name[:-len(".json")]), data, stat.st_size, max(0.0, now - stat.st_mtime)
+
+    def save_arrays(self, kind: str, session_key, arrays: Dict[str, np.ndarray]) -> None:
+        target = self._array_dir(kind, session_key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(target), prefix=".tmp")
+        try:
+            for name, values in arrays.items():
+                np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(values))
+            if os.path.exists(target):
+                shutil.rmtree(target)
+            os.replace(tmp_dir, target)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+    def load_arrays(self, kind: str, session_key, names: Iterable[str]) -> Optional[Dict[str, np.ndarray]]:
+        """Memory-map the named columns of a stored session, or None if any is missing"""
+        directory = self._array_dir(kind, session_key)
+        if not os.path.isdir(directory):
+            return None
+        try:
+            return {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in names}
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading stored {kind} for session {session_key}: {e}")
+            return None
+
+    def delete_arrays(self, kind: str, session_key) -> None:
+        shutil.rmtree(self._array_dir(kind, session_key), ignore_errors=True)
@@ -0,0 +1,56 @@
+import codecs
+import json
+from typing import Any, AsyncIterator
+
+_decoder = json.JSONDecoder()
+_SKIP = " \t\r\n,"
+
+
+async def iter_json_array(chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    """Yield the elements of a top-level JSON array as its bytes arrive.
+
+    Each element is decoded on its own with the C-accelerated ``raw_decode``,
+    so only the current element and the unread tail of the last chunk are
+    held in memory rather than the whole body and the whole decoded list.
+    """
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    pos = 0
+    started = False
+    done = False
+
+    async for chunk in chunks:
+        buffer = buffer[pos:] + text_decoder.decode(chunk)
+        pos = 0
+        length = len(buffer)
+        while not done:
+            while pos < length and buffer[pos] in _SKIP:
+                pos += 1
+            if pos >= length:
+                break
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError("Expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                done = True
+                break
+            try:
+                item, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Element is cut off at the end of this chunk; wait for more
+                break
+            if not isinstance(item, (dict, list)) and (end >= length or buffer[end] not in _SKIP + "]"):
+                # A number cut off mid-chunk may have decoded as a shorter one
+                break
+            pos = end
+            yield item
+
+    buffer = buffer[pos:] + text_decoder.decode(b"", final=True)
+    if not done:
+        if not started and not buffer.strip():
+            raise ValueError("Empty response body")
+        raise ValueError("Truncated or invalid JSON array")
+
@@ -0,0 +1,39 @@
+"""RateLimiter client identification and limits"""
+import pytest
+
+from admission import RateLimited, RateLimiter
+
+
+def scope(forwarded=None, path="/standings"):
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return {"type": "http", "path": path, "headers": headers, "client": ("10.0.0.1", 5000)}
+
+
+def test_client_is_the_socket_address_by_default():
+    limiter = RateLimiter(enabled=True)
+    assert limiter.client_id(scope("1.2.3.4")) == "10.0.0.1"
+
+
+def test_spoofed_forwarded_entries_are_ignored():
+    limiter = RateLimiter(client_rate=0.001, client_burst=1, trust_forwarded=True, enabled=True)
+    admitted = [limiter.check(scope(f"192.0.2.{i}, 203.0.113.7")) is None for i in range(20)]
+    assert admitted.count(True) == 1
+
+
+def test_trusted_hops_pick_the_client_behind_several_proxies():
+    limiter = RateLimiter(trust_forwarded=True, trusted_hops=2, enabled=True)
+    assert limiter.client_id(scope("spoofed, 203.0.113.7, 10.1.1.1")) == "203.0.113.7"
+
+
+def test_work_limit_raises_once_exhausted():
+    limiter = RateLimiter(work_limits={"analytics": (0.001, 2)}, enabled=True)
+    limiter.admit("analytics")
+    limiter.admit("analytics")
+    with pytest.raises(RateLimited):
+        limiter.admit("analytics")
+    limiter.admit("unlimited")
+
+
+def test_exempt_paths_are_never_limited():
+    limiter = RateLimiter(client_rate=0.001, client_burst=1, exempt=("/metrics",), enabled=True)
+    assert all(limiter.check(scope(path="/metrics")) is None for _ in range(5))
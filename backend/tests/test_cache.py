@@ -0,0 +1,193 @@
+"""ResponseCache freshness, stale fallbacks and eviction, and SingleFlight coalescing"""
+import asyncio
+
+import pytest
+
+from cache import FOREVER, ResponseCache, SingleFlight, revalidating
+from shared_cache import SharedMemoryBackend
+from upstream import UpstreamSaturated, background_priority, in_background
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def loader_returning(value, calls=None):
+    async def loader():
+        if calls is not None:
+            calls.append(value)
+        return value, len(value)
+    return loader
+
+
+async def failing_loader():
+    raise RuntimeError("upstream timed out")
+
+
+async def shed_loader():
+    raise UpstreamSaturated("gate full")
+
+
+def backdate(cache, key, seconds):
+    cache.get_entry(key).fetched_at -= seconds
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    async def main():
+        flight = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "done"
+
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(10)))
+        return results, calls, flight
+
+    results, calls, flight = run(main())
+    assert results == ["done"] * 10
+    assert len(calls) == 1
+    assert flight.coalesced == 9
+    assert len(flight) == 0
+
+
+def test_single_flight_survives_a_cancelled_caller():
+    async def main():
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("key", work))
+        second = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert run(main()) == "done"
+
+
+def test_single_flight_keeps_background_work_apart():
+    async def main():
+        flight = SingleFlight()
+        seen = []
+
+        async def work():
+            await asyncio.sleep(0.01)
+            seen.append(in_background())
+            return "done"
+
+        async def prefetch():
+            with revalidating(), background_priority():
+                return await flight.do("key", work)
+
+        background = asyncio.ensure_future(prefetch())
+        await asyncio.sleep(0)
+        await flight.do("key", work)
+        await background
+        return seen, flight
+
+    seen, flight = run(main())
+    assert sorted(seen) == [False, True]
+    assert flight.started == 2
+
+
+def test_fresh_entry_is_served_without_loading():
+    async def main():
+        cache = ResponseCache()
+        calls = []
+        await cache.get_or_fetch("key", loader_returning("one", calls), 60)
+        value = await cache.get_or_fetch("key", loader_returning("two", calls), 60)
+        return value, calls, cache
+
+    value, calls, cache = run(main())
+    assert value == "one"
+    assert calls == ["one"]
+    assert cache.hits == 1
+
+
+def test_stale_entry_is_served_while_refreshing_in_background():
+    async def main():
+        cache = ResponseCache(stale_seconds=60)
+        await cache.get_or_fetch("key", loader_returning("old"), 10)
+        backdate(cache, "key", 20)
+        served = await cache.get_or_fetch("key", loader_returning("new"), 10)
+        await asyncio.gather(*cache._tasks)
+        return served, cache.get_entry("key").value, cache
+
+    served, refreshed, cache = run(main())
+    assert served == "old"
+    assert refreshed == "new"
+    assert cache.stale_hits == 1
+
+
+@pytest.mark.parametrize("loader", [failing_loader, shed_loader])
+def test_expired_entry_is_served_when_reload_fails(loader):
+    async def main():
+        cache = ResponseCache(stale_seconds=60)
+        await cache.get_or_fetch("key", loader_returning("good"), 10)
+        backdate(cache, "key", 100)
+        return await cache.get_or_fetch("key", loader, 10), cache
+
+    value, cache = run(main())
+    assert value == "good"
+    assert cache.stale_if_error == 1
+
+
+@pytest.mark.parametrize("loader", [failing_loader, shed_loader])
+def test_revalidation_keeps_cached_value_when_reload_fails(loader):
+    async def main():
+        cache = ResponseCache()
+        await cache.get_or_fetch("key", loader_returning("good"), 60)
+        with revalidating(), background_priority():
+            return await cache.get_or_fetch("key", loader, 60), cache
+
+    value, cache = run(main())
+    assert value == "good"
+    assert cache.stale_if_error == 1
+
+
+def test_revalidation_reloads_fresh_entries_but_not_forever_ones():
+    async def main():
+        cache = ResponseCache()
+        await cache.get_or_fetch("expiring", loader_returning("old"), 60)
+        await cache.get_or_fetch("final", loader_returning("old"), FOREVER)
+        with revalidating():
+            return (
+                await cache.get_or_fetch("expiring", loader_returning("new"), 60),
+                await cache.get_or_fetch("final", loader_returning("new"), FOREVER),
+            )
+
+    assert run(main()) == ("new", "old")
+
+
+def test_miss_without_entry_raises_loader_error():
+    with pytest.raises(RuntimeError):
+        run(ResponseCache().get_or_fetch("key", failing_loader, 60))
+
+
+def test_least_recently_used_entries_are_evicted_over_budget():
+    cache = ResponseCache(max_bytes=10)
+    cache.set("a", "a", 4, 60)
+    cache.set("b", "b", 4, 60)
+    run(cache.get_or_fetch("a", loader_returning("unused"), 60))
+    cache.set("c", "c", 4, 60)
+    assert cache.get_entry("a") is not None
+    assert cache.get_entry("b") is None
+    assert cache.evictions == 1
+
+
+def test_invalidate_removes_shared_record(tmp_path):
+    async def main():
+        cache = ResponseCache(shared=SharedMemoryBackend(str(tmp_path)))
+        other = ResponseCache(shared=SharedMemoryBackend(str(tmp_path)))
+        await cache.get_or_fetch("key", loader_returning("old"), FOREVER)
+        await cache.invalidate("key")
+        return (
+            await cache.get_or_fetch("key", loader_returning("new"), FOREVER),
+            await other.get_or_fetch("key", loader_returning("unused"), FOREVER),
+        )
+
+    assert run(main()) == ("new", "new")
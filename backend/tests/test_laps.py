@@ -0,0 +1,61 @@
+"""LapTracker refresh cursor and LapIndex lookups"""
+from datetime import datetime, timedelta, timezone
+
+from laps import LapColumns, LapIndex, LapTracker
+
+START = datetime(2025, 3, 1, 15, tzinfo=timezone.utc)
+LAP_TIME = 90.0
+
+
+def lap_rows(driver_number, laps, offset=0.0):
+    """Laps of one driver; the last one is still running"""
+    return [
+        {
+            "driver_number": driver_number,
+            "lap_number": lap,
+            "date_start": (START + timedelta(seconds=LAP_TIME * (lap - 1) + offset)).isoformat(),
+            "lap_duration": LAP_TIME + offset if lap < laps else None,
+            "duration_sector_1": 30.0,
+            "duration_sector_2": 30.0 + offset,
+            "duration_sector_3": 30.0 if lap < laps else None,
+        }
+        for lap in range(1, laps + 1)
+    ]
+
+
+def test_cursor_is_none_before_first_fetch():
+    assert LapTracker().cursor() is None
+
+
+def test_cursor_is_oldest_lap_in_progress():
+    tracker = LapTracker()
+    tracker.merge(lap_rows(1, 10) + lap_rows(44, 10, offset=2.0))
+    assert tracker.cursor() == lap_rows(1, 10)[-1]["date_start"]
+
+
+def test_cursor_ignores_retired_car():
+    tracker = LapTracker()
+    tracker.merge(lap_rows(1, 51) + lap_rows(44, 51, offset=2.0) + lap_rows(16, 3))
+    assert tracker.cursor() == lap_rows(1, 51)[-1]["date_start"]
+
+
+def test_merge_replaces_rows_when_laps_complete():
+    tracker = LapTracker()
+    tracker.merge(lap_rows(1, 5))
+    tracker.merge(lap_rows(1, 6)[-2:])
+    assert len(tracker) == 6
+    index = tracker.index()
+    assert [lap.lap_number for lap in index.driver_laps(1)] == list(range(1, 7))
+    assert index.driver_laps(1)[4].lap_duration == LAP_TIME
+
+
+def test_index_ranks_best_laps():
+    columns = LapColumns()
+    for row in lap_rows(44, 5, offset=2.0) + lap_rows(1, 5):
+        columns.append(row)
+    index = LapIndex.from_columns(columns)
+    assert index.ranking == [1, 44]
+    assert [lap.driver_number for lap in index.fastest_laps(1)] == [1]
+    assert index.best_lap(44).lap_duration == LAP_TIME + 2.0
+    assert index.driver_theoretical_best(1) == 90.0
+    assert index.best_lap(99) is None
@@ -0,0 +1,61 @@
+"""iter_json_array across every chunk boundary"""
+import asyncio
+import json
+
+import pytest
+
+from streaming import iter_json_array
+
+ROWS = [
+    {"driver_number": 1, "lap_duration": 92.123, "name": "Pérez"},
+    {"driver_number": 44, "lap_duration": None, "sectors": [25.5, 30.25, 24]},
+    [1, 2, 3],
+    "text, with ] and [",
+    12345,
+    -0.5e3,
+    True,
+    None,
+]
+
+
+async def chunked(payload: bytes, size: int):
+    for start in range(0, len(payload), size):
+        yield payload[start:start + size]
+
+
+async def collect(chunks):
+    return [row async for row in iter_json_array(chunks)]
+
+
+def parse(payload: bytes, size: int):
+    return asyncio.run(collect(chunked(payload, size)))
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 4096])
+def test_elements_survive_any_chunk_size(size):
+    payload = json.dumps(ROWS, ensure_ascii=False).encode()
+    assert parse(payload, size) == ROWS
+
+
+def test_split_at_every_byte():
+    payload = json.dumps(ROWS, ensure_ascii=False, indent=1).encode()
+    for split in range(1, len(payload)):
+        async def two_chunks():
+            yield payload[:split]
+            yield payload[split:]
+        assert asyncio.run(collect(two_chunks())) == ROWS, split
+
+
+def test_empty_array():
+    assert parse(b" [ ] ", 1) == []
+
+
+@pytest.mark.parametrize("payload, message", [
+    (b"", "Empty response body"),
+    (b'{"detail": "error"}', "Expected a JSON array"),
+    (b'[{"a": 1}, {"b":', "Truncated"),
+    (b"[1, 2", "Truncated"),
+])
+def test_invalid_payloads_raise(payload, message):
+    with pytest.raises(ValueError, match=message):
+        parse(payload, 3)
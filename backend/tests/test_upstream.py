@@ -0,0 +1,51 @@
+"""CircuitBreaker state transitions"""
+from upstream import CircuitBreaker
+
+
+def open_breaker(**kwargs):
+    breaker = CircuitBreaker(failure_threshold=3, **kwargs)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    return breaker
+
+
+def test_opens_after_threshold_failures():
+    breaker = open_breaker(reset_timeout=60)
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.rejected == 1
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_half_open_allows_a_single_trial():
+    breaker = open_breaker(reset_timeout=0)
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_failed_trial_reopens():
+    breaker = open_breaker(reset_timeout=0)
+    assert breaker.allow()
+    breaker.reset_timeout = 60
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_abandoned_trial_lets_the_next_request_try():
+    breaker = open_breaker(reset_timeout=0)
+    assert breaker.allow()
+    breaker.abandon_trial()
+    assert breaker.allow()
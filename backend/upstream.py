@@ -0,0 +1,422 @@
+import asyncio
+import contextvars
+import logging
+import re
+import time
+from array import array
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Optional
+
+import httpx
+
+from env import env_bool, env_float, env_int
+from metrics import SIZE_BUCKETS, registry
+
+logger = logging.getLogger(__name__)
+
+
+# Connection pool settings, shared by every upstream unless overridden
+MAX_CONNECTIONS = env_int("UPSTREAM_MAX_CONNECTIONS", 20)
+MAX_KEEPALIVE_CONNECTIONS = env_int("UPSTREAM_MAX_KEEPALIVE", 20)
+KEEPALIVE_EXPIRY = env_float("UPSTREAM_KEEPALIVE_EXPIRY", 30.0)
+MAX_CONCURRENCY = env_int("UPSTREAM_MAX_CONCURRENCY", 16)
+REQUEST_TIMEOUT = env_float("UPSTREAM_TIMEOUT", 10.0)
+HTTP2 = env_bool("UPSTREAM_HTTP2", False)
+
+# Adaptive timeouts: once enough latencies are observed, a request may take at
+# most this multiple of the recent p99, within [min, REQUEST_TIMEOUT]
+ADAPTIVE_TIMEOUT_FACTOR = env_float("UPSTREAM_TIMEOUT_FACTOR", 3.0)
+ADAPTIVE_TIMEOUT_MIN = env_float("UPSTREAM_TIMEOUT_MIN", 1.0)
+LATENCY_WINDOW = 128       # recent requests the percentiles are computed over
+LATENCY_MIN_SAMPLES = 20   # below this, percentiles are not trusted
+
+# Circuit breaker: open after this many consecutive failures, then let one
+# trial request through after the reset timeout
+BREAKER_FAILURE_THRESHOLD = env_int("UPSTREAM_BREAKER_FAILURES", 5)
+BREAKER_RESET_TIMEOUT = env_float("UPSTREAM_BREAKER_RESET", 30.0)
+
+# Global admission gate: requests in flight across every upstream, how many
+# more may queue for a slot, and how long one waits before it is shed
+GATE_CONCURRENCY = env_int("UPSTREAM_GLOBAL_CONCURRENCY", 24)
+GATE_MAX_WAITING = env_int("UPSTREAM_MAX_WAITING", 64)
+GATE_WAIT_TIMEOUT = env_float("UPSTREAM_QUEUE_TIMEOUT", 2.0)
+
+
+UPSTREAM_DURATION = registry.histogram(
+    "f1_upstream_request_duration_seconds", "Upstream request duration, body included", ("host", "endpoint")
+)
+UPSTREAM_RESPONSE_BYTES = registry.histogram(
+    "f1_upstream_response_bytes", "Upstream response body size", ("host", "endpoint"), buckets=SIZE_BUCKETS
+)
+UPSTREAM_REQUESTS = registry.counter(
+    "f1_upstream_requests_total", "Upstream requests by outcome", ("host", "endpoint", "outcome")
+)
+
+
+@lru_cache(maxsize=1024)
+def endpoint_label(path: str) -> str:
+    """Metric label for a request path: no query string, numbers collapsed ('2025/standings/drivers' -> ':n/standings/drivers')"""
+    return re.sub(r"\d+", ":n", path.partition("?")[0].strip("/")) or "/"
+
+
+class EndpointMetrics:
+    """Series of one upstream endpoint, looked up once and reused for every request"""
+
+    __slots__ = ("host", "endpoint", "duration", "size", "_outcomes")
+
+    def __init__(self, host: str, endpoint: str):
+        self.host = host
+        self.endpoint = endpoint
+        self.duration = UPSTREAM_DURATION.labels(host, endpoint)
+        self.size = UPSTREAM_RESPONSE_BYTES.labels(host, endpoint)
+        self._outcomes: Dict[str, object] = {}
+
+    def count(self, outcome: str) -> None:
+        counter = self._outcomes.get(outcome)
+        if counter is None:
+            counter = self._outcomes[outcome] = UPSTREAM_REQUESTS.labels(self.host, self.endpoint, outcome)
+        counter.inc()
+
+
+def _status_outcome(status_code: int) -> str:
+    return f"{status_code // 100}xx"
+
+
+class UpstreamUnavailable(Exception):
+    """Raised without touching the network while an upstream's circuit is open"""
+
+
+class UpstreamSaturated(UpstreamUnavailable):
+    """Raised when the upstream gate has no slot for a request; callers treat it like an open circuit"""
+
+
+# Set for work nobody is waiting on (background refreshes, prefetch)
+_background = contextvars.ContextVar("upstream_background", default=False)
+
+
+@contextmanager
+def background_priority():
+    """Run upstream requests in this context at low priority: they never queue for the gate"""
+    token = _background.set(True)
+    try:
+        yield
+    finally:
+        _background.reset(token)
+
+
+def in_background() -> bool:
+    """Whether the current context runs at background priority"""
+    return _background.get()
+
+
+class UpstreamGate:
+    """Global cap on concurrent upstream requests, with a bounded wait queue.
+
+    Only cache misses reach it, so requests answered from the cache are
+    never queued behind cold ones. When every slot is taken, a request
+    waits for at most ``wait_timeout`` and only while fewer than
+    ``max_waiting`` others do; background requests do not wait at all.
+    Rejected requests raise UpstreamSaturated at once, so callers serve
+    stale data or a fallback instead of piling up timeouts.
+    """
+
+    def __init__(self, concurrency: int = GATE_CONCURRENCY, max_waiting: int = GATE_MAX_WAITING,
+                 wait_timeout: float = GATE_WAIT_TIMEOUT):
+        self.concurrency = concurrency
+        self.max_waiting = max_waiting
+        self.wait_timeout = wait_timeout
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+        self.waited = 0
+        self.shed = 0
+
+    def _reject(self, reason: str) -> UpstreamSaturated:
+        self.shed += 1
+        return UpstreamSaturated(f"upstream gate {reason}")
+
+    async def acquire(self) -> None:
+        if self._semaphore.locked():
+            if _background.get():
+                raise self._reject("is full")
+            if self.waiting >= self.max_waiting:
+                raise self._reject("queue is full")
+            self.waiting += 1
+            self.waited += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.wait_timeout)
+            except asyncio.TimeoutError:
+                raise self._reject("wait timed out") from None
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+        self.in_flight += 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "waited": self.waited,
+            "shed": self.shed,
+        }
+
+
+class LatencyWindow:
+    """Fixed-size ring of the most recent request latencies, in seconds"""
+
+    def __init__(self, size: int = LATENCY_WINDOW):
+        self._values = array('d', bytes(8 * size))
+        self._next = 0
+        self.count = 0
+
+    def record(self, seconds: float) -> None:
+        self._values[self._next] = seconds
+        self._next = (self._next + 1) % len(self._values)
+        self.count += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        filled = min(self.count, len(self._values))
+        if filled < LATENCY_MIN_SAMPLES:
+            return None
+        ordered = sorted(self._values[:filled])
+        return ordered[min(filled - 1, int(q * filled))]
+
+
+class CircuitBreaker:
+    """Closed -> open after repeated failures -> half-open trial -> closed.
+
+    While open, requests fail immediately instead of each waiting for a
+    timeout against an upstream that is known to be down.
+    """
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = BREAKER_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def abandon_trial(self) -> None:
+        # The trial request was cancelled before it told us anything
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.trial_in_flight or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self.trial_in_flight = False
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class UpstreamClient:
+    """One pooled, keep-alive HTTP client per upstream host.
+
+    The underlying ``httpx.AsyncClient`` is created by ``start()`` (called
+    from the app lifespan) and reused for every request, so connections and
+    TLS sessions are shared instead of re-negotiated per call. A semaphore
+    caps how many requests may be in flight to the host at once, and an
+    optional UpstreamGate shared between clients caps them all together.
+
+    Each client also tracks its recent latencies, which drive a timeout
+    shorter than ``timeout`` once the host's normal speed is known, and a
+    circuit breaker that fails fast while the host keeps erroring.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        *,
+        max_connections: int = MAX_CONNECTIONS,
+        max_keepalive_connections: int = MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = KEEPALIVE_EXPIRY,
+        max_concurrency: int = MAX_CONCURRENCY,
+        timeout: float = REQUEST_TIMEOUT,
+        http2: bool = HTTP2,
+        gate: Optional[UpstreamGate] = None,
+    ):
+        self.name = name
+        self.base_url = base_url
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.http2 = http2
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.gate = gate
+        self._client: Optional[httpx.AsyncClient] = None
+        self.latency = LatencyWindow()
+        self.breaker = CircuitBreaker()
+        self._metrics: Dict[str, EndpointMetrics] = {}
+
+    async def start(self) -> None:
+        if self._client is not None:
+            return
+        http2 = self.http2
+        if http2 and not _http2_available():
+            logger.warning(f"HTTP/2 requested for {self.name} but 'h2' is not installed, using HTTP/1.1")
+            http2 = False
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            limits=self.limits,
+            timeout=self.timeout,
+            http2=http2,
+        )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def adaptive_timeout(self) -> float:
+        p99 = self.latency.percentile(0.99)
+        if p99 is None:
+            return self.timeout
+        return min(self.timeout, max(ADAPTIVE_TIMEOUT_MIN, p99 * ADAPTIVE_TIMEOUT_FACTOR))
+
+    def _endpoint_metrics(self, path: str) -> EndpointMetrics:
+        endpoint = endpoint_label(path)
+        metrics = self._metrics.get(endpoint)
+        if metrics is None:
+            metrics = self._metrics[endpoint] = EndpointMetrics(self.name, endpoint)
+        return metrics
+
+    def _check_breaker(self, metrics: EndpointMetrics) -> None:
+        if not self.breaker.allow():
+            metrics.count("rejected")
+            raise UpstreamUnavailable(f"{self.name} circuit is open")
+
+    @asynccontextmanager
+    async def _admitted(self, metrics: EndpointMetrics) -> AsyncIterator[None]:
+        """Hold a gate slot, if there is a gate, and one of this host's slots"""
+        if self.gate is not None:
+            try:
+                await self.gate.acquire()
+            except UpstreamSaturated:
+                metrics.count("shed")
+                self.breaker.abandon_trial()
+                raise
+        try:
+            async with self._semaphore:
+                yield
+        finally:
+            if self.gate is not None:
+                self.gate.release()
+
+    def _record_status(self, status_code: int) -> None:
+        if status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    async def get(self, path: str) -> httpx.Response:
+        # Lazily start when used outside the app lifespan (scripts, benchmarks)
+        if self._client is None:
+            await self.start()
+        metrics = self._endpoint_metrics(path)
+        self._check_breaker(metrics)
+        # A half-open trial gets the full timeout, so a host that became
+        # slower than the adaptive timeout can still prove it is back
+        trial = self.breaker.trial_in_flight
+        async with self._admitted(metrics):
+            start = time.perf_counter()
+            try:
+                response = await self._client.get(path, timeout=self.timeout if trial else self.adaptive_timeout())
+            except httpx.TimeoutException as e:
+                metrics.count("timeout")
+                self.breaker.record_failure()
+                raise httpx.TimeoutException(f"{self.name} timed out on {path}", request=e.request) from e
+            except httpx.TransportError:
+                metrics.count("error")
+                self.breaker.record_failure()
+                raise
+            except asyncio.CancelledError:
+                self.breaker.abandon_trial()
+                raise
+        elapsed = time.perf_counter() - start
+        self.latency.record(elapsed)
+        metrics.duration.observe(elapsed)
+        metrics.size.observe(len(response.content))
+        metrics.count(_status_outcome(response.status_code))
+        self._record_status(response.status_code)
+        return response
+
+    @asynccontextmanager
+    async def stream(self, path: str) -> AsyncIterator[httpx.Response]:
+        """Open a streaming GET; the body is read incrementally by the caller"""
+        if self._client is None:
+            await self.start()
+        metrics = self._endpoint_metrics(path)
+        self._check_breaker(metrics)
+        async with self._admitted(metrics):
+            start = time.perf_counter()
+            try:
+                async with self._client.stream("GET", path) as response:
+                    self._record_status(response.status_code)
+                    yield response
+                    metrics.duration.observe(time.perf_counter() - start)
+                    metrics.size.observe(response.num_bytes_downloaded)
+                    metrics.count(_status_outcome(response.status_code))
+            except httpx.TimeoutException:
+                metrics.count("timeout")
+                self.breaker.record_failure()
+                raise
+            except httpx.TransportError:
+                metrics.count("error")
+                self.breaker.record_failure()
+                raise
+            except asyncio.CancelledError:
+                self.breaker.abandon_trial()
+                raise
+
+    def stats(self) -> dict:
+        return {
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "rejected": self.breaker.rejected,
+            "p50": self.latency.percentile(0.5),
+            "p95": self.latency.percentile(0.95),
+            "p99": self.latency.percentile(0.99),
+            "timeout": self.adaptive_timeout(),
+        }